@@ -1,15 +1,16 @@
 import os
-from typing import Union, Optional, TextIO, MutableMapping, cast
+from typing import Union, Optional, TextIO, cast
 from xml.etree import ElementTree
 
 from .errors import ParseError
 from .errors import Error
 from ..compat import fopen
+from . import cache
 from . import can
 from . import diagnostics
+from .can.formats import cdb
 from . import utils
 import textparser
-import diskcache
 
 # Remove once less users are using the old package structure.
 from .can import *
@@ -80,25 +81,44 @@ def _load_file_cache(filename: StringPathLike,
                      strict: bool,
                      cache_dir: str,
                      sort_signals: utils.type_sort_signals,
+                     lazy_codecs: bool,
+                     message_filter: Optional[can.MessageFilter],
                      ) -> Union[can.Database, diagnostics.Database]:
-    with open(filename, 'rb') as fin:
-        key = fin.read()
+    def load_uncached() -> Union[can.Database, diagnostics.Database]:
+        with fopen(filename, 'r', encoding=encoding) as fin:
+            return load(cast(TextIO, fin),
+                        database_format,
+                        frame_id_mask,
+                        prune_choices,
+                        strict,
+                        sort_signals,
+                        lazy_codecs,
+                        message_filter)
 
-    cache: MutableMapping[bytes, Union[can.Database, diagnostics.Database]]
-    with diskcache.Cache(cache_dir) as cache:
-        try:
-            return cache[key]
-        except KeyError:
-            with fopen(filename, 'r', encoding=encoding) as fin:
-                database = load(cast(TextIO, fin),
-                                database_format,
-                                frame_id_mask,
-                                prune_choices,
-                                strict,
-                                sort_signals)
-            cache[key] = database
+    with cache.open_cache(cache_dir) as database_cache:
+        key = cache.database_key(
+            cache.file_digest(database_cache, filename),
+            {
+                'database_format': database_format,
+                'encoding': encoding,
+                'frame_id_mask': frame_id_mask,
+                'prune_choices': prune_choices,
+                'strict': strict,
+                'sort_signals': sort_signals,
+                'lazy_codecs': lazy_codecs,
+                'message_filter': message_filter
+            })
+
+        if key is None:
+            return load_uncached()
+
+        database = database_cache.get(key)
+
+        if database is None:
+            database = load_uncached()
+            database_cache.set(key, database)
 
-            return database
+        return cast(Union[can.Database, diagnostics.Database], database)
 
 
 def load_file(filename: StringPathLike,
@@ -109,6 +129,8 @@ def load_file(filename: StringPathLike,
               strict: bool = True,
               cache_dir: Optional[str] = None,
               sort_signals: utils.type_sort_signals = utils.sort_signals_by_start_bit,
+              lazy_codecs: bool = False,
+              message_filter: Optional[can.MessageFilter] = None,
               ) -> Union[can.Database, diagnostics.Database]:
     """Open, read and parse given database file and return a
     :class:`can.Database<.can.Database>` or
@@ -116,9 +138,9 @@ def load_file(filename: StringPathLike,
     its contents.
 
     `database_format` is one of ``'arxml'``, ``'dbc'``, ``'kcd'``,
-    ``'sym'``, ``cdd`` and ``None``. If ``None``, the database format
-    is selected based on the filename extension as in the table below.
-    Filename extensions are case insensitive.
+    ``'sym'``, ``cdd``, ``'cdb'`` and ``None``. If ``None``, the
+    database format is selected based on the filename extension as in
+    the table below. Filename extensions are case insensitive.
 
     +-----------+-----------------+
     | Extension | Database format |
@@ -133,9 +155,18 @@ def load_file(filename: StringPathLike,
     +-----------+-----------------+
     | .cdd      | ``'cdd'``       |
     +-----------+-----------------+
+    | .cdb      | ``'cdb'``       |
+    +-----------+-----------------+
     | <unknown> | ``None``        |
     +-----------+-----------------+
 
+    The ``'cdb'`` format is a compiled database written by
+    :func:`~cantools.database.dump_file()`, which loads much faster
+    than the other formats. It can only be loaded by the cantools
+    version that wrote it, and only from trusted sources. The other
+    arguments are ignored when loading it, the database is returned
+    as it was when dumped.
+
     `encoding` specifies the file encoding. If ``None``, the encoding
     is selected based on the database format as in the table
     below. Use ``open()`` and :func:`~cantools.database.load()` if
@@ -163,11 +194,17 @@ def load_file(filename: StringPathLike,
 
     `cache_dir` specifies the database cache location in the file
     system. Give as ``None`` to disable the cache. By default the
-    cache is disabled. The cache key is the contents of given
-    file. Using a cache will significantly reduce the load time when
-    reloading the same file. The cache directory is automatically
-    created if it does not exist. Remove the cache directory
-    `cache_dir` to clear the cache.
+    cache is disabled. The cache key is a digest of the contents of
+    given file, the other arguments and the cantools version. Files
+    with unchanged size and modification time are not read again to
+    compute the digest. Using a cache will significantly reduce the
+    load time when reloading the same file. The cache directory is
+    automatically created if it does not exist. The least recently
+    used databases are removed once the cache exceeds 1 GiB. Use
+    ``cantools cache clear`` or remove the cache directory
+    `cache_dir` to clear the cache. Databases loaded with
+    `sort_signals` or the predicate of `message_filter` set to a
+    lambda or a local function are not cached.
 
     See :func:`~cantools.database.load_string()` for descriptions of
     other arguments.
@@ -188,6 +225,10 @@ def load_file(filename: StringPathLike,
         encoding,
         filename)
 
+    if database_format == 'cdb':
+        with open(filename, 'rb') as fin:
+            return cdb.load_bytes(fin.read())
+
     if cache_dir is None:
         with fopen(filename, 'r', encoding=encoding) as fin:
             return load(fin,
@@ -195,7 +236,9 @@ def load_file(filename: StringPathLike,
                         frame_id_mask,
                         prune_choices,
                         strict,
-                        sort_signals)
+                        sort_signals,
+                        lazy_codecs,
+                        message_filter)
     else:
         return _load_file_cache(filename,
                                 database_format,
@@ -204,7 +247,9 @@ def load_file(filename: StringPathLike,
                                 prune_choices,
                                 strict,
                                 cache_dir,
-                                sort_signals)
+                                sort_signals,
+                                lazy_codecs,
+                                message_filter)
 
 
 def dump_file(database,
@@ -221,6 +266,8 @@ def dump_file(database,
     `sort_signals = lambda signals: list(sorted(signals, key=lambda sig: sig.name))`
     For dbc files the default is to sort the signals by their start bit in descending order.
     For kcd files the default is to not sort the signals.
+    For cdb files `encoding` and `sort_signals` are ignored, the
+    database is stored as it is.
 
     See :func:`~cantools.database.load_file()` for descriptions of
     other arguments.
@@ -243,6 +290,12 @@ def dump_file(database,
 
     newline = None
 
+    if database_format == 'cdb':
+        with open(filename, 'wb') as fout:
+            fout.write(cdb.dump_bytes(database))
+
+        return
+
     if database_format == 'dbc':
         output = database.as_dbc_string(sort_signals=sort_signals)
         newline = ''
@@ -263,7 +316,9 @@ def load(fp: TextIO,
          frame_id_mask: Optional[int] = None,
          prune_choices: bool = False,
          strict: bool = True,
-         sort_signals: utils.type_sort_signals = utils.sort_signals_by_start_bit) -> Union[can.Database, diagnostics.Database]:
+         sort_signals: utils.type_sort_signals = utils.sort_signals_by_start_bit,
+         lazy_codecs: bool = False,
+         message_filter: Optional[can.MessageFilter] = None) -> Union[can.Database, diagnostics.Database]:
     """Read and parse given database file-like object and return a
     :class:`can.Database<.can.Database>` or
     :class:`diagnostics.Database<.diagnostics.Database>` object with
@@ -277,6 +332,9 @@ def load(fp: TextIO,
     exception if given file-like object does not contain a supported
     database format.
 
+    ARXML files are parsed incrementally instead of being read as a
+    whole first.
+
     >>> with open('foo.kcd') as fin:
     ...    db = cantools.database.load(fin)
     >>> db.version
@@ -284,12 +342,47 @@ def load(fp: TextIO,
 
     """
 
+    if database_format == 'arxml':
+        return _load_arxml(fp,
+                           frame_id_mask,
+                           prune_choices,
+                           strict,
+                           sort_signals,
+                           lazy_codecs,
+                           message_filter)
+
     return load_string(fp.read(),
                        database_format,
                        frame_id_mask,
                        prune_choices,
                        strict,
-                       sort_signals)
+                       sort_signals,
+                       lazy_codecs,
+                       message_filter)
+
+
+def _load_arxml(fp: TextIO,
+                frame_id_mask: Optional[int],
+                prune_choices: bool,
+                strict: bool,
+                sort_signals: utils.type_sort_signals,
+                lazy_codecs: bool,
+                message_filter: Optional[can.MessageFilter]) -> can.Database:
+    db = can.Database(frame_id_mask=frame_id_mask,
+                      strict=strict,
+                      sort_signals=sort_signals,
+                      lazy_codecs=lazy_codecs,
+                      message_filter=message_filter)
+
+    try:
+        db.add_arxml(fp)
+    except (ElementTree.ParseError, ValueError) as e:
+        raise UnsupportedDatabaseFormatError(e, None, None, None, None)
+
+    if prune_choices:
+        utils.prune_database_choices(db)
+
+    return db
 
 
 def load_string(string: str,
@@ -297,7 +390,9 @@ def load_string(string: str,
                 frame_id_mask: Optional[int] = None,
                 prune_choices: bool = False,
                 strict: bool = True,
-                sort_signals: utils.type_sort_signals = utils.sort_signals_by_start_bit) -> Union[can.Database, diagnostics.Database]:
+                sort_signals: utils.type_sort_signals = utils.sort_signals_by_start_bit,
+                lazy_codecs: bool = False,
+                message_filter: Optional[can.MessageFilter] = None) -> Union[can.Database, diagnostics.Database]:
     """Parse given database string and return a
     :class:`can.Database<.can.Database>` or
     :class:`diagnostics.Database<.diagnostics.Database>` object with
@@ -319,6 +414,16 @@ def load_string(string: str,
     If you want the signals to be sorted in another way pass something like
     `sort_signals = lambda signals: list(sorted(signals, key=lambda sig: sig.name))`
 
+    If `lazy_codecs` is ``True`` the codecs of each message are created
+    when the message is first encoded or decoded instead of when the
+    database is loaded. See :class:`can.Database<.can.Database>`.
+
+    If `message_filter` is given, only the messages it selects are
+    loaded, which is faster and uses less memory when only a few
+    messages of a large database are needed. See
+    :class:`~cantools.database.can.MessageFilter`. It is ignored by
+    the ``'cdd'`` format.
+
     Raises an
     :class:`~cantools.database.UnsupportedDatabaseFormatError`
     exception if given string does not contain a supported database
@@ -344,7 +449,9 @@ def load_string(string: str,
     def load_can_database(fmt: str) -> can.Database:
         db = can.Database(frame_id_mask=frame_id_mask,
                           strict=strict,
-                          sort_signals=sort_signals)
+                          sort_signals=sort_signals,
+                          lazy_codecs=lazy_codecs,
+                          message_filter=message_filter)
 
         if fmt == 'arxml':
             db.add_arxml_string(string)
@@ -0,0 +1,154 @@
+# Cache of loaded databases.
+#
+# Databases are stored pickled in a diskcache cache, keyed by a digest
+# of the file contents, the load options and the cantools version.
+# Digests of files are remembered together with their size and
+# modification time, so that unchanged files are not read again.
+
+import hashlib
+import os
+import time
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Optional,
+    Tuple,
+    cast,
+)
+
+import diskcache
+
+from ..typechecking import StringPathLike
+from ..version import __version__
+
+# Changed whenever the keys or values stored in the cache change.
+CACHE_FORMAT = 2
+
+# Maximum size of a cache in bytes. The least recently used entries
+# are evicted once exceeded.
+SIZE_LIMIT = 2 ** 30
+
+# Files modified this recently, in seconds, may be modified again
+# without changing their modification time, so their digests are not
+# remembered.
+RACY_TIME = 2
+
+
+def open_cache(cache_dir: str) -> diskcache.Cache:
+    """Open the cache in given directory, which is created if missing.
+
+    """
+
+    return diskcache.Cache(cache_dir,
+                           size_limit=SIZE_LIMIT,
+                           eviction_policy='least-recently-used')
+
+
+def file_digest(cache: diskcache.Cache, filename: StringPathLike) -> str:
+    """Returns a digest of the contents of given file, reusing the digest
+    stored in given cache if the size and modification time of the
+    file are unchanged.
+
+    """
+
+    stat = os.stat(filename)
+    stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    key = ('digest', CACHE_FORMAT, os.path.abspath(filename))
+    entry = cache.get(key)
+
+    if entry is not None and entry[0] == stamp:
+        return cast(str, entry[1])
+
+    with open(filename, 'rb') as fin:
+        digest = hashlib.blake2b(fin.read(), digest_size=16).hexdigest()
+
+    if time.time() - stat.st_mtime > RACY_TIME:
+        cache.set(key, (stamp, digest))
+
+    return digest
+
+
+def _function_key(function: Any) -> Optional[str]:
+    if function is None or isinstance(function, str):
+        return repr(function)
+
+    module = getattr(function, '__module__', None)
+    qualname = getattr(function, '__qualname__', None)
+
+    # Lambdas and local functions cannot be told apart by their names.
+    if module is None or qualname is None or '<' in qualname:
+        return None
+
+    return f'{module}.{qualname}'
+
+
+def _message_filter_key(message_filter: Any) -> Optional[Tuple[Hashable, ...]]:
+    if message_filter is None:
+        return ()
+
+    predicate = _function_key(message_filter.predicate)
+
+    if predicate is None:
+        return None
+
+    def sorted_or_none(values):
+        return None if values is None else tuple(sorted(values))
+
+    return (sorted_or_none(message_filter.messages),
+            sorted_or_none(message_filter.frame_ids),
+            sorted_or_none(message_filter.nodes),
+            sorted_or_none(message_filter.buses),
+            predicate)
+
+
+def database_key(digest: str,
+                 options: Dict[str, Any]) -> Optional[Tuple[Hashable, ...]]:
+    """Returns the cache key of a database loaded from a file with given
+    digest and given keyword arguments to
+    :func:`~cantools.database.load_file()`, or ``None`` if the
+    database cannot be cached.
+
+    """
+
+    options = dict(options)
+    sort_signals = _function_key(options.pop('sort_signals'))
+    message_filter = _message_filter_key(options.pop('message_filter', None))
+
+    if sort_signals is None or message_filter is None:
+        return None
+
+    return ('database',
+            CACHE_FORMAT,
+            __version__,
+            digest,
+            sort_signals,
+            message_filter,
+            *sorted(options.items()))
+
+
+def info(cache_dir: str) -> Dict[str, int]:
+    """Returns the number of cached databases, the number of remembered
+    file digests, and the size and maximum size of the cache in given
+    directory in bytes.
+
+    """
+
+    with open_cache(cache_dir) as cache:
+        kinds = [key[0] for key in cache.iterkeys()]
+
+        return {
+            'databases': kinds.count('database'),
+            'digests': kinds.count('digest'),
+            'size': cache.volume(),
+            'size_limit': cache.size_limit
+        }
+
+
+def clear(cache_dir: str) -> None:
+    """Remove all entries of the cache in given directory.
+
+    """
+
+    with open_cache(cache_dir) as cache:
+        cache.clear()
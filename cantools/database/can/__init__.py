@@ -5,3 +5,5 @@ from .message import DecodeError
 from .signal import Signal
 from .node import Node
 from .bus import Bus
+from .delta import DeltaDecoder
+from .message_filter import MessageFilter
@@ -3,6 +3,8 @@ class Attribute:
 
     """
 
+    __slots__ = ('_value', '_definition')
+
     def __init__(self,
                  value,
                  definition):
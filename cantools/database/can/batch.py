@@ -0,0 +1,722 @@
+# Columnar batch decoding of many frames of a message at once.
+
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+from ..errors import DecodeError
+from ..errors import EncodeError
+from ..utils import decode_data
+from ..utils import format_or
+from ..utils import start_bit
+from ...typechecking import Codec
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from .message import Message
+    from .signal import Signal
+
+
+# A signal column, i.e. a NumPy array (masked if the signal is
+# multiplexed) or, if NumPy is not installed, a list of values where
+# ``None`` means that the signal is not present in the frame.
+Column = Any
+Columns = Dict[str, Column]
+
+# Unsigned integer and float types of the same size, by float signal
+# length.
+FLOAT_DTYPES = {
+    16: ('u2', 'f2'),
+    32: ('u4', 'f4'),
+    64: ('u8', 'f8'),
+}
+
+
+class _Field:
+    """Location of a signal in the payload, as a range of bytes and the
+    shift and mask to apply to the integer built from these bytes.
+
+    """
+
+    def __init__(self, signal: "Signal") -> None:
+        self.signal = signal
+
+        if signal.byte_order == 'little_endian':
+            self.first = signal.start // 8
+            self.last = (signal.start + signal.length - 1) // 8
+            self.shift = signal.start - 8 * self.first
+        else:
+            bit = start_bit(signal)
+            self.first = bit // 8
+            self.last = (bit + signal.length - 1) // 8
+            self.shift = 8 * (self.last + 1) - (bit + signal.length)
+
+        self.mask = (1 << signal.length) - 1
+
+    def byte_shifts(self) -> List[Tuple[int, int]]:
+        """Returns a list of ``(index, shift)`` tuples, where byte `index`
+        of the payload is the raw value shifted right by `shift` bits
+        (left if negative), truncated to eight bits.
+
+        """
+
+        signal = self.signal
+        shifts = []
+
+        for index in range(self.first, self.last + 1):
+            if signal.byte_order == 'little_endian':
+                shift = 8 * index - signal.start
+            else:
+                shift = start_bit(signal) + signal.length - 8 - 8 * index
+
+            shifts.append((index, shift))
+
+        return shifts
+
+
+def _payloads_as_array(payloads: Any, length: int) -> Any:
+    if isinstance(payloads, np.ndarray):
+        array = payloads
+    else:
+        payloads = list(payloads)
+
+        if len(payloads) == 0:
+            return np.zeros((0, length), dtype=np.uint8)
+
+        for payload in payloads:
+            if len(payload) < length:
+                raise DecodeError(f'Expected at least {length} bytes, but '
+                                  f'got {len(payload)}')
+
+        array = np.frombuffer(b''.join([bytes(payload[:length])
+                                        for payload in payloads]),
+                              dtype=np.uint8).reshape(len(payloads), length)
+
+    if array.ndim != 2:
+        raise DecodeError(f'Expected a two-dimensional payload array, but got '
+                          f'{array.ndim} dimensions')
+
+    if array.shape[1] < length:
+        raise DecodeError(f'Expected at least {length} bytes, but '
+                          f'got {array.shape[1]}')
+
+    return array[:, :length].astype(np.uint8, copy=False)
+
+
+def _extract_raw(payloads: Any, field: _Field) -> Any:
+    """Returns the raw, unscaled values of given field as an array of
+    unsigned 64 bits integers or, for fields spanning more than eight
+    bytes, Python integers.
+
+    """
+
+    signal = field.signal
+    number_of_bytes = field.last - field.first + 1
+
+    if number_of_bytes > 8:
+        dtype = object
+    else:
+        dtype = np.uint64
+
+    value = np.zeros(len(payloads), dtype=dtype)
+
+    for i, index in enumerate(range(field.first, field.last + 1)):
+        if signal.byte_order == 'little_endian':
+            shift = 8 * i
+        else:
+            shift = 8 * (field.last - index)
+
+        column = payloads[:, index].astype(dtype)
+
+        if dtype is object:
+            value |= column << shift
+        else:
+            value |= column << np.uint64(shift)
+
+    if dtype is object:
+        return (value >> field.shift) & field.mask
+
+    return (value >> np.uint64(field.shift)) & np.uint64(field.mask)
+
+
+def _convert_raw(raw: Any, signal: "Signal") -> Any:
+    length = signal.length
+
+    if signal.is_float:
+        integer_dtype, float_dtype = FLOAT_DTYPES[length]
+
+        # Signaling NaNs are converted to quiet NaNs, like when decoding
+        # frame by frame, but NumPy warns about them.
+        with np.errstate(invalid='ignore'):
+            return raw.astype(integer_dtype).view(float_dtype).astype(np.float64)
+
+    if raw.dtype == object:
+        if signal.is_signed:
+            sign = 1 << (length - 1)
+            raw = np.array([v - (1 << length) if v & sign else v for v in raw],
+                           dtype=object)
+
+        return raw
+
+    if signal.is_signed:
+        # Sign extend by moving the sign bit to the most significant
+        # bit followed by an arithmetic right shift.
+        shift = np.uint64(64 - length)
+
+        return (raw << shift).view(np.int64) >> shift.astype(np.int64)
+
+    if length < 64:
+        return raw.astype(np.int64)
+
+    return raw
+
+
+def _scale(value: Any, signal: "Signal") -> Any:
+    if signal.scale == 1 and signal.offset == 0:
+        if isinstance(signal.scale, int) and isinstance(signal.offset, int):
+            return value
+
+    if value.dtype == object:
+        return np.array([signal.scale * v + signal.offset for v in value],
+                        dtype=object)
+
+    return value * signal.scale + signal.offset
+
+
+def _numpy_decode_node(node: Codec,
+                       payloads: Any,
+                       scaling: bool,
+                       valid: Optional[Any],
+                       columns: Columns,
+                       masks: Dict[str, Any]) -> None:
+    values = {}
+
+    for signal in node['signals']:
+        value = _convert_raw(_extract_raw(payloads, _Field(signal)), signal)
+        values[signal.name] = value
+
+        if scaling:
+            value = _scale(value, signal)
+
+        if valid is None:
+            columns[signal.name] = value
+        elif signal.name in masks:
+            # The signal is part of multiple multiplexer branches.
+            masks[signal.name] |= valid
+        else:
+            columns[signal.name] = value
+            masks[signal.name] = valid.copy()
+
+    for mux_name, mux_nodes in node['multiplexers'].items():
+        mux_signal = next(signal
+                          for signal in node['signals']
+                          if signal.name == mux_name)
+        mux = values[mux_name]
+
+        if scaling:
+            mux = _scale(mux, mux_signal)
+
+        if mux.dtype != object:
+            mux = np.trunc(mux).astype(np.int64)
+
+        for mux_id, mux_node in mux_nodes.items():
+            mux_valid = (mux == mux_id).astype(bool)
+
+            if valid is not None:
+                mux_valid &= valid
+
+            _numpy_decode_node(mux_node,
+                               payloads,
+                               scaling,
+                               mux_valid,
+                               columns,
+                               masks)
+
+
+def _numpy_decode_batch(message: "Message",
+                        payloads: Any,
+                        scaling: bool) -> Columns:
+    assert message._codecs is not None
+    payloads = _payloads_as_array(payloads, message.length)
+    columns: Columns = {}
+    masks: Dict[str, Any] = {}
+    _numpy_decode_node(message._codecs,
+                       payloads,
+                       scaling,
+                       None,
+                       columns,
+                       masks)
+
+    for name, mask in masks.items():
+        columns[name] = np.ma.masked_array(columns[name], mask=~mask)
+
+    return columns
+
+
+def _python_decode_node(message: "Message",
+                        node: Codec,
+                        data: bytes,
+                        scaling: bool,
+                        decoded: Dict[str, Any]) -> None:
+    """Decode given node like ``Message._decode()``, but skip multiplexer
+    branches which do not exist instead of raising an exception.
+
+    """
+
+    decoded.update(decode_data(data,
+                               message.length,
+                               node['signals'],
+                               node['formats'],
+                               False,
+                               scaling,
+                               False))
+
+    for mux_name, mux_nodes in node['multiplexers'].items():
+        mux_node = mux_nodes.get(int(decoded[mux_name]))
+
+        if mux_node is not None:
+            _python_decode_node(message, mux_node, data, scaling, decoded)
+
+
+def _python_decode_batch(message: "Message",
+                         payloads: Any,
+                         scaling: bool) -> Columns:
+    assert message._codecs is not None
+    columns: Dict[str, List[Any]] = {
+        signal.name: [] for signal in message.signals
+    }
+    length = message.length
+
+    for row, payload in enumerate(payloads):
+        data = bytes(payload[:length])
+
+        if len(data) < length:
+            raise DecodeError(f'Expected at least {length} bytes, but '
+                              f'got {len(data)}')
+
+        try:
+            decoded = message.decode_simple(data, False, scaling)
+        except DecodeError:
+            decoded = {}
+            _python_decode_node(message,
+                                message._codecs,
+                                data,
+                                scaling,
+                                decoded)
+
+        for name, column in columns.items():
+            column.append(decoded.get(name))
+
+    return columns
+
+
+def decode_batch(message: "Message",
+                 payloads: Any,
+                 scaling: bool = True) -> Columns:
+    """Decode given payloads of given message into one column per signal.
+
+    See :meth:`Message.decode_batch()<cantools.database.can.Message.decode_batch>`.
+
+    """
+
+    if message.is_container:
+        raise DecodeError(f'Message "{message.name}" is a container')
+
+    # Signals may extend past the message length in databases loaded
+    # with strict=False.
+    for signal in message.signals:
+        if _Field(signal).last >= message.length:
+            raise DecodeError(
+                f'The signal "{signal.name}" does not fit in the '
+                f'{message.length} bytes of message "{message.name}"')
+
+    if np is None:
+        return _python_decode_batch(message, payloads, scaling)
+    else:
+        return _numpy_decode_batch(message, payloads, scaling)
+
+
+def _shift(value: Any, shift: int) -> Any:
+    if shift >= 0:
+        return value >> np.uint64(shift)
+    else:
+        return value << np.uint64(-shift)
+
+
+def _number_of_rows(columns: Dict[str, Any]) -> int:
+    lengths = {len(column) for column in columns.values()}
+
+    if len(lengths) > 1:
+        raise EncodeError('All columns must have the same length')
+
+    return lengths.pop() if lengths else 0
+
+
+def _as_array(column: Any) -> Any:
+    """Returns given column as an array, keeping integers larger than 53
+    bits exact.
+
+    """
+
+    if isinstance(column, np.ndarray):
+        return column
+
+    array = np.asarray(column)
+
+    if array.dtype.kind in 'US':
+        # NumPy converts numbers mixed with strings to strings.
+        return np.array(column, dtype=object)
+
+    if array.dtype.kind == 'f':
+        if all(isinstance(value, (int, np.integer)) for value in column):
+            for dtype in [np.int64, np.uint64]:
+                try:
+                    return np.array(column, dtype=dtype)
+                except OverflowError:
+                    pass
+
+    return array
+
+
+def _column_values(signal: "Signal",
+                   column: Any,
+                   valid: Any) -> Tuple[Any, Any]:
+    """Returns the values of given column as an array of numbers and a
+    boolean array which is ``True`` for values given as choice strings.
+    Values in rows which are not valid are unspecified.
+
+    """
+
+    if isinstance(column, np.ma.MaskedArray):
+        if (np.ma.getmaskarray(column) & valid).any():
+            raise EncodeError(f'The signal "{signal.name}" is required for '
+                              f'encoding.')
+
+        column = column.data
+
+    column = _as_array(column)
+
+    if column.dtype.kind in 'iuf':
+        return column, np.zeros(len(column), dtype=bool)
+
+    # Choice strings, possibly mixed with numbers. Each distinct value
+    # is only converted once.
+    numbers: Dict[Any, Any] = {}
+    values: List[Any] = len(column) * [0]
+    is_choice = np.zeros(len(column), dtype=bool)
+
+    for row in np.flatnonzero(valid):
+        value = column[row]
+
+        if value is None:
+            raise EncodeError(f'The signal "{signal.name}" is required for '
+                              f'encoding.')
+
+        if isinstance(value, (int, float, np.number)):
+            values[row] = value
+            continue
+
+        key = str(value)
+
+        if key not in numbers:
+            try:
+                numbers[key] = signal.choice_string_to_number(key)
+            except (KeyError, ValueError):
+                raise EncodeError(f'Invalid value specified for signal '
+                                  f'"{signal.name}": "{value}"') from None
+
+        values[row] = numbers[key]
+        is_choice[row] = True
+
+    return _as_array(values), is_choice
+
+
+def _assert_values_valid(message: "Message",
+                         signal: "Signal",
+                         values: Any,
+                         checked: Any,
+                         scaling: bool) -> None:
+    """Vectorized version of ``Message._assert_signal_values_valid()``.
+
+    """
+
+    if signal.minimum is not None:
+        min_effective = signal.minimum
+
+        if not scaling:
+            min_effective = (signal.minimum - signal.offset) / signal.scale
+
+        invalid = checked & (values < min_effective - signal.scale * 1e-6)
+
+        if invalid.any():
+            raise EncodeError(
+                f'Expected signal "{signal.name}" value greater than '
+                f'or equal to {min_effective} in message "{message.name}", '
+                f'but got {values[np.argmax(invalid)]}.')
+
+    if signal.maximum is not None:
+        max_effective = signal.maximum
+
+        if not scaling:
+            max_effective = (signal.maximum - signal.offset) / signal.scale
+
+        invalid = checked & (values > max_effective + signal.scale * 1e-6)
+
+        if invalid.any():
+            raise EncodeError(
+                f'Expected signal "{signal.name}" value less than or '
+                f'equal to {max_effective} in message "{message.name}", '
+                f'but got {values[np.argmax(invalid)]}.')
+
+
+def _raw_values(signal: "Signal",
+                values: Any,
+                is_choice: Any,
+                valid: Any,
+                scaling: bool) -> Any:
+    """Convert given values to raw values like ``_encode_fields()`` in
+    ``cantools.database.utils`` and returns them as an array of
+    unsigned 64 bits integers.
+
+    """
+
+    numbers = ~is_choice
+
+    if scaling and not (signal.offset == 0 and signal.scale == 1):
+        values = np.where(numbers,
+                          (values - signal.offset) / signal.scale,
+                          values)
+
+    if signal.is_float:
+        integer_dtype, float_dtype = FLOAT_DTYPES[signal.length]
+
+        return values.astype(float_dtype).view(integer_dtype).astype(np.uint64)
+
+    if values.dtype.kind == 'f':
+        values = np.rint(values)
+
+    if signal.is_signed:
+        minimum = -(1 << (signal.length - 1))
+        maximum = (1 << (signal.length - 1)) - 1
+    else:
+        minimum = 0
+        maximum = (1 << signal.length) - 1
+
+    invalid = valid & ((values < minimum) | (values > maximum))
+
+    if invalid.any():
+        raise EncodeError(f'Signal "{signal.name}" value '
+                          f'{values[np.argmax(invalid)]} is out of range.')
+
+    if values.dtype.kind == 'f':
+        values = np.where(valid, values, 0)
+
+        if signal.is_signed or signal.length < 64:
+            values = values.astype(np.int64)
+
+    return values.astype(np.uint64) & np.uint64((1 << signal.length) - 1)
+
+
+def _numpy_encode_node(message: "Message",
+                       node: Codec,
+                       columns: Dict[str, Any],
+                       valid: Any,
+                       scaling: bool,
+                       strict: bool,
+                       encoded: Any,
+                       used: Any) -> None:
+    if not valid.any():
+        return
+
+    mux_numbers = {}
+
+    for signal in node['signals']:
+        try:
+            column = columns[signal.name]
+        except KeyError:
+            raise EncodeError(f'The signal "{signal.name}" is required for '
+                              f'encoding.') from None
+
+        values, is_choice = _column_values(signal, column, valid)
+
+        if signal.name in node['multiplexers']:
+            # Multiplexer ids are the given values, like in
+            # ``Message._get_mux_number()``.
+            mux_numbers[signal.name] = np.trunc(values).astype(np.int64)
+
+        if strict:
+            _assert_values_valid(message,
+                                 signal,
+                                 values,
+                                 valid & ~is_choice,
+                                 scaling)
+
+        raw = _raw_values(signal, values, is_choice, valid, scaling)
+        raw = np.where(valid, raw, np.uint64(0))
+        field = _Field(signal)
+
+        for index, shift in field.byte_shifts():
+            encoded[:, index] |= (_shift(raw, shift)
+                                  & np.uint64(0xff)).astype(np.uint8)
+            mask = (field.mask >> shift if shift >= 0 else field.mask << -shift)
+            used[valid, index] |= np.uint8(mask & 0xff)
+
+    for mux_name, mux_nodes in node['multiplexers'].items():
+        mux = mux_numbers[mux_name]
+        unknown = valid & ~np.isin(mux, list(mux_nodes))
+
+        if unknown.any():
+            raise EncodeError(f'Expected multiplexer id in '
+                              f'{{{format_or(list(mux_nodes.keys()))}}}, '
+                              f'for multiplexer "{mux_name}" '
+                              f'but got {mux[np.argmax(unknown)]}')
+
+        for mux_id, mux_node in mux_nodes.items():
+            _numpy_encode_node(message,
+                               mux_node,
+                               columns,
+                               valid & (mux == mux_id),
+                               scaling,
+                               strict,
+                               encoded,
+                               used)
+
+
+def _numpy_encode_batch(message: "Message",
+                        columns: Dict[str, Any],
+                        scaling: bool,
+                        padding: bool,
+                        strict: bool) -> Any:
+    assert message._codecs is not None
+    number_of_rows = _number_of_rows(columns)
+    encoded = np.zeros((number_of_rows, message.length), dtype=np.uint8)
+    used = np.zeros((number_of_rows, message.length), dtype=np.uint8)
+    _numpy_encode_node(message,
+                       message._codecs,
+                       columns,
+                       np.ones(number_of_rows, dtype=bool),
+                       scaling,
+                       strict,
+                       encoded,
+                       used)
+
+    if padding:
+        encoded |= ~used & np.uint8(message.unused_bit_pattern)
+
+    return encoded
+
+
+def _python_encode_batch(message: "Message",
+                         columns: Dict[str, Any],
+                         scaling: bool,
+                         padding: bool,
+                         strict: bool) -> List[bytes]:
+    encoded = []
+
+    for row in range(_number_of_rows(columns)):
+        data = {
+            name: column[row]
+            for name, column in columns.items()
+            if column[row] is not None
+        }
+        encoded.append(message.encode(message.gather_signals(data),
+                                      scaling,
+                                      padding,
+                                      strict))
+
+    return encoded
+
+
+def encode_batch(message: "Message",
+                 columns: Dict[str, Any],
+                 scaling: bool = True,
+                 padding: bool = False,
+                 strict: bool = True) -> Any:
+    """Encode given signal columns of given message into one payload per
+    row.
+
+    See :meth:`Message.encode_batch()<cantools.database.can.Message.encode_batch>`.
+
+    """
+
+    if message.is_container:
+        raise EncodeError(f'Message "{message.name}" is a container')
+
+    if strict:
+        unknown = set(columns) - {signal.name for signal in message.signals}
+
+        if unknown:
+            raise EncodeError(f'The following signals were specified but are '
+                              f'not required to encode the message:'
+                              f'{unknown}')
+
+    if np is None:
+        return _python_encode_batch(message, columns, scaling, padding, strict)
+
+    if any(signal.length > 64 for signal in message.signals):
+        encoded = _python_encode_batch(message,
+                                       columns,
+                                       scaling,
+                                       padding,
+                                       strict)
+
+        return np.frombuffer(b''.join(encoded),
+                             dtype=np.uint8).reshape(len(encoded),
+                                                     message.length)
+
+    return _numpy_encode_batch(message, columns, scaling, padding, strict)
+
+
+def group_frames(frame_ids: Sequence[int],
+                 payloads: Any,
+                 frame_id_mask: int) -> List[Tuple[int, Any]]:
+    """Group given frames by masked frame id. Returns a list of
+    ``(frame_id, payloads)`` tuples, in order of first appearance of
+    the frame id. The order of the payloads is kept.
+
+    """
+
+    if np is not None:
+        masked_ids = np.asarray(frame_ids, dtype=np.int64) & frame_id_mask
+        unique, first, inverse = np.unique(masked_ids,
+                                           return_index=True,
+                                           return_inverse=True)
+
+        if not isinstance(payloads, np.ndarray):
+            payloads = list(payloads)
+
+        result = []
+
+        for k in np.argsort(first, kind='stable'):
+            rows = np.flatnonzero(inverse == k)
+
+            if isinstance(payloads, np.ndarray):
+                group: Any = payloads[rows]
+            else:
+                group = [payloads[row] for row in rows]
+
+            result.append((int(unique[k]), group))
+
+        return result
+
+    groups: Dict[int, List[int]] = {}
+
+    for row, frame_id in enumerate(frame_ids):
+        groups.setdefault(frame_id & frame_id_mask, []).append(row)
+
+    payloads = list(payloads)
+
+    return [
+        (frame_id, [payloads[row] for row in rows])
+        for frame_id, rows in groups.items()
+    ]
@@ -466,6 +466,14 @@ typedef struct CANLIB_PARKING {{
 }} {database_name}_{message_name}_t;
 '''
 
+STRUCT_SHARED_FMT = '''\
+/**
+ * Signals in message {database_message_name}, the same as in message
+ * {database_template_name}.
+ */
+typedef {database_name}_{template_name}_t {database_name}_{message_name}_t;
+'''
+
 MESSAGE_INDEX = '''#define {database_name}_{message_name}_INDEX {index}
 '''
 
@@ -730,6 +738,41 @@ int {database_name}_{message_name}_unpack(
 }}
 '''
 
+DEFINITION_PACK_SHARED_FMT = '''\
+int {database_name}_{message_name}_pack(
+    uint8_t *dst_p,
+    const {database_name}_{message_name}_t *src_p,
+    size_t byte_size)
+{{
+    return {database_name}_{template_name}_pack(
+        dst_p,
+        src_p,
+        byte_size);
+}}
+
+'''
+
+DEFINITION_UNPACK_SHARED_FMT = '''\
+int {database_name}_{message_name}_unpack(
+    {database_name}_{message_name}_t *dst_p,
+    const uint8_t *src_p,
+    size_t byte_size
+    #ifdef CANLIB_TIMESTAMP
+        , uint64_t _timestamp
+    #endif // CANLIB_TIMESTAMP
+    )
+{{
+    return {database_name}_{template_name}_unpack(
+        dst_p,
+        src_p,
+        byte_size
+    #ifdef CANLIB_TIMESTAMP
+        , _timestamp
+    #endif // CANLIB_TIMESTAMP
+        );
+}}
+'''
+
 MESSAGE_DEFINITION_RAW_TO_CONVERSION_STRUCT = '''
 void {database_name}_{message_name}_raw_to_conversion_struct(
     {struct_type_out} *conversion, 
@@ -1976,6 +2019,8 @@ def _generate_masks(database_name, messages):
 
 def _generate_structs(database_name, messages, bit_fields, node_name):
     structs = []
+    shared_structs = []
+    templates = _get_templates(messages)
 
     for message in messages:
         for signal in message.signals:
@@ -1988,13 +2033,26 @@ def _generate_structs(database_name, messages, bit_fields, node_name):
 
     for message in messages:
         if _is_sender_or_receiver(message, node_name):
-            comment, members = _generate_struct(message, bit_fields, database_name)
-            structs.append(
-                STRUCT_FMT.format(comment=comment,
-                                database_message_name=message.name,
-                                message_name=message.snake_name,
-                                database_name=database_name,
-                                members='\n\n'.join(members)))
+            template = templates.get(message.name)
+
+            # the struct of a copy is the struct of its template, so
+            # that the functions of the template may be given it
+            if template is not None and _is_sender_or_receiver(template, node_name):
+                shared_structs.append(
+                    STRUCT_SHARED_FMT.format(database_message_name=message.name,
+                                             database_template_name=template.name,
+                                             message_name=message.snake_name,
+                                             template_name=template.snake_name,
+                                             database_name=database_name))
+            else:
+                comment, members = _generate_struct(message, bit_fields, database_name)
+                structs.append(
+                    STRUCT_FMT.format(comment=comment,
+                                    database_message_name=message.name,
+                                    message_name=message.snake_name,
+                                    database_name=database_name,
+                                    members='\n\n'.join(members)))
+
             comment, members = _generate_struct_converted(message, bit_fields, database_name)
             structs.append(
                 STRUCT_FMT.format(comment=comment,
@@ -2003,7 +2061,26 @@ def _generate_structs(database_name, messages, bit_fields, node_name):
                                 database_name=database_name,
                                 members='\n\n'.join(members)))
 
-    return '\n'.join(structs)
+    return '\n'.join(structs + shared_structs)
+
+def _get_templates(messages):
+    """Returns the messages of given messages that others are copies of,
+    by the names of the copies. The structs of the copies are typedefs
+    of the struct of their template, and they are packed and unpacked
+    by the functions of their template.
+
+    """
+
+    messages_by_id = {id(message._message): message for message in messages}
+    templates = {}
+
+    for message in messages:
+        template = message._message.template
+
+        if template is not None and id(template) in messages_by_id:
+            templates[message.name] = messages_by_id[id(template)]
+
+    return templates
 
 def _is_sender(message, node_name):
     return node_name is None or node_name in message.senders
@@ -2211,6 +2288,8 @@ def _generate_definitions(database_name, messages: List[Message], floating_point
     switch (message_id) {{
     '''.format(database_name=database_name)
 
+    templates = _get_templates(messages)
+
     for message in messages:
         signal_definitions = []
         is_sender = _is_sender(message, node_name)
@@ -2385,6 +2464,7 @@ def _generate_definitions(database_name, messages: List[Message], floating_point
             signal_definitions.append(DEFINITION_TO_STRING_FILE_NO_SIGNALS.format(database_name=database_name,
                                                                 message_name=msg_name))
         if message.length > 0:
+            template = templates.get(message.name)
             pack_variables, pack_body = _format_pack_code(message,
                                                           pack_helper_kinds)
             unpack_variables, unpack_body = _format_unpack_code(database_name,
@@ -2402,7 +2482,11 @@ def _generate_definitions(database_name, messages: List[Message], floating_point
                 unpack_unused += '    (void)src_p;\n\n'
 
             definition = ""
-            if is_sender:
+            if is_sender and template is not None and _is_sender(template, node_name):
+                definition += DEFINITION_PACK_SHARED_FMT.format(database_name=database_name,
+                                                                message_name=message.snake_name,
+                                                                template_name=template.snake_name)
+            elif is_sender:
                 definition += DEFINITION_PACK_FMT.format(database_name=database_name,
                                                          database_message_name=message.name,
                                                          message_name=message.snake_name,
@@ -2410,7 +2494,13 @@ def _generate_definitions(database_name, messages: List[Message], floating_point
                                                          pack_unused=pack_unused,
                                                          pack_variables=pack_variables,
                                                          pack_body=pack_body)
-            if is_receiver:
+            # the signals and thereby their receivers are the ones of
+            # the template
+            if is_receiver and template is not None:
+                definition += DEFINITION_UNPACK_SHARED_FMT.format(database_name=database_name,
+                                                                  message_name=message.snake_name,
+                                                                  template_name=template.snake_name)
+            elif is_receiver:
                 definition += DEFINITION_UNPACK_FMT.format(database_name=database_name,
                                                            database_message_name=message.name,
                                                            message_name=message.snake_name,
@@ -221,7 +221,9 @@ def _get_type(signal, msg_name, database_name):
     return f'e_{database_name}_{_type_name(signal)}'
 
 def _generate_enums(database_name, messages):
-    types = set()
+    # in order of first use, so that the generated code does not
+    # depend on the hash seed
+    types = {}
     enums = []
 
     for msg in messages.messages:
@@ -229,7 +231,7 @@ def _generate_enums(database_name, messages):
             if signal.choices != None:
                 enums.append(_get_type(signal, msg.name, database_name))
             else:
-                types.add(_get_type(signal, msg.name, database_name))
+                types[_get_type(signal, msg.name, database_name)] = None
     
     size = len(types)
 
@@ -1,13 +1,19 @@
 import logging
 from typing import (
+    Any,
     Dict,
+    Iterable,
     List,
+    Sequence,
     Tuple,
     Optional,
     TextIO,
     Union,
+    cast,
 )
 
+from .batch import Columns
+from .batch import group_frames
 from .bus import Bus
 from .formats import arxml
 from .formats import dbc
@@ -18,6 +24,7 @@ from .formats.arxml import AutosarDatabaseSpecifics
 from .formats.dbc import DbcSpecifics
 from .internal_database import InternalDatabase
 from .message import Message
+from .message_filter import MessageFilter
 from .node import Node
 from ..errors import DecodeError
 from ..utils import (
@@ -25,6 +32,7 @@ from ..utils import (
     type_sort_attributes,
     type_sort_choices,
     sort_signals_by_start_bit,
+    share_database_metadata,
     SORT_SIGNALS_DEFAULT
 )
 from ...compat import fopen
@@ -50,6 +58,16 @@ class Database:
     If you don't want them to be sorted pass `sort_signals = None`.
     If you want the signals to be sorted in another way pass something like
     `sort_signals = lambda signals: list(sorted(signals, key=lambda sig: sig.name))`
+
+    If `lazy_codecs` is ``True`` the codecs of each message are created
+    when the message is first encoded or decoded, which makes loading
+    large databases faster. Errors enabled by `strict` are then raised
+    at that time as well. Use :meth:`.warm_up()` to create them
+    beforehand.
+
+    If `message_filter` is given, only the messages it selects are
+    added by the ``add_*()`` methods. See
+    :class:`~cantools.database.can.MessageFilter`.
     """
 
     def __init__(self,
@@ -62,6 +80,8 @@ class Database:
                  frame_id_mask: Optional[int] = None,
                  strict: bool = True,
                  sort_signals: type_sort_signals = sort_signals_by_start_bit,
+                 lazy_codecs: bool = False,
+                 message_filter: Optional[MessageFilter] = None
                  ) -> None:
         self._messages = messages or []
         self._nodes = nodes or []
@@ -78,6 +98,8 @@ class Database:
         self._frame_id_mask = frame_id_mask
         self._strict = strict
         self._sort_signals = sort_signals
+        self._lazy_codecs = lazy_codecs
+        self._message_filter = message_filter
         self.refresh()
 
     @property
@@ -148,9 +170,16 @@ class Database:
         """Read and parse ARXML data from given file-like object and add the
         parsed data to the database.
 
+        The file is parsed incrementally, so its contents are never
+        held in memory as a whole.
+
         """
 
-        self.add_arxml_string(fp.read())
+        self._add_arxml_database(arxml.load(fp,
+                                            self._strict,
+                                            sort_signals=self._sort_signals,
+                                            lazy_codecs=self._lazy_codecs,
+                                            message_filter=self._message_filter))
 
     def add_arxml_file(self,
                        filename: StringPathLike,
@@ -171,9 +200,15 @@ class Database:
 
         """
 
-        database = arxml.load_string(string, self._strict, sort_signals=self._sort_signals)
+        self._add_arxml_database(
+            arxml.load_string(string,
+                              self._strict,
+                              sort_signals=self._sort_signals,
+                              lazy_codecs=self._lazy_codecs,
+                              message_filter=self._message_filter))
 
-        self._messages += database.messages
+    def _add_arxml_database(self, database: InternalDatabase) -> None:
+        self._messages += self._select_messages(database.messages)
         self._nodes = database.nodes
         self._buses = database.buses
         self._version = database.version
@@ -181,61 +216,89 @@ class Database:
         self._autosar = database.autosar
         self.refresh()
 
-    def add_dbc(self, fp: TextIO) -> None:
+    def add_dbc(self, fp: TextIO, parser: str = 'fast') -> None:
         """Read and parse DBC data from given file-like object and add the
         parsed data to the database.
 
+        See :meth:`add_dbc_string()` for a description of `parser`.
+
         >>> db = cantools.database.Database()
         >>> with open ('foo.dbc', 'r') as fin:
         ...     db.add_dbc(fin)
 
         """
 
-        self.add_dbc_string(fp.read())
+        self.add_dbc_string(fp.read(), parser)
 
     def add_dbc_file(self,
                      filename: StringPathLike,
-                     encoding: str = 'cp1252') -> None:
+                     encoding: str = 'cp1252',
+                     parser: str = 'fast') -> None:
         """Open, read and parse DBC data from given file and add the parsed
         data to the database.
 
         `encoding` specifies the file encoding.
 
+        See :meth:`add_dbc_string()` for a description of `parser`.
+
         >>> db = cantools.database.Database()
         >>> db.add_dbc_file('foo.dbc')
 
         """
 
         with fopen(filename, 'r', encoding=encoding) as fin:
-            self.add_dbc(fin)
+            self.add_dbc(fin, parser)
 
-    def add_dbc_string(self, string: str) -> None:
+    def add_dbc_string(self, string: str, parser: str = 'fast') -> None:
         """Parse given DBC data string and add the parsed data to the
         database.
 
+        `parser` is ``'fast'`` (default) for the hand-written parser,
+        or ``'textparser'`` for the grammar based parser of earlier
+        versions. Both create the same database.
+
         >>> db = cantools.database.Database()
         >>> with open ('foo.dbc', 'r') as fin:
         ...     db.add_dbc_string(fin.read())
 
         """
 
-        database = dbc.load_string(string, self._strict, sort_signals=self._sort_signals)
+        database = dbc.load_string(string,
+                                   self._strict,
+                                   sort_signals=self._sort_signals,
+                                   lazy_codecs=self._lazy_codecs,
+                                   message_filter=self._message_filter,
+                                   parser=parser)
 
-        self._messages += database.messages
+        self._messages += self._select_messages(database.messages)
         self._nodes = database.nodes
         self._buses = database.buses
         self._version = database.version
         self._dbc = database.dbc
         self.refresh()
 
-    def add_json_file(self, name: str, encoding: str = 'cp1252') -> None:
+    def add_json_file(self,
+                      name: str,
+                      encoding: str = 'cp1252',
+                      id_allocations: Optional[Dict[str, int]] = None) -> None:
         with fopen(name, 'r', encoding=encoding) as fin:
-            self.add_json_string(fin.read())
+            self.add_json_string(fin.read(), id_allocations)
+
+    def add_json_string(self,
+                        string: str,
+                        id_allocations: Optional[Dict[str, int]] = None) -> None:
+        """Parse given JSON network string and add the parsed data to the
+        database.
+
+        `id_allocations` maps message names to the frame ids they were
+        given when loading a previous version of the network, see
+        :class:`~cantools.database.can.formats.json.IdAllocator`.
+
+        """
 
-    def add_json_string(self, string: str) -> None:
-        database = json.load_string(string, self._strict, sort_signals=self._sort_signals, messages = self.messages)
+        database = json.load_string(string, self._strict, sort_signals=self._sort_signals, messages = self.messages, lazy_codecs=self._lazy_codecs, message_filter=self._message_filter, id_allocations=id_allocations)
 
-        self._messages += database.messages
+        self._messages += self._select_messages(database.messages)
         self._nodes = database.nodes
         self._buses = database.buses
         self.refresh()
@@ -267,9 +330,13 @@ class Database:
 
         """
 
-        database = kcd.load_string(string, self._strict, sort_signals=self._sort_signals)
+        database = kcd.load_string(string,
+                                   self._strict,
+                                   sort_signals=self._sort_signals,
+                                   lazy_codecs=self._lazy_codecs,
+                                   message_filter=self._message_filter)
 
-        self._messages += database.messages
+        self._messages += self._select_messages(database.messages)
         self._nodes = database.nodes
         self._buses = database.buses
         self._version = database.version
@@ -303,15 +370,35 @@ class Database:
 
         """
 
-        database = sym.load_string(string, self._strict, sort_signals=self._sort_signals)
+        database = sym.load_string(string,
+                                   self._strict,
+                                   sort_signals=self._sort_signals,
+                                   lazy_codecs=self._lazy_codecs,
+                                   message_filter=self._message_filter)
 
-        self._messages += database.messages
+        self._messages += self._select_messages(database.messages)
         self._nodes = database.nodes
         self._buses = database.buses
         self._version = database.version
         self._dbc = database.dbc
         self.refresh()
 
+    def _select_messages(self, messages: List[Message]) -> List[Message]:
+        """Returns given loaded messages that are selected by the message
+        filter. The format loaders have already skipped the messages
+        that were not selected by name, frame id, node or bus.
+
+        """
+
+        if self._message_filter is None:
+            return messages
+
+        return [
+            message
+            for message in messages
+            if self._message_filter.match_message(message)
+        ]
+
     def _add_message(self, message: Message) -> None:
         """Add given message to the database.
 
@@ -468,7 +555,9 @@ class Database:
                        decode_choices: bool = True,
                        scaling: bool = True,
                        decode_containers: bool = False,
-                       allow_truncated:  bool = False
+                       allow_truncated:  bool = False,
+                       signals: Optional[Iterable[str]] = None,
+                       choice_strings: bool = False
                        ) \
         -> DecodeResultType:
 
@@ -493,6 +582,15 @@ class Database:
         expect this to misbehave. Trying to decode a container message
         with `decode_containers` set to ``False`` will raise a
         `DecodeError`.
+
+        If `signals` is given, only the signals with given names are
+        decoded.
+
+        >>> db.decode_message('Foo', b'\\x01\\x45\\x23\\x00\\x11', signals=['Fum'])
+        {'Fum': 5.0}
+
+        If `choice_strings` is ``True`` choices are decoded to plain
+        strings, see :meth:`Message.decode()`.
         """
 
         if isinstance(frame_id_or_name, int):
@@ -508,7 +606,8 @@ class Database:
                                       decode_choices,
                                       scaling,
                                       decode_containers=True,
-                                      allow_truncated=allow_truncated)
+                                      allow_truncated=allow_truncated,
+                                      choice_strings=choice_strings)
             else:
                 raise DecodeError(f'Message "{message.name}" is a container '
                                   f'message, but decoding such messages has '
@@ -517,7 +616,96 @@ class Database:
         return message.decode(data,
                               decode_choices,
                               scaling,
-                              allow_truncated=allow_truncated)
+                              allow_truncated=allow_truncated,
+                              signals=signals,
+                              choice_strings=choice_strings)
+
+    def decode_from_buffer(self,
+                           frame_id: int,
+                           buf: Any,
+                           offset: int,
+                           length: int,
+                           decode_choices: bool = True,
+                           scaling: bool = True,
+                           decode_containers: bool = False,
+                           allow_truncated: bool = False
+                           ) \
+        -> DecodeResultType:
+        """Decode the `length` bytes at `offset` in given buffer `buf` as a
+        message of given frame id `frame_id`, without copying them.
+
+        `buf` may be any object supporting the buffer protocol, for
+        example a ``bytearray`` frames are received into. The other
+        arguments are the same as for :meth:`decode_message()`.
+
+        >>> buf = bytearray(b'\\x00\\x00\\x01\\x45\\x23\\x00\\x11\\x00')
+        >>> db.decode_from_buffer(158, buf, 2, 5)
+        {'Bar': 1, 'Fum': 5.0}
+
+        """
+
+        # Message decoders accept any buffer, not only bytes.
+        data = cast(bytes, memoryview(buf)[offset:offset + length])
+
+        return self.decode_message(frame_id,
+                                   data,
+                                   decode_choices,
+                                   scaling,
+                                   decode_containers,
+                                   allow_truncated)
+
+    def decode_batch(self,
+                     frame_ids: Sequence[int],
+                     payloads: Any,
+                     scaling: bool = True) -> Dict[str, Columns]:
+        """Decode many frames at once. `frame_ids` is a sequence of ``N``
+        frame ids and `payloads` the corresponding ``(N, length)``
+        array of ``uint8`` or sequence of ``bytes`` objects.
+
+        Returns a dictionary mapping the name of each message found
+        in the frames to its signal columns, as returned by
+        :meth:`Message.decode_batch()<cantools.database.can.Message.decode_batch>`
+        for the frames of that message, in their original order.
+        Frames with unknown frame ids are ignored.
+
+        >>> db.decode_batch([158, 158], [b'\\x01\\x45\\x23\\x00\\x11',
+        ...                              b'\\x02\\x45\\x23\\x00\\x11'])
+        {'Foo': {'Bar': array([1, 2]), 'Fum': array([5., 5.])}}
+
+        """
+
+        result = {}
+
+        for frame_id, message_payloads in group_frames(frame_ids,
+                                                       payloads,
+                                                       self._frame_id_mask):
+            try:
+                message = self._frame_id_to_message[frame_id]
+            except KeyError:
+                continue
+
+            result[message.name] = message.decode_batch(message_payloads,
+                                                        scaling)
+
+        return result
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> None:
+        """Create the codecs of the messages with given names now, or of
+        all messages if `names` is ``None``. This is only useful for
+        databases with lazy codecs.
+
+        >>> db = cantools.database.load_file('foo.arxml', lazy_codecs=True)
+        >>> db.warm_up(['Foo', 'Bar'])
+
+        """
+
+        if names is None:
+            messages = self._messages
+        else:
+            messages = [self._name_to_message[name] for name in names]
+
+        for message in messages:
+            message.warm_up()
 
     def refresh(self) -> None:
         """Refresh the internal database state.
@@ -530,6 +718,7 @@ class Database:
 
         self._name_to_message = {}
         self._frame_id_to_message = {}
+        share_database_metadata(self)
 
         for message in self._messages:
             message.refresh(self._strict)
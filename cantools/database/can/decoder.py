@@ -0,0 +1,427 @@
+# Compiled message decoders.
+#
+# The generic decoding path walks the codec tree of a message at
+# runtime. Here the codec tree is instead turned into the Python
+# source code of a function specialized for exactly one message,
+# which is compiled once and then called for every frame.
+
+import struct
+import sys
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    TYPE_CHECKING,
+    cast,
+)
+
+from .signal import NamedSignalValue
+from ..errors import DecodeError
+from ..utils import format_or
+from ..utils import start_bit
+from ..utils import sawtooth_to_network_bitnum
+from ...typechecking import Codec, SignalDictType
+
+if TYPE_CHECKING:
+    from .signal import Signal
+
+
+CompiledDecoder = Callable[[bytes, bool, bool], SignalDictType]
+CompiledRecordDecoder = Callable[[List[Any], bytes, bool, bool], None]
+
+# Decoding modes as (decode_choices, scaling) tuples, in the order
+# they are dispatched by the generated entry function.
+MODES = [
+    (True, True),
+    (True, False),
+    (False, True),
+    (False, False),
+]
+
+FLOAT_FORMATS = {
+    16: '>e',
+    32: '>f',
+    64: '>d',
+}
+
+
+def is_regular_layout(signals: List["Signal"], length: int) -> bool:
+    """Returns ``True`` if the bitstruct formats created for given
+    signals place every signal at its actual position within the
+    message, which is a requirement for compiling a decoder that
+    gives identical results.
+
+    """
+
+    format_length = 8 * length
+    start = 0
+    be_signals = [
+        signal for signal in signals if signal.byte_order == 'big_endian'
+    ]
+
+    for signal in sorted(be_signals,
+                         key=lambda s: sawtooth_to_network_bitnum(s.start)):
+        if start_bit(signal) < start:
+            return False
+
+        start = start_bit(signal) + signal.length
+
+    if start > format_length:
+        return False
+
+    end = format_length
+
+    for signal in signals[::-1]:
+        if signal.byte_order == 'big_endian':
+            continue
+
+        if signal.start + signal.length > end or signal.start < 0:
+            return False
+
+        end = signal.start
+
+    return True
+
+
+def _is_compilable(codec: Codec, length: int) -> bool:
+    for signal in codec['signals']:
+        if signal.is_float and signal.length not in FLOAT_FORMATS:
+            return False
+
+    if not is_regular_layout(codec['signals'], length):
+        return False
+
+    for mux_codecs in codec['multiplexers'].values():
+        for mux_codec in mux_codecs.values():
+            if not _is_compilable(mux_codec, length):
+                return False
+
+    return True
+
+
+def choice_strings(signal: "Signal") -> Dict[int, str]:
+    """Returns a dictionary mapping the values of the choices of given
+    signal to their interned names.
+
+    """
+
+    assert signal.choices is not None
+
+    return {
+        value: sys.intern(str(choice))
+        for value, choice in signal.choices.items()
+    }
+
+
+class _Generator:
+
+    def __init__(self,
+                 codec: Codec,
+                 length: int,
+                 strings: bool = False,
+                 indices: Optional[Dict[str, int]] = None) -> None:
+        self.codec = codec
+        self.length = length
+        self.strings = strings
+        self.indices = indices
+        self.namespace: Dict[str, Any] = {
+            'DecodeError': DecodeError,
+            'from_bytes': int.from_bytes,
+        }
+        self.functions: List[str] = []
+        self.dispatchers: Dict[str, Dict[int, str]] = {}
+        self.number_of_names = 0
+        self.uses_le = False
+        self.uses_be = False
+
+    def unique(self, prefix: str) -> str:
+        name = f'{prefix}{self.number_of_names}'
+        self.number_of_names += 1
+
+        return name
+
+    def name(self, prefix: str, value: Any) -> str:
+        """Bind given value to a new unique name in the namespace of the
+        generated code.
+
+        """
+
+        name = self.unique(prefix)
+        self.namespace[name] = value
+
+        return name
+
+    def raw_value_lines(self, signal: "Signal", variable: str) -> List[str]:
+        mask = (1 << signal.length) - 1
+
+        if signal.byte_order == 'little_endian':
+            self.uses_le = True
+            shift = signal.start
+            source = 'le'
+        else:
+            self.uses_be = True
+            shift = 8 * self.length - start_bit(signal) - signal.length
+            source = 'be'
+
+        if shift > 0:
+            lines = [f'{variable} = ({source} >> {shift}) & {mask:#x}']
+        else:
+            lines = [f'{variable} = {source} & {mask:#x}']
+
+        if signal.is_float:
+            unpack = self.name('unpack', struct.Struct(
+                FLOAT_FORMATS[signal.length]).unpack)
+            lines.append(f'{variable} = {unpack}('
+                         f'{variable}.to_bytes({signal.length // 8}, "big"))[0]')
+        elif signal.is_signed:
+            lines.append(f'if {variable} & {1 << (signal.length - 1):#x}:')
+            lines.append(f'    {variable} -= {1 << signal.length:#x}')
+
+        return lines
+
+    def value_lines(self,
+                    signal: "Signal",
+                    variable: str,
+                    decode_choices: bool,
+                    scaling: bool) -> List[str]:
+        if self.indices is None:
+            key = repr(signal.name)
+        else:
+            key = str(self.indices[signal.name])
+
+        if scaling:
+            scale = self.name('scale', signal.scale)
+            offset = self.name('offset', signal.offset)
+            value = f'{scale} * {variable} + {offset}'
+        else:
+            value = variable
+
+        if decode_choices and signal.choices is not None:
+            if self.strings:
+                choices = self.name('choices', choice_strings(signal))
+            else:
+                choices = self.name('choices', signal.choices)
+
+            return [
+                'try:',
+                f'    decoded[{key}] = {choices}[{variable}]',
+                'except KeyError:',
+                f'    decoded[{key}] = {value}',
+            ]
+
+        return [f'decoded[{key}] = {value}']
+
+    def mux_number_lines(self,
+                         signal: "Signal",
+                         variable: str,
+                         decode_choices: bool,
+                         scaling: bool) -> List[str]:
+        """Lines computing the multiplexer id exactly like
+        ``Message._get_mux_number()`` does for the decoded value of
+        given multiplexer signal.
+
+        """
+
+        if scaling:
+            scale = self.name('scale', signal.scale)
+            offset = self.name('offset', signal.offset)
+            number = f'int({scale} * {variable} + {offset})'
+        else:
+            number = f'int({variable})'
+
+        if decode_choices and signal.choices is not None:
+            numbers = {}
+
+            for value, choice in signal.choices.items():
+                if isinstance(choice, (str, NamedSignalValue)):
+                    numbers[value] = signal.choice_string_to_number(str(choice))
+                else:
+                    numbers[value] = int(choice)
+
+            choice_numbers = self.name('mux_numbers', numbers)
+
+            return [
+                'try:',
+                f'    mux = {choice_numbers}[{variable}]',
+                'except KeyError:',
+                f'    mux = {number}',
+            ]
+
+        return [f'mux = {number}']
+
+    def node_lines(self,
+                   codec: Codec,
+                   decode_choices: bool,
+                   scaling: bool) -> List[str]:
+        lines = []
+        variables = {}
+
+        for signal in codec['signals']:
+            variable = self.unique('v')
+            variables[signal.name] = (signal, variable)
+            lines += self.raw_value_lines(signal, variable)
+            lines += self.value_lines(signal, variable, decode_choices, scaling)
+
+        for mux_name, mux_codecs in codec['multiplexers'].items():
+            signal, variable = variables[mux_name]
+            functions = {}
+
+            for mux_id, mux_codec in mux_codecs.items():
+                functions[mux_id] = self.function(mux_codec,
+                                                  decode_choices,
+                                                  scaling)
+
+            dispatch = self.unique('dispatch')
+            self.dispatchers[dispatch] = functions
+            error = self.name(
+                'mux_error',
+                f'expected multiplexer id '
+                f'{format_or(list(mux_codecs.keys()))}, but got {{}}')
+            lines += self.mux_number_lines(signal, variable, decode_choices, scaling)
+            lines += [
+                'try:',
+                f'    function = {dispatch}[mux]',
+                'except KeyError:',
+                f'    raise DecodeError({error}.format(mux)) from None',
+                'function(le, be, decoded)',
+            ]
+
+        return lines
+
+    def function(self,
+                 codec: Codec,
+                 decode_choices: bool,
+                 scaling: bool) -> str:
+        """Generate a function decoding the signals of given codec into a
+        dictionary. Returns the name of the function, which is only
+        valid once the generated source code has been executed.
+
+        """
+
+        name = self.unique('decode_node')
+        body = self.node_lines(codec, decode_choices, scaling)
+        self.functions.append('\n'.join(
+            [f'def {name}(le, be, decoded):']
+            + ['    ' + line for line in body]
+            + ['    pass']))
+
+        return name
+
+    def generate(self) -> str:
+        # The root nodes are inlined into the entry function to avoid
+        # a function call per frame for messages without multiplexers.
+        bodies = [
+            self.node_lines(self.codec, decode_choices, scaling)
+            for decode_choices, scaling in MODES
+        ]
+        le = "from_bytes(data, 'little')" if self.uses_le else '0'
+        be = "from_bytes(data, 'big')" if self.uses_be else '0'
+
+        if self.indices is None:
+            lines = [
+                'def decode(data, decode_choices, scaling):',
+                '    decoded = {}',
+            ]
+            result = 'decoded'
+        else:
+            # Signals of multiplexer branches not selected by the data
+            # are left as None.
+            empty = self.name('empty', len(self.indices) * (None, ))
+            lines = [
+                'def decode(decoded, data, decode_choices, scaling):',
+                f'    decoded[:] = {empty}',
+            ]
+            result = 'None'
+
+        lines += [
+            f'    le = {le}',
+            f'    be = {be}',
+            '    if decode_choices:',
+            '        if scaling:',
+            *['            ' + line for line in bodies[0]],
+            '            pass',
+            '        else:',
+            *['            ' + line for line in bodies[1]],
+            '            pass',
+            '    elif scaling:',
+            *['        ' + line for line in bodies[2]],
+            '        pass',
+            '    else:',
+            *['        ' + line for line in bodies[3]],
+            '        pass',
+            f'    return {result}',
+        ]
+
+        return '\n\n'.join(self.functions + ['\n'.join(lines)]) + '\n'
+
+
+def generate_decoder_source(codec: Codec, length: int) -> str:
+    """Returns the Python source code of the decoder for given codec and
+    message length. Mainly useful for debugging.
+
+    """
+
+    return _Generator(codec, length).generate()
+
+
+def _compile(generator: _Generator, name: str) -> Callable:
+    source = generator.generate()
+    namespace = generator.namespace
+    exec(compile(source, f'<cantools decoder of {name}>', 'exec'), namespace)
+
+    # Multiplexer dispatch tables refer to the generated functions,
+    # which only exist once the source code has been executed.
+    for dispatch, functions in generator.dispatchers.items():
+        namespace[dispatch] = {
+            mux_id: namespace[function]
+            for mux_id, function in functions.items()
+        }
+
+    return cast(Callable, namespace['decode'])
+
+
+def create_decoder(codec: Codec,
+                   length: int,
+                   name: str = 'message',
+                   strings: bool = False) -> Optional[CompiledDecoder]:
+    """Create a function decoding a message of given codec tree and length
+    in bytes.
+
+    The returned function takes the arguments ``data``,
+    ``decode_choices`` and ``scaling`` and gives the same result as
+    the generic decoding path for data of exactly `length` bytes.
+    ``None`` is returned if the codec tree cannot be compiled, in
+    which case the generic decoding path must be used.
+
+    If `strings` is ``True`` choices are decoded to their interned
+    names instead of :class:`NamedSignalValue` objects.
+
+    """
+
+    if not _is_compilable(codec, length):
+        return None
+
+    return _compile(_Generator(codec, length, strings), name)
+
+
+def create_record_decoder(codec: Codec,
+                          length: int,
+                          indices: Dict[str, int],
+                          name: str = 'message',
+                          strings: bool = False) \
+                          -> Optional[CompiledRecordDecoder]:
+    """Like :func:`create_decoder()`, but the returned function decodes
+    the signals into given list instead of a new dictionary. It takes
+    the arguments ``values``, ``data``, ``decode_choices`` and
+    ``scaling``. The value of each signal is stored at its index in
+    `indices`, and signals not present in the data are set to
+    ``None``.
+
+    """
+
+    if not _is_compilable(codec, length):
+        return None
+
+    return _compile(_Generator(codec, length, strings, indices), name)
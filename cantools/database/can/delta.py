@@ -0,0 +1,230 @@
+# Decoding of the changes between consecutive frames.
+
+from typing import (
+    Dict,
+    Hashable,
+    List,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+from .projection import Projection
+from ..utils import start_bit
+from ...typechecking import SignalDictType
+
+if TYPE_CHECKING:
+    from .database import Database
+    from .message import Message
+    from .signal import Signal
+
+
+# Maximum number of projections of changed signals cached per
+# message. All are discarded once exceeded.
+MAX_NUMBER_OF_PROJECTIONS = 64
+
+_MISSING = object()
+
+
+def _signal_mask(signal: "Signal", length: int) -> int:
+    """Returns a mask of the bits of given signal in the data of a message
+    of given length, read as a big endian integer.
+
+    """
+
+    mask = bytearray(length)
+
+    if signal.byte_order == 'little_endian':
+        for bit in range(signal.start, signal.start + signal.length):
+            if 0 <= bit < 8 * length:
+                mask[bit // 8] |= (1 << (bit % 8))
+    else:
+        start = start_bit(signal)
+
+        for bit in range(start, start + signal.length):
+            if 0 <= bit < 8 * length:
+                mask[bit // 8] |= (0x80 >> (bit % 8))
+
+    return int.from_bytes(mask, 'big')
+
+
+class _Layout:
+    """Bit masks of the signals of a message.
+
+    """
+
+    def __init__(self, message: "Message") -> None:
+        self.masks: List[Tuple[str, int]] = []
+        self.multiplexer_mask = 0
+        self.projections: Dict[Tuple[str, ...], Projection] = {}
+
+        for signal in message.signals:
+            mask = _signal_mask(signal, message.length)
+
+            if signal.is_multiplexer:
+                self.multiplexer_mask |= mask
+            else:
+                self.masks.append((signal.name, mask))
+
+
+class _State:
+
+    def __init__(self,
+                 message: "Message",
+                 data: bytes,
+                 decoded: SignalDictType) -> None:
+        self.message = message
+        self.data = data
+        self.decoded = decoded
+
+
+class DeltaDecoder:
+    """Decodes frames of given database `database`, but only returns the
+    signals that changed since the previous frame with the same frame
+    id on the same channel.
+
+    The last payload and its decoded signals are remembered per
+    channel and frame id. A frame with unchanged payload is not
+    decoded at all. Otherwise only the signals with bits that differ
+    from the previous payload are decoded, unless a multiplexer
+    signal changed, in which case the whole frame is decoded and
+    compared to the previous signal values.
+
+    `decode_choices`, `scaling` and `allow_truncated` are passed to
+    :meth:`Message.decode()<cantools.database.can.Message.decode()>`.
+
+    Call :meth:`reset()` after modifying the database.
+
+    >>> decoder = DeltaDecoder(db)
+    >>> decoder.decode(158, b'\\x01\\x45\\x23\\x00\\x11')
+    {'Bar': 1, 'Fum': 5.0}
+    >>> decoder.decode(158, b'\\x01\\x45\\x23\\x00\\x11')
+    {}
+    >>> decoder.decode(158, b'\\x02\\x45\\x23\\x00\\x11')
+    {'Bar': 2}
+
+    """
+
+    def __init__(self,
+                 database: "Database",
+                 decode_choices: bool = True,
+                 scaling: bool = True,
+                 allow_truncated: bool = False) -> None:
+        self._database = database
+        self._decode_choices = decode_choices
+        self._scaling = scaling
+        self._allow_truncated = allow_truncated
+        self._states: Dict[Tuple[Hashable, int], _State] = {}
+        self._layouts: Dict[Message, _Layout] = {}
+
+    @property
+    def database(self) -> "Database":
+        """The database used to decode frames.
+
+        """
+
+        return self._database
+
+    def reset(self) -> None:
+        """Forget all previous frames.
+
+        """
+
+        self._states = {}
+        self._layouts = {}
+
+    def decoded(self, frame_id: int, channel: Hashable = None) -> SignalDictType:
+        """Returns all signals of the last frame with given frame id on given
+        channel. Raises a ``KeyError`` if no such frame has been
+        decoded.
+
+        """
+
+        return dict(self._states[(channel, frame_id)].decoded)
+
+    def decode(self,
+               frame_id: int,
+               data: bytes,
+               channel: Hashable = None) -> SignalDictType:
+        """Decode given data of a frame with given frame id received on given
+        channel, and return the signals that changed since the previous
+        frame. All signals are returned for the first frame.
+
+        Signals of multiplexer branches no longer selected are not
+        part of the result, use :meth:`decoded()` to get all current
+        signals.
+
+        """
+
+        message = self._database.get_message_by_frame_id(frame_id)
+        data = bytes(data[:message.length])
+        key = (channel, frame_id)
+        state = self._states.get(key)
+
+        if (state is None
+                or state.message is not message
+                or len(state.data) != len(data)):
+            decoded = message.decode_simple(data,
+                                            self._decode_choices,
+                                            self._scaling,
+                                            self._allow_truncated)
+            self._states[key] = _State(message, data, decoded)
+
+            return dict(decoded)
+
+        if data == state.data:
+            return {}
+
+        changed = int.from_bytes(data, 'big') ^ int.from_bytes(state.data, 'big')
+        layout = self._layout(message)
+
+        if changed & layout.multiplexer_mask or len(data) != message.length:
+            decoded = message.decode_simple(data,
+                                            self._decode_choices,
+                                            self._scaling,
+                                            self._allow_truncated)
+            delta = {
+                name: value
+                for name, value in decoded.items()
+                if state.decoded.get(name, _MISSING) != value
+            }
+            state.decoded = decoded
+        else:
+            names = tuple(
+                name
+                for name, mask in layout.masks
+                if changed & mask and name in state.decoded
+            )
+            delta = self._projection(layout, message, names).decode(
+                data,
+                self._decode_choices,
+                self._scaling,
+                self._allow_truncated)
+            state.decoded.update(delta)
+
+        state.data = data
+
+        return delta
+
+    def _layout(self, message: "Message") -> _Layout:
+        try:
+            return self._layouts[message]
+        except KeyError:
+            layout = _Layout(message)
+            self._layouts[message] = layout
+
+            return layout
+
+    def _projection(self,
+                    layout: _Layout,
+                    message: "Message",
+                    names: Tuple[str, ...]) -> Projection:
+        try:
+            return layout.projections[names]
+        except KeyError:
+            if len(layout.projections) == MAX_NUMBER_OF_PROJECTIONS:
+                layout.projections = {}
+
+            projection = message.compile_projection(names)
+            layout.projections[names] = projection
+
+            return projection
@@ -1,8 +1,10 @@
+import io
 import re
 
-from typing import Any
+from typing import Any, Optional
 from xml.etree import ElementTree
 
+from .index import ArxmlIndex, iterparse_arxml
 from .system_loader import SystemLoader
 from .ecu_extract_loader import EcuExtractLoader
 
@@ -15,6 +17,7 @@ from .secoc_properties import AutosarSecOCProperties
 from .end_to_end_properties import AutosarEnd2EndProperties
 
 from ...internal_database import InternalDatabase
+from ...message_filter import MessageFilter
 from ....utils import type_sort_signals, sort_signals_by_start_bit
 
 def is_ecu_extract(root: Any # For whatever reason, mypy does not
@@ -40,16 +43,55 @@ def is_ecu_extract(root: Any # For whatever reason, mypy does not
 
     return ecuc_value_collection is not None
 
+def load(fp:Any,
+         strict:bool=True,
+         sort_signals:type_sort_signals=sort_signals_by_start_bit,
+         lazy_codecs:bool=False,
+         message_filter:Optional[MessageFilter]=None) \
+            -> InternalDatabase:
+    """Parse given ARXML format file name or file-like object.
+
+    The file is parsed incrementally, so its contents are never held
+    in memory as a whole, and the ARXML paths used to resolve
+    references are collected while parsing.
+
+    Frames not selected by given message filter are skipped before
+    their PDUs are loaded. Frames are selected by their nodes once the
+    senders and receivers of all loaded frames are known.
+
+    """
+
+    root, arxml_index = iterparse_arxml(fp)
+
+    return _load_root(root,
+                      arxml_index,
+                      strict,
+                      sort_signals,
+                      lazy_codecs,
+                      message_filter)
+
 def load_string(string:str,
                 strict:bool=True,
-                sort_signals:type_sort_signals=sort_signals_by_start_bit) \
+                sort_signals:type_sort_signals=sort_signals_by_start_bit,
+                lazy_codecs:bool=False,
+                message_filter:Optional[MessageFilter]=None) \
             -> InternalDatabase:
     """Parse given ARXML format string.
 
     """
 
-    root = ElementTree.fromstring(string)
-
+    return load(io.StringIO(string),
+                strict,
+                sort_signals,
+                lazy_codecs,
+                message_filter)
+
+def _load_root(root:Any,
+               arxml_index:Optional[ArxmlIndex],
+               strict:bool,
+               sort_signals:type_sort_signals,
+               lazy_codecs:bool,
+               message_filter:Optional[MessageFilter]) -> InternalDatabase:
     m = re.match(r'{(.*)}AUTOSAR', root.tag)
     if not m:
         raise ValueError(f"No XML namespace specified or illegal root tag name '{root.tag}'")
@@ -71,6 +113,15 @@ def load_string(string:str,
             raise ValueError(f'Expected root element tag {expected_root}, '
                              f'but got {root.tag}.')
 
-        return EcuExtractLoader(root, strict, sort_signals).load()
+        return EcuExtractLoader(root,
+                                strict,
+                                sort_signals,
+                                lazy_codecs,
+                                message_filter).load()
     else:
-        return SystemLoader(root, strict, sort_signals).load()
+        return SystemLoader(root,
+                            strict,
+                            sort_signals,
+                            lazy_codecs,
+                            arxml_index,
+                            message_filter).load()
@@ -1,12 +1,13 @@
 # Load an ECU extract CAN database from an ARXML formatted file.
 import logging
 
-from typing import Any, List
+from typing import Any, List, Optional
 from xml.etree import ElementTree
 
 from ....utils import type_sort_signals, sort_signals_by_start_bit
 from ...bus import Bus
 from ...message import Message
+from ...message_filter import MessageFilter
 from ...signal import Signal
 from ...internal_database import InternalDatabase
 
@@ -54,10 +55,14 @@ class EcuExtractLoader:
     def __init__(self,
                  root:Any,
                  strict:bool,
-                 sort_signals:type_sort_signals=sort_signals_by_start_bit):
+                 sort_signals:type_sort_signals=sort_signals_by_start_bit,
+                 lazy_codecs:bool=False,
+                 message_filter:Optional[MessageFilter]=None):
         self.root = root
         self.strict = strict
         self.sort_signals = sort_signals
+        self.lazy_codecs = lazy_codecs
+        self.message_filter = message_filter
 
     def load(self) -> InternalDatabase:
         buses:List[Bus] = []
@@ -150,6 +155,10 @@ class EcuExtractLoader:
 
         # ToDo: interval, senders, comments
 
+        if self.message_filter is not None \
+           and not self.message_filter.match(name, frame_id, None, senders):
+            return None
+
         # Find all signals in this message.
         signals = []
         values = com_i_pdu.iterfind(ECUC_REFERENCE_VALUE_XPATH,
@@ -178,7 +187,8 @@ class EcuExtractLoader:
                        comment=comments,
                        bus_name=None,
                        strict=self.strict,
-                       sort_signals=self.sort_signals)
+                       sort_signals=self.sort_signals,
+                       lazy_codecs=self.lazy_codecs)
 
     def load_message_tx(self, com_pdu_id_ref):
         return self.load_message_rx_tx(com_pdu_id_ref,
@@ -0,0 +1,212 @@
+# Parse an ARXML document and index the ARXML paths of its elements in
+# a single pass.
+import re
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from xml.etree import ElementTree
+
+# Package elements which are never read when loading a database, along
+# with everything they contain. Software components, port interfaces
+# and module definitions often make up most of a system description.
+UNUSED_ELEMENTS = frozenset([
+    'APPLICATION-SW-COMPONENT-TYPE',
+    'BSW-IMPLEMENTATION',
+    'BSW-MODULE-DESCRIPTION',
+    'BSW-MODULE-ENTRY',
+    'CLIENT-SERVER-INTERFACE',
+    'COMPLEX-DEVICE-DRIVER-SW-COMPONENT-TYPE',
+    'COMPOSITION-SW-COMPONENT-TYPE',
+    'DATA-TYPE-MAPPING-SET',
+    'ECU-ABSTRACTION-SW-COMPONENT-TYPE',
+    'ECUC-DEFINITION-COLLECTION',
+    'ECUC-MODULE-DEF',
+    'MODE-DECLARATION-GROUP',
+    'MODE-SWITCH-INTERFACE',
+    'NV-BLOCK-SW-COMPONENT-TYPE',
+    'NV-DATA-INTERFACE',
+    'PARAMETER-INTERFACE',
+    'PARAMETER-SW-COMPONENT-TYPE',
+    'PORT-INTERFACE-MAPPING-SET',
+    'SENDER-RECEIVER-INTERFACE',
+    'SENSOR-ACTUATOR-SW-COMPONENT-TYPE',
+    'SERVICE-PROXY-SW-COMPONENT-TYPE',
+    'SERVICE-SW-COMPONENT-TYPE',
+    'SWC-BSW-MAPPING',
+    'SWC-IMPLEMENTATION',
+    'TRIGGER-INTERFACE',
+])
+
+
+class ArxmlIndex:
+    """The ARXML paths of the elements of an ARXML document, as
+    collected by :func:`iterparse_arxml()`.
+
+    """
+
+    def __init__(self) -> None:
+        # the ARXML path of every element, which is the path of the
+        # closest element featuring a short name
+        self.node_to_arxml_path: Dict[Any, str] = {}
+        self.arxml_path_to_node: Dict[str, Any] = {}
+
+        # all reference base elements and the ARXML paths of their
+        # packages, in document order
+        self.reference_bases: List[Tuple[str, Any]] = []
+
+        # the first ARXML path used by multiple elements
+        self.duplicate_path: Optional[str] = None
+
+        # the number of unused package elements which were dropped
+        self.number_of_dropped_elements = 0
+
+
+class _Frame:
+    """An element which has been started but not yet ended.
+
+    """
+
+    __slots__ = (
+        'elem',
+        'parent_path',
+        'path',
+        'parent_package_path',
+        'package_path',
+        'has_short_name',
+        'has_other_children',
+        'is_dropped',
+    )
+
+    def __init__(self, elem, parent_path, package_path, is_dropped):
+        self.elem = elem
+        self.parent_path = parent_path
+        self.path = parent_path
+        self.parent_package_path = package_path
+        self.package_path = package_path
+        self.has_short_name = False
+        self.has_other_children = False
+        # the element is, or is in, an unused package element
+        self.is_dropped = is_dropped
+
+
+def iterparse_arxml(source: Any) -> Tuple[Any, Optional[ArxmlIndex]]:
+    """Parse given ARXML file name or file object and return its root
+    element and the index of its ARXML paths.
+
+    The index is created while parsing instead of walking the whole
+    tree again, and the whitespace between elements is not kept. The
+    index is ``None`` if the root element is not in an AUTOSAR
+    namespace, or if a short name does not precede all other children
+    of its element. The paths must then be found by walking the tree.
+
+    The package elements in :data:`UNUSED_ELEMENTS` are removed from
+    the tree once parsed, and are not indexed. Elements without
+    children are only indexed by path unless they are references, as
+    no other references are resolved relative to them.
+
+    """
+
+    index = ArxmlIndex()
+    node_to_arxml_path = index.node_to_arxml_path
+    arxml_path_to_node = index.arxml_path_to_node
+    stack: List[_Frame] = []
+    root = None
+    short_name_tag = None
+    package_tag = None
+    reference_base_tag = None
+    elements_tag = None
+    unused_tags: FrozenSet[str] = frozenset()
+    is_indexable = True
+
+    for event, elem in ElementTree.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            if stack:
+                parent = stack[-1]
+
+                if elem.tag != short_name_tag:
+                    parent.has_other_children = True
+
+                frame = _Frame(elem,
+                               parent.path,
+                               parent.package_path,
+                               parent.is_dropped
+                               or (parent.elem.tag == elements_tag
+                                   and elem.tag in unused_tags))
+            else:
+                root = elem
+                m = re.match(r'^\{(.*)\}AUTOSAR$', root.tag)
+
+                if m:
+                    xml_namespace = m.group(1)
+                    short_name_tag = f'{{{xml_namespace}}}SHORT-NAME'
+                    package_tag = f'{{{xml_namespace}}}AR-PACKAGE'
+                    reference_base_tag = f'{{{xml_namespace}}}REFERENCE-BASE'
+                    elements_tag = f'{{{xml_namespace}}}ELEMENTS'
+                    unused_tags = frozenset(f'{{{xml_namespace}}}{tag}'
+                                            for tag in UNUSED_ELEMENTS)
+                else:
+                    is_indexable = False
+
+                frame = _Frame(elem, '', '', False)
+
+            if elem.tag == package_tag:
+                # the package path of packages without a short name
+                # ends on 'None', as when walking the tree
+                frame.package_path = f'{frame.package_path}/None'
+
+            stack.append(frame)
+            continue
+
+        frame = stack.pop()
+
+        if frame.is_dropped:
+            parent = stack[-1]
+
+            if not parent.is_dropped:
+                # the whole unused element has been parsed
+                del parent.elem[-1]
+                index.number_of_dropped_elements += 1
+
+            continue
+
+        if elem.tag == short_name_tag and stack:
+            parent = stack[-1]
+
+            if not parent.has_short_name:
+                parent.has_short_name = True
+
+                if parent.has_other_children:
+                    is_indexable = False
+
+                path = f'{parent.parent_path}/{elem.text}'
+                parent.path = path
+                frame.path = path
+
+                if path in arxml_path_to_node \
+                   and index.duplicate_path is None:
+                    index.duplicate_path = path
+
+                arxml_path_to_node[path] = parent.elem
+
+                if parent.elem.tag == package_tag:
+                    parent.package_path = \
+                        f'{parent.parent_package_path}/{elem.text}'
+        elif elem.tag == reference_base_tag:
+            index.reference_bases.append((frame.parent_package_path, elem))
+
+        if len(elem) > 0:
+            node_to_arxml_path[elem] = frame.path
+            text = elem.text
+
+            if text is not None and not text.strip():
+                elem.text = None
+        elif elem.tag.endswith('-REF'):
+            node_to_arxml_path[elem] = frame.path
+
+        tail = elem.tail
+
+        if tail is not None and not tail.strip():
+            elem.tail = None
+
+    if not is_indexable:
+        return root, None
+
+    return root, index
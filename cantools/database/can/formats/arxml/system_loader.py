@@ -9,6 +9,7 @@ from copy import deepcopy
 from xml.etree import ElementTree
 
 from .utils import parse_number_string
+from .index import ArxmlIndex
 from .database_specifics import AutosarDatabaseSpecifics
 from .bus_specifics import AutosarBusSpecifics
 from .node_specifics import AutosarNodeSpecifics
@@ -20,6 +21,7 @@ from .end_to_end_properties import AutosarEnd2EndProperties
 from ...signal import Signal, NamedSignalValue
 from ...signal import Decimal as SignalDecimal
 from ...message import Message
+from ...message_filter import MessageFilter
 from ...node import Node
 from ...bus import Bus
 from ...internal_database import InternalDatabase
@@ -31,10 +33,15 @@ class SystemLoader:
     def __init__(self,
                  root:Any,
                  strict:bool,
-                 sort_signals:type_sort_signals=sort_signals_by_start_bit):
+                 sort_signals:type_sort_signals=sort_signals_by_start_bit,
+                 lazy_codecs:bool=False,
+                 arxml_index:Optional[ArxmlIndex]=None,
+                 message_filter:Optional[MessageFilter]=None):
         self._root = root
         self._strict = strict
         self._sort_signals = sort_signals
+        self._lazy_codecs = lazy_codecs
+        self._message_filter = message_filter
 
         m = re.match(r'^\{(.*)\}AUTOSAR$', self._root.tag)
 
@@ -99,7 +106,12 @@ class SystemLoader:
             raise ValueError('This class only supports AUTOSAR '
                              'versions 3 and 4')
 
-        self._create_arxml_reference_dicts()
+        if arxml_index is None:
+            self._create_arxml_reference_dicts()
+        else:
+            self._load_arxml_index(arxml_index)
+
+        self._messages_of_pdu = None
 
     def autosar_version_newer(self, major, minor=None, patch=None):
         """Returns true iff the AUTOSAR version specified in the ARXML it at
@@ -159,6 +171,17 @@ class SystemLoader:
         # messages are known...
         self._load_senders_and_receivers(root_packages, messages)
 
+        # ... and so can the messages be selected by their nodes
+        if self._message_filter is not None:
+            messages = [
+                message
+                for message in messages
+                if self._message_filter.match(message.name,
+                                              message.frame_id,
+                                              message.bus_name,
+                                              self._get_message_nodes(message))
+            ]
+
         # although there must only be one system globally, it can be
         # located within any package and the parameters which it
         # specifies affect a bunch of messages at once. we thus have
@@ -318,19 +341,14 @@ class SystemLoader:
     # given a list of Message objects and an reference to a PDU by its absolute ARXML path,
     # return the subset of messages of the list which feature the specified PDU.
     def __get_messages_of_pdu(self, msg_list, pdu_path):
-        pdu_messages = \
-            [ x for x in msg_list if pdu_path in x.autosar.pdu_paths ]
-
-        # add all messages featured by container frames
-        for message in msg_list:
-            if message.contained_messages is None:
-                continue
+        # index the messages by their PDUs once instead of searching
+        # all messages for every PDU
+        if self._messages_of_pdu is None \
+           or self._messages_of_pdu[0] is not msg_list:
+            self._messages_of_pdu = (msg_list,
+                                     self._create_messages_of_pdu(msg_list))
 
-            pdu_messages.extend(
-                [
-                    x for x in message.contained_messages
-                          if pdu_path in x.autosar.pdu_paths
-                 ])
+        pdu_messages = list(self._messages_of_pdu[1].get(pdu_path, []))
 
         if len(pdu_messages) < 1:
             # hm: the data set seems to be inconsistent
@@ -339,6 +357,41 @@ class SystemLoader:
 
         return pdu_messages
 
+    @staticmethod
+    def _get_message_nodes(message):
+        """Yield the senders of given message and the receivers of its
+        signals, including those of its contained messages.
+        """
+
+        yield from message.senders
+
+        for signal in message.signals:
+            yield from signal.receivers
+
+        for contained_message in message.contained_messages or []:
+            yield from SystemLoader._get_message_nodes(contained_message)
+
+    @staticmethod
+    def _create_messages_of_pdu(msg_list):
+        messages_of_pdu = {}
+
+        def add(message):
+            for pdu_path in dict.fromkeys(message.autosar.pdu_paths):
+                messages_of_pdu.setdefault(pdu_path, []).append(message)
+
+        for message in msg_list:
+            add(message)
+
+        # add all messages featured by container frames
+        for message in msg_list:
+            if message.contained_messages is None:
+                continue
+
+            for contained_message in message.contained_messages:
+                add(contained_message)
+
+        return messages_of_pdu
+
     def _load_senders_receivers_of_ecu(self, ecu_instance, messages):
         # get the name of the ECU. Note that in cantools, ECUs
         # are called 'nodes' for all intents and purposes...
@@ -714,13 +767,16 @@ class SystemLoader:
                 self._get_arxml_children(can_cluster, frame_triggerings_spec)
 
             for can_frame_triggering in can_frame_triggerings:
-                messages.append(self._load_message(bus_name,
-                                                   can_frame_triggering))
+                message = self._load_message(bus_name, can_frame_triggering)
+
+                if message is not None:
+                    messages.append(message)
 
         return messages
 
     def _load_message(self, bus_name, can_frame_triggering):
-        """Load given message and return a message object.
+        """Load given message and return a message object, or None if it
+        is not selected by the message filter.
         """
 
         # Default values.
@@ -733,6 +789,13 @@ class SystemLoader:
         # Name, frame id, length, is_extended_frame and comment.
         name = self._load_message_name(can_frame)
         frame_id = self._load_message_frame_id(can_frame_triggering)
+
+        # skip messages which are not selected before loading their
+        # PDUs. their nodes are only known once all messages are loaded
+        if self._message_filter is not None \
+           and not self._message_filter.match(name, frame_id, bus_name):
+            return None
+
         length = self._load_message_length(can_frame)
         is_extended_frame = \
             self._load_message_is_extended_frame(can_frame_triggering)
@@ -774,7 +837,8 @@ class SystemLoader:
                            comment=None,
                            autosar_specifics=autosar_specifics,
                            strict=self._strict,
-                           sort_signals=self._sort_signals)
+                           sort_signals=self._sort_signals,
+                           lazy_codecs=self._lazy_codecs)
 
         pdu_path = self._get_pdu_path(can_frame)
         autosar_specifics._pdu_paths.append(pdu_path)
@@ -823,7 +887,8 @@ class SystemLoader:
                        comment=comments,
                        autosar_specifics=autosar_specifics,
                        strict=self._strict,
-                       sort_signals=self._sort_signals)
+                       sort_signals=self._sort_signals,
+                       lazy_codecs=self._lazy_codecs)
 
     def _load_secured_properties(self,
                                  message_name,
@@ -1032,7 +1097,8 @@ class SystemLoader:
                             unused_bit_pattern=unused_bit_pattern,
                             comment=comments,
                             autosar_specifics=contained_autosar_specifics,
-                            sort_signals=self._sort_signals)
+                            sort_signals=self._sort_signals,
+                            lazy_codecs=self._lazy_codecs)
 
                 contained_messages.append(contained_message)
 
@@ -2118,46 +2184,7 @@ class SystemLoader:
 
             # handle reference bases (for relative references)
             if elem.tag == f'{{{self.xml_namespace}}}REFERENCE-BASE':
-                refbase_name = elem.find('./ns:SHORT-LABEL',
-                                         self._xml_namespaces).text.strip()
-                refbase_path = elem.find('./ns:PACKAGE-REF',
-                                         self._xml_namespaces).text.strip()
-
-                is_default = elem.find('./ns:IS-DEFAULT', self._xml_namespaces)
-
-                if is_default is not None:
-                    is_default = (is_default.text.strip().lower() == "true")
-
-                current_default_refbase_path = \
-                    self._package_default_refbase_path.get(cur_package_path)
-
-                if is_default and current_default_refbase_path is not None:
-                    raise ValueError(f'Multiple default reference bases bases '
-                                     f'specified for package '
-                                     f'"{cur_package_path}".')
-                elif is_default:
-                    self._package_default_refbase_path[cur_package_path] = \
-                        refbase_path
-
-                is_global = elem.find('./ns:IS-GLOBAL', self._xml_namespaces)
-
-                if is_global is not None:
-                    is_global = (is_global.text.strip().lower() == "true")
-
-                if is_global:
-                    raise ValueError(f'Non-canonical relative references are '
-                                     f'not yet supported.')
-
-                # ensure that a dictionary for the refbases of the package exists
-                if cur_package_path not in self._package_refbase_paths:
-                    self._package_refbase_paths[cur_package_path] = {}
-                elif refbase_name in \
-                     self._package_refbase_paths[cur_package_path]:
-                    raise ValueError(f'Package "{cur_package_path}" specifies '
-                                     f'multiple reference bases named '
-                                     f'"{refbase_name}".')
-                self._package_refbase_paths[cur_package_path][refbase_name] = \
-                    refbase_path
+                self._add_reference_base(elem, cur_package_path)
 
             # iterate over all children and add all references contained therein
             for child in elem:
@@ -2166,6 +2193,66 @@ class SystemLoader:
         self._arxml_path_to_node = {}
         add_sub_references(self._root, '')
 
+    def _load_arxml_index(self, arxml_index):
+        """Use the ARXML paths which have been collected while parsing the
+        file, instead of walking the whole tree.
+
+        """
+
+        if arxml_index.duplicate_path is not None:
+            raise ValueError(f"File contains multiple elements with "
+                             f"path '{arxml_index.duplicate_path}'")
+
+        self._node_to_arxml_path = arxml_index.node_to_arxml_path
+        self._arxml_path_to_node = arxml_index.arxml_path_to_node
+        self._package_default_refbase_path = {}
+        self._package_refbase_paths = {}
+
+        for cur_package_path, elem in arxml_index.reference_bases:
+            self._add_reference_base(elem, cur_package_path)
+
+    def _add_reference_base(self, elem, cur_package_path):
+        refbase_name = elem.find('./ns:SHORT-LABEL',
+                                 self._xml_namespaces).text.strip()
+        refbase_path = elem.find('./ns:PACKAGE-REF',
+                                 self._xml_namespaces).text.strip()
+
+        is_default = elem.find('./ns:IS-DEFAULT', self._xml_namespaces)
+
+        if is_default is not None:
+            is_default = (is_default.text.strip().lower() == "true")
+
+        current_default_refbase_path = \
+            self._package_default_refbase_path.get(cur_package_path)
+
+        if is_default and current_default_refbase_path is not None:
+            raise ValueError(f'Multiple default reference bases bases '
+                             f'specified for package '
+                             f'"{cur_package_path}".')
+        elif is_default:
+            self._package_default_refbase_path[cur_package_path] = \
+                refbase_path
+
+        is_global = elem.find('./ns:IS-GLOBAL', self._xml_namespaces)
+
+        if is_global is not None:
+            is_global = (is_global.text.strip().lower() == "true")
+
+        if is_global:
+            raise ValueError(f'Non-canonical relative references are '
+                             f'not yet supported.')
+
+        # ensure that a dictionary for the refbases of the package exists
+        if cur_package_path not in self._package_refbase_paths:
+            self._package_refbase_paths[cur_package_path] = {}
+        elif refbase_name in \
+             self._package_refbase_paths[cur_package_path]:
+            raise ValueError(f'Package "{cur_package_path}" specifies '
+                             f'multiple reference bases named '
+                             f'"{refbase_name}".')
+        self._package_refbase_paths[cur_package_path][refbase_name] = \
+            refbase_path
+
     def _get_arxml_children(self, base_elems, children_location):
         """Locate a set of ElementTree child nodes at a given location.
 
@@ -2236,13 +2323,13 @@ class SystemLoader:
             # traverse the specified path one level deeper
             result = []
 
+            ctt = f'{{{self.xml_namespace}}}{child_tag_name}'
+            cttr = f'{{{self.xml_namespace}}}{child_tag_name}-REF'
+
             for base_elem in base_elems:
                 local_result = []
 
                 for child_elem in base_elem:
-                    ctt = f'{{{self.xml_namespace}}}{child_tag_name}'
-                    cttr = f'{{{self.xml_namespace}}}{child_tag_name}-REF'
-
                     if child_elem.tag == ctt:
                         local_result.append(child_elem)
                     elif child_elem.tag == cttr:
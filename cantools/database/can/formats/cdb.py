@@ -0,0 +1,302 @@
+# Load and dump a CAN database in the compiled database (CDB) format.
+#
+# A compiled database is a binary snapshot of a loaded database. The
+# objects of the database are stored in a table, each as its layout,
+# that is its class and the names of its attributes, and the values
+# of its attributes. References between objects are stored as
+# indices into the table. The tables are serialized with
+# the marshal module, which stores equal strings only once and is
+# very fast to load. Loading creates the objects without calling
+# their constructors, so the database is not parsed, checked or
+# refreshed again. Message codecs are not stored but created when
+# first needed, as if the database was loaded with lazy codecs.
+
+import decimal
+import marshal
+import struct
+from collections import OrderedDict
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+    Union,
+    cast,
+)
+
+from .arxml.bus_specifics import AutosarBusSpecifics
+from .arxml.database_specifics import AutosarDatabaseSpecifics
+from .arxml.end_to_end_properties import AutosarEnd2EndProperties
+from .arxml.message_specifics import AutosarMessageSpecifics
+from .arxml.node_specifics import AutosarNodeSpecifics
+from .arxml.secoc_properties import AutosarSecOCProperties
+from .dbc_specifics import DbcSpecifics
+from ..attribute import Attribute
+from ..attribute_definition import AttributeDefinition
+from ..bus import Bus
+from ..database import Database
+from ..environment_variable import EnvironmentVariable
+from ..message import Message
+from ..message_filter import MessageFilter
+from ..node import Node
+from ..signal import Decimal
+from ..signal import NamedSignalValue
+from ..signal import Signal
+from ..signal_group import SignalGroup
+from ...errors import ParseError
+from ...utils import sort_signals_by_name
+from ...utils import sort_signals_by_start_bit
+from ...utils import share_database_metadata
+from ....version import __version__
+
+MAGIC = b'CANTOOLS CDB\n'
+
+# Incremented whenever the layout of compiled databases changes.
+FORMAT_VERSION = 1
+
+# The format version and the length of the cantools version string,
+# which follows the header.
+HEADER = struct.Struct('>HH')
+
+# Classes of objects that may be part of a compiled database. Their
+# indices are stored, so new classes must be appended.
+CLASSES: List[type] = [
+    Database,
+    Message,
+    Signal,
+    Decimal,
+    NamedSignalValue,
+    SignalGroup,
+    Node,
+    Bus,
+    DbcSpecifics,
+    Attribute,
+    AttributeDefinition,
+    EnvironmentVariable,
+    AutosarDatabaseSpecifics,
+    AutosarBusSpecifics,
+    AutosarNodeSpecifics,
+    AutosarMessageSpecifics,
+    AutosarEnd2EndProperties,
+    AutosarSecOCProperties,
+    MessageFilter,
+]
+
+# Functions that signals may be sorted by.
+FUNCTIONS = [
+    sort_signals_by_start_bit,
+    sort_signals_by_name,
+]
+
+# Tags of values that are not stored as themselves.
+OBJECT = 0
+ORDERED_DICT = 1
+DECIMAL = 2
+TUPLE = 3
+FUNCTION = 4
+FROZENSET = 5
+
+_CLASS_INDICES = {cls: index for index, cls in enumerate(CLASSES)}
+_FUNCTION_INDICES = {id(function): index
+                     for index, function in enumerate(FUNCTIONS)}
+
+
+def _get_state(obj: Any) -> Dict[str, Any]:
+    if '__getstate__' in type(obj).__dict__:
+        return cast(Dict[str, Any], obj.__getstate__())
+
+    try:
+        return dict(vars(obj))
+    except TypeError:
+        return {
+            name: getattr(obj, name)
+            for cls in type(obj).__mro__
+            for name in cls.__dict__.get('__slots__', ())
+            if hasattr(obj, name)
+        }
+
+
+def _set_state(obj: Any, state: Dict[str, Any]) -> None:
+    if '__setstate__' in type(obj).__dict__:
+        obj.__setstate__(state)
+    elif hasattr(obj, '__dict__'):
+        obj.__dict__.update(state)
+    else:
+        for name, value in state.items():
+            setattr(obj, name, value)
+
+
+Layout = Tuple[int, Tuple[str, ...]]
+
+
+class _Dumper:
+
+    def __init__(self) -> None:
+        self.layouts: Dict[Layout, int] = {}
+        self.objects: List[Tuple[int, List[Any]]] = []
+        self.indices: Dict[int, int] = {}
+
+    def dump(self, value: Any) -> Any:
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        elif isinstance(value, OrderedDict):
+            return (ORDERED_DICT,
+                    [(self.dump(k), self.dump(v)) for k, v in value.items()])
+        elif type(value) is dict:
+            return {self.dump(k): self.dump(v) for k, v in value.items()}
+        elif type(value) is list:
+            return [self.dump(item) for item in value]
+        elif type(value) is tuple:
+            return (TUPLE, [self.dump(item) for item in value])
+        elif type(value) is frozenset:
+            return (FROZENSET, [self.dump(item) for item in value])
+        elif isinstance(value, decimal.Decimal):
+            return (DECIMAL, str(value))
+        elif callable(value) and not isinstance(value, type):
+            try:
+                return (FUNCTION, _FUNCTION_INDICES[id(value)])
+            except KeyError:
+                # The order of the signals is stored anyway, as are
+                # only the messages selected by a message filter.
+                return None
+        else:
+            return (OBJECT, self.dump_object(value))
+
+    def dump_object(self, obj: Any) -> int:
+        try:
+            return self.indices[id(obj)]
+        except KeyError:
+            pass
+
+        try:
+            class_index = _CLASS_INDICES[type(obj)]
+        except KeyError:
+            raise ValueError(
+                f"Objects of type '{type(obj).__name__}' cannot be stored "
+                f"in a compiled database.") from None
+
+        index = len(self.objects)
+        self.indices[id(obj)] = index
+        state = _get_state(obj)
+        layout = (class_index, tuple(state))
+        layout_index = self.layouts.setdefault(layout, len(self.layouts))
+        values: List[Any] = []
+        self.objects.append((layout_index, values))
+
+        for value in state.values():
+            values.append(self.dump(value))
+
+        return index
+
+
+class _Loader:
+
+    def __init__(self,
+                 layouts: List[Layout],
+                 objects: List[Tuple[int, List[Any]]]) -> None:
+        classes = [CLASSES[class_index] for class_index, _ in layouts]
+        self.objects: List[Any] = [
+            object.__new__(classes[layout_index])
+            for layout_index, _ in objects
+        ]
+
+        for obj, (layout_index, values) in zip(self.objects, objects):
+            names = layouts[layout_index][1]
+            _set_state(obj,
+                       {
+                           name: self.load(value)
+                           for name, value in zip(names, values)
+                       })
+
+    def load(self, value: Any) -> Any:
+        if type(value) is tuple:
+            tag, item = value
+
+            if tag == OBJECT:
+                return self.objects[item]
+            elif tag == ORDERED_DICT:
+                return OrderedDict((self.load(k), self.load(v)) for k, v in item)
+            elif tag == DECIMAL:
+                return decimal.Decimal(item)
+            elif tag == TUPLE:
+                return tuple(self.load(v) for v in item)
+            elif tag == FUNCTION:
+                return FUNCTIONS[item]
+            elif tag == FROZENSET:
+                return frozenset(self.load(v) for v in item)
+            else:
+                raise ParseError(f'Invalid value tag {tag}.')
+        elif type(value) is list:
+            return [self.load(item) for item in value]
+        elif type(value) is dict:
+            return {self.load(k): self.load(v) for k, v in value.items()}
+        else:
+            return value
+
+
+def dump_bytes(database: Database) -> bytes:
+    """Returns given database in the compiled database format.
+
+    """
+
+    dumper = _Dumper()
+    dumper.dump_object(database)
+
+    version = __version__.encode()
+
+    return (MAGIC
+            + HEADER.pack(FORMAT_VERSION, len(version))
+            + version
+            + marshal.dumps((list(dumper.layouts), dumper.objects)))
+
+
+def is_compiled_database(data: Union[bytes, memoryview]) -> bool:
+    return bytes(data[:len(MAGIC)]) == MAGIC
+
+
+def load_bytes(data: Union[bytes, memoryview]) -> Database:
+    """Returns the database in given data in the compiled database
+    format. The database must have been dumped by the same version of
+    cantools.
+
+    """
+
+    if not is_compiled_database(data):
+        raise ParseError('Not a compiled database.')
+
+    offset = len(MAGIC)
+
+    try:
+        format_version, version_length = HEADER.unpack_from(data, offset)
+    except struct.error:
+        raise ParseError('Invalid compiled database.') from None
+
+    if format_version != FORMAT_VERSION:
+        raise ParseError(
+            f'Unsupported compiled database format version {format_version}.')
+
+    offset += HEADER.size
+    version = bytes(data[offset:offset + version_length]).decode()
+    offset += version_length
+
+    # Objects are stored with their private attributes, which may
+    # differ between versions.
+    if version != __version__:
+        raise ParseError(
+            f'The compiled database was created by cantools {version}, '
+            f'but this is cantools {__version__}. Compile it again.')
+
+    try:
+        layouts, objects = marshal.loads(data[offset:])
+    except (EOFError, ValueError, TypeError):
+        raise ParseError('Invalid compiled database.') from None
+
+    database = _Loader(layouts, objects).objects[0]
+
+    if not isinstance(database, Database):
+        raise ParseError('Not a compiled CAN database.')
+
+    # Shared dictionaries are stored once per signal.
+    share_database_metadata(database)
+
+    return database
@@ -5,6 +5,7 @@ from collections import OrderedDict
 from collections import defaultdict
 from decimal import Decimal
 from copy import deepcopy
+from typing import Union
 
 import textparser
 from textparser import Sequence
@@ -27,6 +28,7 @@ from ..signal import NamedSignalValue
 from ..signal import Decimal as SignalDecimal
 from ..signal_group import SignalGroup
 from ..message import Message
+from ..message_filter import MessageFilter
 from ..node import Node
 from ..bus import Bus
 from ..internal_database import InternalDatabase
@@ -140,79 +142,80 @@ def to_int(value):
     return int(Decimal(value))
 
 
-class Parser(textparser.Parser):
+KEYWORDS = set([
+    'BA_',
+    'BA_DEF_',
+    'BA_DEF_DEF_',
+    'BA_DEF_DEF_REL_',
+    'BA_DEF_REL_',
+    'BA_DEF_SGTYPE_',
+    'BA_REL_',
+    'BA_SGTYPE_',
+    'BO_',
+    'BO_TX_BU_',
+    'BS_',
+    'BU_',
+    'BU_BO_REL_',
+    'BU_EV_REL_',
+    'BU_SG_REL_',
+    'CAT_',
+    'CAT_DEF_',
+    'CM_',
+    'ENVVAR_DATA_',
+    'EV_',
+    'EV_DATA_',
+    'FILTER',
+    'NS_',
+    'NS_DESC_',
+    'SG_',
+    'SG_MUL_VAL_',
+    'SGTYPE_',
+    'SGTYPE_VAL_',
+    'SIG_GROUP_',
+    'SIG_TYPE_REF_',
+    'SIG_VALTYPE_',
+    'SIGTYPE_VALTYPE_',
+    'VAL_',
+    'VAL_TABLE_',
+    'VERSION'
+])
+
+TOKEN_NAMES = {
+    'LPAREN': '(',
+    'RPAREN': ')',
+    'LBRACE': '[',
+    'RBRACE': ']',
+    'COMMA':  ',',
+    'AT':     '@',
+    'SCOLON': ';',
+    'COLON':  ':',
+    'PIPE':   '|',
+    'SIGN':   '+/-'
+}
 
-    def tokenize(self, string):
-        keywords = set([
-            'BA_',
-            'BA_DEF_',
-            'BA_DEF_DEF_',
-            'BA_DEF_DEF_REL_',
-            'BA_DEF_REL_',
-            'BA_DEF_SGTYPE_',
-            'BA_REL_',
-            'BA_SGTYPE_',
-            'BO_',
-            'BO_TX_BU_',
-            'BS_',
-            'BU_',
-            'BU_BO_REL_',
-            'BU_EV_REL_',
-            'BU_SG_REL_',
-            'CAT_',
-            'CAT_DEF_',
-            'CM_',
-            'ENVVAR_DATA_',
-            'EV_',
-            'EV_DATA_',
-            'FILTER',
-            'NS_',
-            'NS_DESC_',
-            'SG_',
-            'SG_MUL_VAL_',
-            'SGTYPE_',
-            'SGTYPE_VAL_',
-            'SIG_GROUP_',
-            'SIG_TYPE_REF_',
-            'SIG_VALTYPE_',
-            'SIGTYPE_VALTYPE_',
-            'VAL_',
-            'VAL_TABLE_',
-            'VERSION'
-        ])
-
-        names = {
-            'LPAREN': '(',
-            'RPAREN': ')',
-            'LBRACE': '[',
-            'RBRACE': ']',
-            'COMMA':  ',',
-            'AT':     '@',
-            'SCOLON': ';',
-            'COLON':  ':',
-            'PIPE':   '|',
-            'SIGN':   '+/-'
-        }
+TOKEN_SPECS = [
+    ('SKIP',     r'[ \r\n\t]+|//.*?\n'),
+    ('NUMBER',   r'[-+]?\d+\.?\d*([eE][+-]?\d+)?'),
+    ('WORD',     r'[A-Za-z0-9_]+'),
+    ('STRING',   r'"(\\"|[^"])*?"'),
+    ('LPAREN',   r'\('),
+    ('RPAREN',   r'\)'),
+    ('LBRACE',   r'\['),
+    ('RBRACE',   r'\]'),
+    ('COMMA',    r','),
+    ('PIPE',     r'\|'),
+    ('AT',       r'@'),
+    ('SIGN',     r'[+-]'),
+    ('SCOLON',   r';'),
+    ('COLON',    r':'),
+    ('MISMATCH', r'.')
+]
 
-        token_specs = [
-            ('SKIP',     r'[ \r\n\t]+|//.*?\n'),
-            ('NUMBER',   r'[-+]?\d+\.?\d*([eE][+-]?\d+)?'),
-            ('WORD',     r'[A-Za-z0-9_]+'),
-            ('STRING',   r'"(\\"|[^"])*?"'),
-            ('LPAREN',   r'\('),
-            ('RPAREN',   r'\)'),
-            ('LBRACE',   r'\['),
-            ('RBRACE',   r'\]'),
-            ('COMMA',    r','),
-            ('PIPE',     r'\|'),
-            ('AT',       r'@'),
-            ('SIGN',     r'[+-]'),
-            ('SCOLON',   r';'),
-            ('COLON',    r':'),
-            ('MISMATCH', r'.')
-        ]
 
-        tokens, token_regex = tokenize_init(token_specs)
+class Parser(textparser.Parser):
+
+    def tokenize(self, string):
+        tokens, token_regex = tokenize_init(TOKEN_SPECS)
 
         for mo in re.finditer(token_regex, string, re.DOTALL):
             kind = mo.lastgroup
@@ -225,11 +228,11 @@ class Parser(textparser.Parser):
             elif kind != 'MISMATCH':
                 value = mo.group(kind)
 
-                if value in keywords:
+                if value in KEYWORDS:
                     kind = value
 
-                if kind in names:
-                    kind = names[kind]
+                if kind in TOKEN_NAMES:
+                    kind = TOKEN_NAMES[kind]
 
                 tokens.append(Token(kind, value, mo.start()))
             else:
@@ -361,6 +364,491 @@ class Parser(textparser.Parser):
                 bs,
                 version))
 
+class _Mismatch(Exception):
+    pass
+
+
+# The patterns of TOKEN_SPECS, in the same order, but without
+# groups. The kind of a token is given by its first character.
+_TOKEN_RE = re.compile(r'[ \r\n\t]+|//.*?\n'
+                       r'|[-+]?\d+\.?\d*(?:[eE][+-]?\d+)?'
+                       r'|[A-Za-z0-9_]+'
+                       r'|"(?:\\"|[^"])*?"'
+                       r'|.',
+                       re.DOTALL)
+
+_FIRST_CHAR_KINDS = {
+    **dict.fromkeys(' \r\n\t', 'SKIP'),
+    '/': 'COMMENT',
+    **dict.fromkeys('0123456789', 'NUMBER'),
+    **dict.fromkeys('+-', 'SIGN'),
+    **dict.fromkeys('ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+                    'abcdefghijklmnopqrstuvwxyz_', 'WORD'),
+    '"': 'STRING',
+    **{char: char for char in '()[],|@;:'}
+}
+
+_SIGNAL_KINDS = [
+    ':', 'NUMBER', '|', 'NUMBER', '@', 'NUMBER', '+/-',
+    '(', 'NUMBER', ',', 'NUMBER', ')',
+    '[', 'NUMBER', '|', 'NUMBER', ']',
+    'STRING'
+]
+
+
+class FastParser:
+    """A hand-written front end for the DBC grammar of :class:`Parser`.
+    Creates the same parse tree, but without creating token objects
+    and without backtracking.
+
+    This is not a streaming parser. The whole string is tokenized into
+    lists first, and the messages and signals are then created from
+    the parse tree by the same converters as for :class:`Parser`, so
+    both give identical databases.
+
+    :meth:`parse()` returns ``None`` on any error, and the caller
+    parses the string with :class:`Parser` to get a proper error
+    message.
+
+    """
+
+    def __init__(self):
+        self._kinds = None
+        self._values = None
+        self._statements = {
+            'BO_': self._message,
+            'CM_': self._comment,
+            'BA_DEF_': self._attribute_definition,
+            'VAL_TABLE_': self._value_table,
+            'VAL_': self._choice,
+            'BA_': self._attribute,
+            'BA_REL_': self._attribute_rel,
+            'BA_DEF_REL_': self._attribute_definition_rel,
+            'BA_DEF_DEF_': self._attribute_definition_default,
+            'BA_DEF_DEF_REL_': self._attribute_definition_default,
+            'SIG_GROUP_': self._signal_group,
+            'SIG_VALTYPE_': self._signal_type,
+            'SG_MUL_VAL_': self._signal_multiplexer_values,
+            'BO_TX_BU_': self._message_add_sender,
+            'EV_': self._environment_variable,
+            'BU_': self._nodes,
+            'NS_': self._ns,
+            'BS_': self._bs,
+            'VERSION': self._version
+        }
+
+    def tokenize(self, string):
+        """Returns the kinds and values of all tokens in given string, or
+        ``None`` if it contains an invalid character.
+
+        """
+
+        kinds = []
+        values = []
+
+        for value in _TOKEN_RE.findall(string):
+            kind = _FIRST_CHAR_KINDS.get(value[0])
+
+            if kind == 'WORD':
+                if value in KEYWORDS:
+                    kind = value
+            elif kind == 'SKIP':
+                continue
+            elif kind == 'SIGN':
+                kind = 'NUMBER' if len(value) > 1 else '+/-'
+            elif kind == 'STRING':
+                if len(value) == 1:
+                    return None
+
+                value = value[1:-1].replace('\\"', '"')
+            elif kind == 'COMMENT':
+                if len(value) == 1:
+                    return None
+
+                continue
+            elif kind is None:
+                return None
+
+            kinds.append(kind)
+            values.append(value)
+
+        kinds.append('__EOF__')
+        values.append('__EOF__')
+
+        return kinds, values
+
+    def parse(self, string):
+        tokens = self.tokenize(string)
+
+        if tokens is None:
+            return None
+
+        self._kinds, self._values = tokens
+        kinds = self._kinds
+        statements = self._statements
+        parsed = {}
+        pos = 0
+
+        try:
+            while kinds[pos] != '__EOF__':
+                kind = kinds[pos]
+                statement, pos = statements[kind](pos)
+
+                try:
+                    parsed[kind].append(statement)
+                except KeyError:
+                    parsed[kind] = [statement]
+        except (_Mismatch, KeyError, IndexError):
+            return None
+        finally:
+            self._kinds = None
+            self._values = None
+
+        if not parsed:
+            return None
+
+        return parsed
+
+    def _sequence(self, pos, kinds):
+        end = pos + len(kinds)
+
+        if self._kinds[pos:end] != kinds:
+            raise _Mismatch()
+
+        return self._values[pos:end], end
+
+    def _expect(self, pos, kind):
+        if self._kinds[pos] != kind:
+            raise _Mismatch()
+
+        return self._values[pos]
+
+    def _words(self, pos):
+        """Zero or more words.
+
+        """
+
+        kinds = self._kinds
+        end = pos
+
+        while kinds[end] == 'WORD':
+            end += 1
+
+        return self._values[pos:end], end
+
+    def _delimited(self, pos, kind):
+        """One or more tokens of given kind separated by commas.
+
+        """
+
+        kinds = self._kinds
+        values = self._values
+        self._expect(pos, kind)
+        matched = [values[pos]]
+        pos += 1
+
+        while kinds[pos] == ',' and kinds[pos + 1] == kind:
+            matched.append(values[pos + 1])
+            pos += 2
+
+        return matched, pos
+
+    def _pairs(self, pos):
+        """Zero or more number and string pairs.
+
+        """
+
+        kinds = self._kinds
+        values = self._values
+        matched = []
+
+        while kinds[pos] == 'NUMBER' and kinds[pos + 1] == 'STRING':
+            matched.append(values[pos:pos + 2])
+            pos += 2
+
+        return matched, pos
+
+    def _number_or_string(self, pos):
+        if self._kinds[pos] not in ('NUMBER', 'STRING'):
+            raise _Mismatch()
+
+        return self._values[pos]
+
+    def _end(self, statement, pos):
+        statement.append(self._expect(pos, ';'))
+
+        return statement, pos + 1
+
+    def _version(self, pos):
+        return self._sequence(pos, ['VERSION', 'STRING'])
+
+    def _ns(self, pos):
+        kinds = self._kinds
+        statement, pos = self._sequence(pos, ['NS_', ':'])
+        end = pos
+
+        # Until any token followed by a colon, that is the next section.
+        while kinds[end] != '__EOF__' and kinds[end + 1] != ':':
+            end += 1
+
+        if kinds[end] == '__EOF__':
+            raise _Mismatch()
+
+        statement.append(self._values[pos:end])
+
+        return statement, end
+
+    def _bs(self, pos):
+        return self._sequence(pos, ['BS_', ':'])
+
+    def _nodes(self, pos):
+        statement, pos = self._sequence(pos, ['BU_', ':'])
+        words, pos = self._words(pos)
+        statement.append(words)
+
+        return statement, pos
+
+    def _message(self, pos):
+        kinds = self._kinds
+        statement, pos = self._sequence(
+            pos,
+            ['BO_', 'NUMBER', 'WORD', ':', 'NUMBER', 'WORD'])
+        signals = []
+
+        while kinds[pos] == 'SG_':
+            signal, pos = self._signal(pos)
+            signals.append(signal)
+
+        statement.append(signals)
+
+        return statement, pos
+
+    def _signal(self, pos):
+        kinds = self._kinds
+        values = self._values
+
+        if kinds[pos + 1] != 'WORD':
+            raise _Mismatch()
+
+        if kinds[pos + 2] == 'WORD':
+            name = values[pos + 1:pos + 3]
+            end = pos + 3
+        else:
+            name = [values[pos + 1]]
+            end = pos + 2
+
+        items, end = self._sequence(end, _SIGNAL_KINDS)
+        receivers, end = self._delimited(end, 'WORD')
+        statement = ['SG_', name]
+        statement += items
+        statement.append(receivers)
+
+        return statement, end
+
+    def _environment_variable(self, pos):
+        return self._sequence(
+            pos,
+            ['EV_', 'WORD', ':', 'NUMBER', '[', 'NUMBER', '|', 'NUMBER', ']',
+             'STRING', 'NUMBER', 'NUMBER', 'WORD', 'WORD', ';'])
+
+    def _comment(self, pos):
+        kind = self._kinds[pos + 1]
+
+        if kind == 'SG_':
+            item, end = self._sequence(pos + 1,
+                                       ['SG_', 'NUMBER', 'WORD', 'STRING'])
+        elif kind == 'BO_':
+            item, end = self._sequence(pos + 1, ['BO_', 'NUMBER', 'STRING'])
+        elif kind == 'EV_':
+            item, end = self._sequence(pos + 1, ['EV_', 'WORD', 'STRING'])
+        elif kind == 'BU_':
+            item, end = self._sequence(pos + 1, ['BU_', 'WORD', 'STRING'])
+        elif kind == 'STRING':
+            item = self._values[pos + 1]
+            end = pos + 2
+        else:
+            raise _Mismatch()
+
+        return self._end(['CM_', item], end)
+
+    def _attribute_definition(self, pos):
+        kinds = self._kinds
+        values = self._values
+        statement = ['BA_DEF_']
+        pos += 1
+
+        if kinds[pos] in ('SG_', 'BO_', 'EV_', 'BU_'):
+            statement.append([values[pos]])
+            pos += 1
+        else:
+            statement.append([])
+
+        items, pos = self._sequence(pos, ['STRING', 'WORD'])
+        statement += items
+
+        if kinds[pos] == 'STRING':
+            items, pos = self._delimited(pos, 'STRING')
+        else:
+            end = pos
+
+            while kinds[end] == 'NUMBER':
+                end += 1
+
+            items = values[pos:end]
+            pos = end
+
+        statement.append([items])
+
+        return self._end(statement, pos)
+
+    def _attribute_definition_rel(self, pos):
+        kinds = self._kinds
+        values = self._values
+        statement = ['BA_DEF_REL_']
+        pos += 1
+
+        if kinds[pos] in ('BU_SG_REL_', 'BU_BO_REL_'):
+            statement.append([values[pos]])
+            pos += 1
+        else:
+            statement.append([])
+
+        items, pos = self._sequence(pos, ['STRING', 'WORD'])
+        statement += items
+
+        if kinds[pos] == 'STRING':
+            items, pos = self._delimited(pos, 'STRING')
+            statement.append([items])
+        elif kinds[pos] == 'NUMBER':
+            end = pos
+
+            while kinds[end] == 'NUMBER':
+                end += 1
+
+            statement.append([values[pos:end]])
+            pos = end
+        else:
+            statement.append([])
+
+        return self._end(statement, pos)
+
+    def _attribute_definition_default(self, pos):
+        statement, pos = self._sequence(pos, [self._kinds[pos], 'STRING'])
+        statement.append(self._number_or_string(pos))
+
+        return self._end(statement, pos + 1)
+
+    def _attribute(self, pos):
+        kinds = self._kinds
+        statement, pos = self._sequence(pos, ['BA_', 'STRING'])
+        items = []
+
+        while True:
+            kind = kinds[pos]
+
+            if kind == 'BO_':
+                item, pos = self._sequence(pos, ['BO_', 'NUMBER'])
+            elif kind == 'SG_':
+                item, pos = self._sequence(pos, ['SG_', 'NUMBER', 'WORD'])
+            elif kind == 'BU_':
+                item, pos = self._sequence(pos, ['BU_', 'WORD'])
+            elif kind == 'EV_':
+                item, pos = self._sequence(pos, ['EV_', 'WORD'])
+            else:
+                break
+
+            items.append(item)
+
+        statement.append(items)
+        statement.append(self._number_or_string(pos))
+
+        return self._end(statement, pos + 1)
+
+    def _attribute_rel(self, pos):
+        kind = self._kinds[pos + 2]
+
+        if kind == 'BU_SG_REL_':
+            statement, pos = self._sequence(
+                pos,
+                ['BA_REL_', 'STRING', 'BU_SG_REL_', 'WORD', 'SG_', 'NUMBER',
+                 'WORD'])
+        elif kind == 'BU_BO_REL_':
+            statement, pos = self._sequence(
+                pos,
+                ['BA_REL_', 'STRING', 'BU_BO_REL_', 'WORD', 'NUMBER'])
+        else:
+            raise _Mismatch()
+
+        statement.append(self._number_or_string(pos))
+
+        return self._end(statement, pos + 1)
+
+    def _choice(self, pos):
+        kinds = self._kinds
+        values = self._values
+        statement = ['VAL_']
+        pos += 1
+
+        if kinds[pos] == 'NUMBER':
+            statement.append([values[pos]])
+            pos += 1
+        else:
+            statement.append([])
+
+        statement.append(self._expect(pos, 'WORD'))
+        pairs, pos = self._pairs(pos + 1)
+        statement.append(pairs)
+
+        return self._end(statement, pos)
+
+    def _value_table(self, pos):
+        statement, pos = self._sequence(pos, ['VAL_TABLE_', 'WORD'])
+        pairs, pos = self._pairs(pos)
+        statement.append(pairs)
+
+        return self._end(statement, pos)
+
+    def _signal_type(self, pos):
+        return self._sequence(
+            pos,
+            ['SIG_VALTYPE_', 'NUMBER', 'WORD', ':', 'NUMBER', ';'])
+
+    def _signal_multiplexer_values(self, pos):
+        kinds = self._kinds
+        values = self._values
+        statement, pos = self._sequence(
+            pos,
+            ['SG_MUL_VAL_', 'NUMBER', 'WORD', 'WORD', 'NUMBER', 'NUMBER'])
+        ranges = [statement[4:]]
+        del statement[4:]
+
+        while (kinds[pos] == ','
+               and kinds[pos + 1] == 'NUMBER'
+               and kinds[pos + 2] == 'NUMBER'):
+            ranges.append(values[pos + 1:pos + 3])
+            pos += 3
+
+        statement.append(ranges)
+
+        return self._end(statement, pos)
+
+    def _message_add_sender(self, pos):
+        statement, pos = self._sequence(pos, ['BO_TX_BU_', 'NUMBER', ':'])
+        senders, pos = self._delimited(pos, 'WORD')
+        statement.append(senders)
+
+        return self._end(statement, pos)
+
+    def _signal_group(self, pos):
+        statement, pos = self._sequence(
+            pos,
+            ['SIG_GROUP_', 'NUMBER', 'WORD', 'NUMBER', ':'])
+        words, pos = self._words(pos)
+        statement.append(words)
+
+        return self._end(statement, pos)
+
+
 class LongNamesConverter:
 
     def __init__(self, database):
@@ -1501,7 +1989,9 @@ def _load_messages(tokens,
                    strict,
                    bus_name,
                    signal_groups,
-                   sort_signals):
+                   sort_signals,
+                   lazy_codecs,
+                   message_filter):
     """Load messages.
 
     """
@@ -1601,6 +2091,19 @@ def _load_messages(tokens,
         except:
             return None
 
+    def get_nodes(message, senders):
+        """Get the senders and the signal receivers of given message
+        without loading its signals.
+
+        """
+
+        yield from senders
+
+        for signal in message[6]:
+            if signal[20] != ['Vector__XXX']:
+                for receiver in signal[20]:
+                    yield _get_node_name(attributes, receiver)
+
     messages = []
 
     for message in tokens.get('BO_', []):
@@ -1625,6 +2128,15 @@ def _load_messages(tokens,
         if senders == ['Vector__XXX']:
             senders = []
 
+        name = get_message_name(frame_id_dbc, message[2])
+
+        if message_filter is not None \
+           and not message_filter.match(name,
+                                        frame_id,
+                                        bus_name,
+                                        get_nodes(message, senders)):
+            continue
+
         # Signal multiplexing.
         multiplexer_signal = None
 
@@ -1650,7 +2162,7 @@ def _load_messages(tokens,
         messages.append(
             Message(frame_id=frame_id,
                     is_extended_frame=is_extended_frame,
-                    name=get_message_name(frame_id_dbc, message[2]),
+                    name=name,
                     length=int(message[4], 0),
                     senders=senders,
                     send_type=get_send_type(frame_id_dbc),
@@ -1664,7 +2176,8 @@ def _load_messages(tokens,
                     protocol=get_protocol(frame_id_dbc),
                     bus_name=bus_name,
                     signal_groups=get_signal_groups(frame_id_dbc),
-                    sort_signals=sort_signals))
+                    sort_signals=sort_signals,
+                    lazy_codecs=lazy_codecs))
 
     return messages
 
@@ -1790,9 +2303,16 @@ def make_message_names_unique(database, shorten_long_names):
 
 def make_signal_names_unique(database, shorten_long_names):
     converter = LongNamesConverter(database)
+    converted_signals = set()
 
     for message in database.messages:
         for signal in message.signals:
+            # signals shared by several messages are only converted
+            # once
+            if id(signal) in converted_signals:
+                continue
+
+            converted_signals.add(id(signal))
             name = converter.convert(signal.name)
             try_remove_attribute(signal.dbc, 'SystemSignalLongSymbol')
 
@@ -1959,12 +2479,32 @@ def get_definitions_rel_dict(definitions, defaults):
 
 
 def load_string(string: str, strict: bool = True,
-                sort_signals: type_sort_signals = sort_signals_by_start_bit) -> InternalDatabase:
+                sort_signals: type_sort_signals = sort_signals_by_start_bit,
+                lazy_codecs: bool = False,
+                message_filter: Union[MessageFilter, None] = None,
+                parser: str = 'fast') -> InternalDatabase:
     """Parse given string.
 
+    Messages not selected by given message filter are skipped before
+    their signals are loaded.
+
+    `parser` is either ``'fast'`` for the hand-written parser or
+    ``'textparser'`` for the grammar based parser. Both create the
+    same parse tree, from which the database is then loaded, and the
+    fast parser falls back to the grammar based parser to report
+    errors. See :class:`FastParser`.
+
     """
 
-    tokens = Parser().parse(string)
+    if parser == 'fast':
+        tokens = FastParser().parse(string)
+
+        if tokens is None:
+            tokens = Parser().parse(string)
+    elif parser == 'textparser':
+        tokens = Parser().parse(string)
+    else:
+        raise ValueError(f"Invalid DBC parser '{parser}'.")
 
     comments = _load_comments(tokens)
     definitions = _load_attribute_definitions(tokens)
@@ -1993,7 +2533,9 @@ def load_string(string: str, strict: bool = True,
                               strict,
                               bus.name if bus else None,
                               signal_groups,
-                              sort_signals)
+                              sort_signals,
+                              lazy_codecs,
+                              message_filter)
     nodes = _load_nodes(tokens, comments, attributes, attribute_definitions)
     version = _load_version(tokens)
     environment_variables = _load_environment_variables(tokens, comments, attributes)
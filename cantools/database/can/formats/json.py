@@ -1,11 +1,13 @@
 from ..signal import Signal, Decimal
 from ..message import Message
+from ..message_filter import MessageFilter
 from ..node import Node
 from ....errors import Error
 from ..internal_database import InternalDatabase
 from collections import OrderedDict
 import json
 import math
+from typing import Any, Dict, Optional
 
 from ...utils import (
     type_sort_signals,
@@ -25,88 +27,212 @@ MAX_PRIORITY = 3
 MESSAGES_PER_PRIORITY = int(2**MESSAGE_BITS / (MAX_PRIORITY + 1))
 
 
-class IdGenerator:
-    def __init__(self, topic: int, blacklist=set()):
-        self.ids_per_priority = [0] * (MAX_PRIORITY + 1)
-        self.topic = topic
-        self.blacklist = blacklist
+def generate_topics_id(db):
+    topics = set()
+    for message in db['messages']:
+        if 'topic' in message:
+            topics.add(message['topic'])
+    ids = {topic: index for index, topic in enumerate(sorted(topics))}
 
-    def next(self, priority: int) -> int:
-        item_id = self.ids_per_priority[priority]
-        while True:
-            self.ids_per_priority[priority] += 1
-            start = MESSAGES_PER_PRIORITY * (MAX_PRIORITY - priority)
-            if item_id >= MESSAGES_PER_PRIORITY:
-                raise Exception(f"No more messages (>{MESSAGES_PER_PRIORITY})")
+    if len(ids) >= 2**TOPIC_BITS:
+        raise Exception(f"No more topics (>{2**TOPIC_BITS})")
 
-            scoped_id = item_id + start
-            global_id = (scoped_id << TOPIC_BITS) + self.topic
+    return ids
 
-            if global_id not in self.blacklist:
-                return global_id
 
-            item_id += 1  # next one
+def get_message_band(message: Dict[str, Any]) -> int:
+    message_priority: int = MAX_PRIORITY - message["priority"]
 
-def get_messages_by_topic(db, topic):
-    ret = []
-    for message in db['messages']:
-        if 'topic' in message and message['topic'] == topic:
-            ret.append(message)
-    return ret
+    if message_priority > MAX_PRIORITY or message_priority < 0:
+        raise Exception(f'"{message["name"]}" out of range (0-{MAX_PRIORITY})')
 
-def generate_ids(db, blacklist=set()):
-    ids = {}
-    topics = generate_topics_id(db)
-    for name, id in topics.items():
-        if name == "FIXED_IDS":
-            continue
+    return message_priority
 
-        messages = get_messages_by_topic(db, name)
-        message_ids = generate_messages_id(messages, id, blacklist)
 
-        ids[name] = {"id": id, "messages": message_ids}
+def get_message_instances(message):
+    """Returns the names of the CAN messages created for given message,
+    one per sender if it has more than one.
 
-    return ids
+    """
 
-def bit_to_bytes(bits):
-    return (bits+7)//8
+    if len(message["sending"]) > 1:
+        return [f"{message['name']}_{device_name}"
+                for device_name in message["sending"]]
 
-def generate_messages_id(topic_messages, topic: int, blacklist=set()):
-    generator = IdGenerator(topic, blacklist)
-
-    message_ids = {}
-    for message in topic_messages:
-        message_name = message['name']
-        message_priority = message["priority"]
-        
-        message_priority = MAX_PRIORITY - message_priority
-
-        if message_priority > MAX_PRIORITY or message_priority < 0:
-            raise Exception(f'"{message_name}" out of range (0-{MAX_PRIORITY})')
-
-        if len(message["sending"]) > 1:
-            multiple_ids = {}
-            for device_name in message["sending"]:
-                generated_message_name = f"{message_name}_{device_name}"
-                multiple_ids[generated_message_name] = generator.next(message_priority)
-            message_ids[message_name] = multiple_ids
-        else:
-            global_id = generator.next(message_priority)
-            message_ids[message_name] = {message_name: global_id}
-    return message_ids
+    return [message['name']]
 
 
-def generate_topics_id(db):
-    topics = set()
-    for message in db['messages']:
-        if 'topic' in message:
-            topics.add(message['topic'])
-    ids = {topic: index for index, topic in enumerate(sorted(topics))}
+def make_global_id(topic: int, priority: int, item_id: int) -> int:
+    scoped_id = item_id + MESSAGES_PER_PRIORITY * (MAX_PRIORITY - priority)
 
-    if len(ids) >= 2**TOPIC_BITS:
-        raise Exception(f"No more topics (>{2**TOPIC_BITS})")
+    return (scoped_id << TOPIC_BITS) + topic
 
-    return ids
+
+def split_global_id(global_id: int):
+    """Returns the topic, priority band and item id of given global id.
+
+    """
+
+    topic = global_id & (2**TOPIC_BITS - 1)
+    scoped_id = global_id >> TOPIC_BITS
+    priority = MAX_PRIORITY - scoped_id // MESSAGES_PER_PRIORITY
+    item_id = scoped_id % MESSAGES_PER_PRIORITY
+
+    return topic, priority, item_id
+
+
+class IdAllocator:
+    """Allocates the frame ids of the messages of a parsed JSON network.
+
+    The messages are indexed by topic once, and the used ids of each
+    topic and priority band are kept in a bitmap, so the next free id
+    is found without scanning the ids already allocated.
+
+    `reserved_ids` are frame ids not to allocate, typically the ones of
+    messages already in the database. The ``fixed_id`` of messages
+    without a topic are always reserved.
+
+    `allocations` maps message names to the frame ids they were given
+    previously, for example ``{message.name: message.frame_id for
+    message in db.messages}`` of an earlier version of the
+    network. These messages keep their id if it still belongs to their
+    topic and priority band and is not reserved, and the other messages
+    are given the lowest free ids, so adding or removing a message does
+    not change the ids of the others. Without `allocations` the ids
+    are allocated in message order.
+
+    >>> allocator = IdAllocator(json.loads(string))
+    >>> allocator.ids['BMS']['messages']['CELL_VOLTAGE']
+    {'CELL_VOLTAGE': 512}
+    >>> allocator.utilisation()['BMS'][1]
+    {'allocated': 3, 'reserved': 0, 'free': 61}
+
+    """
+
+    def __init__(self, db, reserved_ids=(), allocations=None):
+        self._topics = generate_topics_id(db)
+        self._messages_by_topic = {name: [] for name in self._topics}
+
+        for message in db['messages']:
+            if 'topic' in message:
+                self._messages_by_topic[message['topic']].append(message)
+            elif 'fixed_id' in message:
+                reserved_ids = [*reserved_ids, message['fixed_id']]
+
+        # one bitmap of used item ids per topic id and priority band
+        self._used = [[0] * (MAX_PRIORITY + 1) for _ in range(2**TOPIC_BITS)]
+        self._reserved = [[0] * (MAX_PRIORITY + 1)
+                          for _ in range(2**TOPIC_BITS)]
+
+        for global_id in reserved_ids:
+            topic, priority, item_id = split_global_id(global_id)
+
+            if 0 <= priority <= MAX_PRIORITY:
+                self._reserved[topic][priority] |= (1 << item_id)
+
+        for topic in range(2**TOPIC_BITS):
+            self._used[topic] = list(self._reserved[topic])
+
+        self.ids = self._allocate(allocations or {})
+
+    def _allocate(self, allocations):
+        ids = {}
+        pinned = {}
+
+        # keep the previous ids first, so that new messages do not
+        # take them
+        for name, topic in self._topics.items():
+            if name == "FIXED_IDS":
+                continue
+
+            for message in self._messages_by_topic[name]:
+                priority = get_message_band(message)
+
+                for instance in get_message_instances(message):
+                    global_id = allocations.get(instance)
+
+                    if global_id is None:
+                        continue
+
+                    if split_global_id(global_id)[:2] != (topic, priority):
+                        continue
+
+                    bit = 1 << split_global_id(global_id)[2]
+
+                    if self._used[topic][priority] & bit:
+                        continue
+
+                    self._used[topic][priority] |= bit
+                    pinned[instance] = global_id
+
+        for name, topic in self._topics.items():
+            if name == "FIXED_IDS":
+                continue
+
+            message_ids = {}
+
+            for message in self._messages_by_topic[name]:
+                priority = get_message_band(message)
+                instance_ids = {}
+
+                for instance in get_message_instances(message):
+                    if instance in pinned:
+                        instance_ids[instance] = pinned[instance]
+                    else:
+                        instance_ids[instance] = self._next(topic, priority)
+
+                message_ids[message['name']] = instance_ids
+
+            ids[name] = {"id": topic, "messages": message_ids}
+
+        return ids
+
+    def _next(self, topic: int, priority: int) -> int:
+        used = self._used[topic][priority]
+        item_id = (~used & (used + 1)).bit_length() - 1
+
+        if item_id >= MESSAGES_PER_PRIORITY:
+            raise Exception(f"No more messages (>{MESSAGES_PER_PRIORITY})")
+
+        self._used[topic][priority] = used | (1 << item_id)
+
+        return make_global_id(topic, priority, item_id)
+
+    def utilisation(self):
+        """Returns the number of allocated, reserved and free ids per topic
+        and message priority, as ``{topic: {priority: {'allocated': ...,
+        'reserved': ..., 'free': ...}}}``.
+
+        """
+
+        report = {}
+
+        for name, topic in self._topics.items():
+            if name == "FIXED_IDS":
+                continue
+
+            report[name] = {}
+
+            for message_priority in range(MAX_PRIORITY + 1):
+                priority = MAX_PRIORITY - message_priority
+                used = self._used[topic][priority]
+                reserved = self._reserved[topic][priority]
+                mask = 2**MESSAGES_PER_PRIORITY - 1
+                report[name][message_priority] = {
+                    'allocated': bin(used & ~reserved & mask).count('1'),
+                    'reserved': bin(reserved & mask).count('1'),
+                    'free': bin(~used & mask).count('1')
+                }
+
+        return report
+
+
+def generate_ids(db, blacklist=(), allocations=None):
+    return IdAllocator(db, blacklist, allocations).ids
+
+
+def bit_to_bytes(bits):
+    return (bits+7)//8
 
 
 lengths = {'bool': 1, 'uint8': 8, 'int8': 8, 'uint16': 16, 'int16': 16, 'uint32': 32, 'int32': 32,
@@ -184,17 +310,11 @@ def get_signal(name, signal, offset: int, types, endianness):
     return (offset+type, [Signal(name, start, type, is_float=False, minimum=minimum, maximum=maximum, offset=(minimum), scale=precision, is_signed=is_signed,
                             decimal=Decimal(precision, (minimum), minimum, maximum), choices=choices, byte_order=endianness)])
 
-def get_reserved_ids(db, messages) -> set:
-    ret = set()
-    for message in messages:
-        ret.add(message.frame_id)
-    for message in db['messages']:
-        if 'fixed_id' in message:
-            ret.add(message['fixed_id'])
-    return ret
-
 def load_string(string: str, strict: bool = True,
-                sort_signals: type_sort_signals = sort_signals_by_start_bit, messages = []) -> InternalDatabase:
+                sort_signals: type_sort_signals = sort_signals_by_start_bit, messages = [],
+                lazy_codecs: bool = False,
+                message_filter: Optional[MessageFilter] = None,
+                id_allocations: Optional[Dict[str, int]] = None) -> InternalDatabase:
     db = json.loads(string)
 
     nodes = set()
@@ -205,8 +325,8 @@ def load_string(string: str, strict: bool = True,
         for j in i['receiving']:
             nodes.add(Node(j))
     msgs = []
-    reserved_ids = get_reserved_ids(db, messages)
-    ids = generate_ids(db, reserved_ids)
+    reserved_ids = [message.frame_id for message in messages]
+    ids = generate_ids(db, reserved_ids, id_allocations)
     for message in db['messages']:
         comment = ''
         cycle_time = None
@@ -225,6 +345,8 @@ def load_string(string: str, strict: bool = True,
         msg_name = message['name']
         topic_name = None
         topic_id = None
+        # the messages of other senders are copies of the first one
+        template = None
         for sending in message['sending']:
             if 'topic' in message:
                 if len(message['sending']) > 1:
@@ -240,6 +362,15 @@ def load_string(string: str, strict: bool = True,
                 id = message['fixed_id']
                 topic_id = None
                 topic_name = 'FIXED_IDS'
+            if message_filter is not None \
+               and not message_filter.match(msg_name,
+                                            id,
+                                            None,
+                                            [sending, *message['receiving']]):
+                continue
+            if template is not None:
+                msgs.append(Message(id, msg_name, template.length, list(template.signals), comment=comment, cycle_time=cycle_time, topic_name=topic_name, topic_id=topic_id, sort_signals=None, lazy_codecs=lazy_codecs, template=template))
+                continue
             signals = []
             offset = 0
             for signal in message['contents']:
@@ -248,5 +379,6 @@ def load_string(string: str, strict: bool = True,
             if offset > 64:
                 print(offset)
                 raise Exception(f'the payload of {msg_name} is too BIG🍆')
-            msgs.append(Message(id, msg_name, bit_to_bytes(offset), signals, comment=comment, cycle_time=cycle_time, topic_name=topic_name, topic_id=topic_id))
+            template = Message(id, msg_name, bit_to_bytes(offset), signals, comment=comment, cycle_time=cycle_time, topic_name=topic_name, topic_id=topic_id, lazy_codecs=lazy_codecs)
+            msgs.append(template)
     return InternalDatabase(msgs, list(nodes), [], "1")
\ No newline at end of file
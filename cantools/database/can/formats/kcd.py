@@ -3,7 +3,7 @@
 import logging
 from collections import defaultdict
 from decimal import Decimal
-from typing import Dict
+from typing import Dict, Optional
 
 from xml.etree import ElementTree
 from xml.etree.ElementTree import Element
@@ -13,6 +13,7 @@ from ..signal import Signal
 from ..signal import NamedSignalValue
 from ..signal import Decimal as SignalDecimal
 from ..message import Message
+from ..message_filter import MessageFilter
 from ..node import Node
 from ..bus import Bus
 from ..internal_database import InternalDatabase
@@ -28,6 +29,7 @@ NAMESPACE = 'http://kayak.2codeornot2code.org/1.0'
 NAMESPACES = {'ns': NAMESPACE}
 
 ROOT_TAG = f'{{{NAMESPACE}}}NetworkDefinition'
+NODE_REF_TAG = f'{{{NAMESPACE}}}NodeRef'
 
 
 def _start_bit(offset, byte_order):
@@ -169,7 +171,27 @@ def _load_multiplex_element(mux, nodes):
     return signals
 
 
-def _load_message_element(message, bus_name, nodes, strict, sort_signals):
+def _is_message_element_selected(message, bus_name, nodes, message_filter):
+    """Returns True if given message element is selected by given
+    message filter, without loading its signals.
+
+    """
+
+    frame_id = message.attrib.get('id')
+
+    if frame_id is not None:
+        frame_id = int(frame_id, 0)
+
+    node_names = (_get_node_name_by_id(nodes, node_ref.attrib['id'])
+                  for node_ref in message.iter(NODE_REF_TAG))
+
+    return message_filter.match(message.attrib.get('name'),
+                                frame_id,
+                                bus_name,
+                                node_names)
+
+
+def _load_message_element(message, bus_name, nodes, strict, sort_signals, lazy_codecs):
     """Load given message element and return a message object.
 
     """
@@ -243,7 +265,8 @@ def _load_message_element(message, bus_name, nodes, strict, sort_signals):
                    comment=notes,
                    bus_name=bus_name,
                    strict=strict,
-                   sort_signals=sort_signals)
+                   sort_signals=sort_signals,
+                   lazy_codecs=lazy_codecs)
 
 
 def _indent_xml(element, indent, level=0):
@@ -461,9 +484,12 @@ def dump_string(database: InternalDatabase, *, sort_signals:type_sort_signals=SO
     return ElementTree.tostring(network_definition, encoding='unicode')
 
 
-def load_string(string:str, strict:bool=True, sort_signals:type_sort_signals=sort_signals_by_start_bit) -> InternalDatabase:
+def load_string(string:str, strict:bool=True, sort_signals:type_sort_signals=sort_signals_by_start_bit, lazy_codecs:bool=False, message_filter:Optional[MessageFilter]=None) -> InternalDatabase:
     """Parse given KCD format string.
 
+    Messages not selected by given message filter are skipped before
+    their signals are loaded.
+
     """
 
     root = ElementTree.fromstring(string)
@@ -490,11 +516,19 @@ def load_string(string:str, strict:bool=True, sort_signals:type_sort_signals=sor
         buses.append(Bus(bus_name, baudrate=bus_baudrate))
 
         for message in bus.iterfind('ns:Message', NAMESPACES):
+            if message_filter is not None \
+               and not _is_message_element_selected(message,
+                                                    bus_name,
+                                                    nodes,
+                                                    message_filter):
+                continue
+
             messages.append(_load_message_element(message,
                                                   bus_name,
                                                   nodes,
                                                   strict,
-                                                  sort_signals))
+                                                  sort_signals,
+                                                  lazy_codecs))
 
     return InternalDatabase(messages,
                             [
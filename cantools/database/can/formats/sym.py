@@ -24,6 +24,7 @@ from ..signal import Signal
 from ..signal import NamedSignalValue
 from ..signal import Decimal as SignalDecimal
 from ..message import Message
+from ..message_filter import MessageFilter
 from ..internal_database import InternalDatabase
 
 from .utils import num
@@ -661,7 +662,8 @@ def _load_message(frame_id,
                   enums,
                   strict,
                   sort_signals,
-                  section_name):
+                  section_name,
+                  lazy_codecs):
     #print(message_tokens)
     # Default values.
     name = message_tokens[1]
@@ -697,7 +699,8 @@ def _load_message(frame_id,
                    comment=comment,
                    bus_name=None,
                    strict=strict,
-                   sort_signals=sort_signals)
+                   sort_signals=sort_signals,
+                   lazy_codecs=lazy_codecs)
 
 
 def _parse_message_frame_ids(message):
@@ -727,7 +730,7 @@ def _parse_message_frame_ids(message):
     return frame_ids, is_extended_frame(message_id[2], message_type)
 
 
-def _load_message_section(section_name, tokens, signals, enums, strict, sort_signals):
+def _load_message_section(section_name, tokens, signals, enums, strict, sort_signals, lazy_codecs, message_filter):
     def has_frame_id(message):
         return 'ID' in message[3]
 
@@ -741,6 +744,13 @@ def _load_message_section(section_name, tokens, signals, enums, strict, sort_sig
         frame_ids, is_extended_frame = _parse_message_frame_ids(message_tokens)
 
         for frame_id in frame_ids:
+            if message_filter is not None \
+               and not message_filter.match(message_tokens[1],
+                                            frame_id,
+                                            None,
+                                            _get_senders(section_name)):
+                continue
+
             message = _load_message(frame_id,
                                     is_extended_frame,
                                     message_tokens,
@@ -749,16 +759,17 @@ def _load_message_section(section_name, tokens, signals, enums, strict, sort_sig
                                     enums,
                                     strict,
                                     sort_signals,
-                                    section_name)
+                                    section_name,
+                                    lazy_codecs)
             messages.append(message)
 
     return messages
 
 
-def _load_messages(tokens, signals, enums, strict, sort_signals):
-    messages = _load_message_section('{SEND}', tokens, signals, enums, strict, sort_signals)
-    messages += _load_message_section('{RECEIVE}', tokens, signals, enums, strict, sort_signals)
-    messages += _load_message_section('{SENDRECEIVE}', tokens, signals, enums, strict, sort_signals)
+def _load_messages(tokens, signals, enums, strict, sort_signals, lazy_codecs, message_filter):
+    messages = _load_message_section('{SEND}', tokens, signals, enums, strict, sort_signals, lazy_codecs, message_filter)
+    messages += _load_message_section('{RECEIVE}', tokens, signals, enums, strict, sort_signals, lazy_codecs, message_filter)
+    messages += _load_message_section('{SENDRECEIVE}', tokens, signals, enums, strict, sort_signals, lazy_codecs, message_filter)
 
     return messages
 
@@ -983,9 +994,12 @@ def dump_string(database: InternalDatabase, *, sort_signals:type_sort_signals=SO
 
     return sym_str
 
-def load_string(string:str, strict:bool=True, sort_signals:type_sort_signals=sort_signals_by_start_bit) -> InternalDatabase:
+def load_string(string:str, strict:bool=True, sort_signals:type_sort_signals=sort_signals_by_start_bit, lazy_codecs:bool=False, message_filter:TypingOptional[MessageFilter]=None) -> InternalDatabase:
     """Parse given string.
 
+    Messages not selected by given message filter are skipped before
+    their signals are loaded.
+
     """
 
     if not re.search('^FormatVersion=6.0', string, re.MULTILINE):
@@ -996,7 +1010,7 @@ def load_string(string:str, strict:bool=True, sort_signals:type_sort_signals=sor
     version = _load_version(tokens)
     enums = _load_enums(tokens)
     signals = _load_signals(tokens, enums)
-    messages = _load_messages(tokens, signals, enums, strict, sort_signals)
+    messages = _load_messages(tokens, signals, enums, strict, sort_signals, lazy_codecs, message_filter)
 
     return InternalDatabase(messages,
                             [],
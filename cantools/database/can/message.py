@@ -1,8 +1,10 @@
 # A CAN message.
 
 import logging
+import threading
 from copy import deepcopy
 from typing import (
+    Any,
     List,
     Optional,
     Union,
@@ -10,9 +12,24 @@ from typing import (
     TYPE_CHECKING,
     Set,
     Tuple,
+    Iterable,
+    Iterator,
+    Mapping,
+    Type,
     cast
 )
 
+from .batch import Columns
+from .batch import decode_batch
+from .batch import encode_batch
+from .decoder import CompiledDecoder
+from .decoder import CompiledRecordDecoder
+from .decoder import create_decoder
+from .decoder import create_record_decoder
+from .decoder import is_regular_layout
+from .projection import Projection
+from .record import Record
+from .record import create_record_type
 from .signal import NamedSignalValue, Signal
 from .signal_group import SignalGroup
 from ..utils import format_or
@@ -47,6 +64,15 @@ if TYPE_CHECKING:
 
 LOGGER = logging.getLogger(__name__)
 
+# Maximum number of multiplexer paths flattened when the message is
+# refreshed. Further paths are flattened when first decoded.
+MAX_NUMBER_OF_FLAT_CODECS = 1024
+
+FlatKey = Tuple[Optional[int], ...]
+
+# Serializes creation of lazy codecs.
+_CODECS_LOCK = threading.RLock()
+
 
 class Message:
     """A CAN message with frame id, comment, signals and other
@@ -59,8 +85,56 @@ class Message:
     If you don't want them to be sorted pass `sort_signals = None`.
     If you want the signals to be sorted in another way pass something like
     `sort_signals = lambda signals: list(sorted(signals, key=lambda sig: sig.name))`
+
+    If `lazy_codecs` is ``True`` the codecs used to encode and decode
+    the message are created when first needed instead of when the
+    message is created or refreshed. This includes the checks enabled
+    by `strict`.
+
+    If `template` is given the message is a copy of it with another
+    frame id and name, for example created once per sender of a
+    message. Its signals must be the signal objects of `template`,
+    whose codecs are then used instead of creating new ones.
     """
 
+    __slots__ = (
+        '_frame_id',
+        '_header_id',
+        '_header_byte_order',
+        '_is_extended_frame',
+        '_is_fd',
+        '_name',
+        '_length',
+        '_unused_bit_pattern',
+        '_signals',
+        '_signal_dict',
+        '_contained_messages',
+        '_comments',
+        '_senders',
+        '_send_type',
+        '_cycle_time',
+        '_dbc',
+        '_autosar',
+        '_bus_name',
+        '_signal_groups',
+        '_codecs',
+        '_decoder',
+        '_string_decoder',
+        '_record_type',
+        '_record_decoders',
+        '_flat_codecs',
+        '_projections',
+        '_signal_tree',
+        '_strict',
+        '_lazy_codecs',
+        '_codecs_pending',
+        '_codecs_strict',
+        '_protocol',
+        '_template',
+        'topic_name',
+        'topic_id',
+    )
+
     def __init__(self,
                  frame_id: int,
                  name: str,
@@ -87,7 +161,9 @@ class Message:
                  protocol: Optional[str] = None,
                  sort_signals: type_sort_signals = sort_signals_by_start_bit,
                  topic_name: Optional[str] = None,
-                 topic_id: Optional[int] = None
+                 topic_id: Optional[int] = None,
+                 lazy_codecs: bool = False,
+                 template: Optional['Message'] = None
                  ) -> None:
         frame_id_bit_length = frame_id.bit_length()
 
@@ -139,9 +215,19 @@ class Message:
         self._bus_name = bus_name
         self._signal_groups = signal_groups
         self._codecs: Optional[Codec] = None
+        self._decoder: Optional[CompiledDecoder] = None
+        self._string_decoder: Optional[CompiledDecoder] = None
+        self._record_type: Optional[Type[Record]] = None
+        self._record_decoders: Dict[bool, Optional[CompiledRecordDecoder]] = {}
+        self._flat_codecs: Optional[Dict[FlatKey, Optional[Codec]]] = None
+        self._projections: Dict[Tuple[str, ...], Projection] = {}
         self._signal_tree: Optional[List[Union[str, List[str]]]] = None
         self._strict = strict
+        self._lazy_codecs = lazy_codecs
+        self._codecs_pending = False
+        self._codecs_strict = strict
         self._protocol = protocol
+        self._template = template
 
         #only for json
         self.topic_name = topic_name
@@ -510,6 +596,21 @@ class Message:
     def protocol(self, value: Optional[str]) -> None:
         self._protocol = value
 
+    @property
+    def template(self) -> Optional['Message']:
+        """The message this message is a copy of, sharing its signals and
+        codecs, or ``None``. Messages of JSON networks sent by several
+        nodes are copies of the message of their first sender. Code
+        generators may use one implementation for a message and its
+        copies.
+
+        The message is no longer a copy once its signals or length
+        are changed and it is refreshed.
+
+        """
+
+        return self._template
+
     @property
     def signal_tree(self):
         """All signal names and multiplexer ids as a tree. Multiplexer signals
@@ -524,6 +625,8 @@ class Message:
 
         """
 
+        self._ensure_codecs()
+
         return self._signal_tree
 
     def gather_signals(self,
@@ -539,6 +642,7 @@ class Message:
         '''
 
         if node is None:
+            self._ensure_codecs()
             node = self._codecs
         assert node is not None
 
@@ -944,6 +1048,8 @@ class Message:
                                   f'signal value dictionary')
             self.assert_signals_encodable(data, scaling=scaling)
 
+        self._ensure_codecs()
+
         if self._codecs is None:
             raise ValueError('Codec is not initialized.')
 
@@ -957,6 +1063,241 @@ class Message:
 
         return encoded.to_bytes(self._length, "big")
 
+    def encode_batch(self,
+                     columns: Dict[str, Any],
+                     scaling: bool = True,
+                     padding: bool = False,
+                     strict: bool = True) -> Any:
+        """Encode many frames of this message at once. `columns` is a
+        dictionary mapping signal names to sequences or arrays of ``N``
+        values each, one per frame. Values may be numbers or choice
+        strings.
+
+        Multiplexed messages are encoded by giving the multiplexer
+        columns, which select the branch of each frame. Columns of
+        signals in branches that are not selected in a frame may hold
+        any value, ``None`` or be masked there.
+
+        `scaling`, `padding` and `strict` have the same meaning as for
+        :meth:`.encode()`, but are applied to whole columns at once.
+
+        Returns an ``(N, length)`` array of ``uint8`` if NumPy is
+        installed, and a list of ``N`` ``bytes`` objects otherwise.
+
+        >>> foo = db.get_message_by_name('Foo')
+        >>> foo.encode_batch({'Bar': [1, 2], 'Fum': [5.0, 5.0]})
+        array([[ 1, 69, 35,  0, 17],
+               [ 2, 69, 35,  0, 17]], dtype=uint8)
+
+        """
+
+        self._ensure_codecs()
+
+        return encode_batch(self, columns, scaling, padding, strict)
+
+    def _create_flat_codecs(self) -> Optional[Dict[FlatKey, Optional[Codec]]]:
+        """Create a table of codecs with all signals of a multiplexer path
+        merged into a single node, keyed by the multiplexer ids of the
+        path in depth first order. Returns ``None`` if the message is
+        not multiplexed.
+
+        """
+
+        assert self._codecs is not None
+
+        if not self._codecs['multiplexers']:
+            return None
+
+        for signal in self._signals:
+            if signal.is_multiplexer and signal.is_float:
+                return None
+
+        flat_codecs: Dict[FlatKey, Optional[Codec]] = {}
+
+        for key, signals in self._flat_paths(self._codecs):
+            if len(flat_codecs) == MAX_NUMBER_OF_FLAT_CODECS:
+                break
+
+            flat_codecs[key] = self._create_flat_codec(signals)
+
+        return flat_codecs
+
+    def _flat_paths(self, node: Codec) -> Iterator[Tuple[FlatKey, List[Signal]]]:
+        yield from self._flat_multiplexer_paths(
+            list(node['multiplexers'].values()),
+            (),
+            list(node['signals']))
+
+    def _flat_multiplexer_paths(self,
+                                multiplexers: List[Mapping[int, Codec]],
+                                key: FlatKey,
+                                signals: List[Signal]) \
+                                -> Iterator[Tuple[FlatKey, List[Signal]]]:
+        if not multiplexers:
+            yield key, signals
+
+            return
+
+        for mux, node in multiplexers[0].items():
+            for node_key, node_signals in self._flat_paths(node):
+                yield from self._flat_multiplexer_paths(
+                    multiplexers[1:],
+                    key + (mux,) + node_key,
+                    signals + node_signals)
+
+    def _create_flat_codec(self, signals: List[Signal]) -> Optional[Codec]:
+        """Create a codec of given signals of a multiplexer path, or
+        ``None`` if the merged signals cannot be unpacked at once, for
+        example if they overlap.
+
+        """
+
+        layout = sorted(signals, key=lambda signal: signal.start)
+
+        if not is_regular_layout(layout, self._length):
+            return None
+
+        return {
+            'signals': signals,
+            'formats': create_encode_decode_formats(layout, self._length),
+            'multiplexers': {}
+        }
+
+    def _read_multiplexer(self,
+                          signal: Signal,
+                          le: int,
+                          be: int,
+                          number_of_bits: int,
+                          decode_choices: bool,
+                          scaling: bool) -> Optional[int]:
+        """Returns the multiplexer id of given multiplexer signal, read
+        directly from the data as little and big endian integers of
+        given number of bits, or ``None`` if the signal is truncated.
+
+        """
+
+        sequential_start = start_bit(signal)
+
+        if sequential_start + signal.length > number_of_bits:
+            return None
+
+        if signal.byte_order == 'little_endian':
+            raw = le >> signal.start
+        else:
+            raw = be >> (number_of_bits - sequential_start - signal.length)
+
+        raw &= (1 << signal.length) - 1
+
+        if signal.is_signed and raw & (1 << (signal.length - 1)):
+            raw -= 1 << signal.length
+
+        if decode_choices and signal.choices is not None and raw in signal.choices:
+            return self._get_mux_number({signal.name: signal.choices[raw]},
+                                        signal.name)
+        elif scaling:
+            return int(signal.scale * raw + signal.offset)
+        else:
+            return raw
+
+    def _flat_key(self,
+                  node: Codec,
+                  le: int,
+                  be: int,
+                  number_of_bits: int,
+                  decode_choices: bool,
+                  scaling: bool,
+                  key: List[Optional[int]]) -> None:
+        """Append the multiplexer ids of given data to given key. An id is
+        ``None`` if its multiplexer signal is truncated.
+
+        """
+
+        multiplexers = node['multiplexers']
+
+        for signal in multiplexers:
+            mux = self._read_multiplexer(self._signal_dict[signal],
+                                         le,
+                                         be,
+                                         number_of_bits,
+                                         decode_choices,
+                                         scaling)
+            key.append(mux)
+
+            if mux is None:
+                continue
+
+            try:
+                node = multiplexers[signal][mux]
+            except KeyError:
+                raise DecodeError(
+                    f'expected multiplexer id '
+                    f'{format_or(list(multiplexers[signal].keys()))}, '
+                    f'but got {mux}')
+
+            self._flat_key(node,
+                           le,
+                           be,
+                           number_of_bits,
+                           decode_choices,
+                           scaling,
+                           key)
+
+    def _flat_signals(self, node: Codec, key: Iterator[Optional[int]]) -> List[Signal]:
+        signals = list(node['signals'])
+
+        for signal, nodes in node['multiplexers'].items():
+            mux = next(key)
+
+            if mux is not None:
+                signals += self._flat_signals(nodes[mux], key)
+
+        return signals
+
+    def _decode_flat(self,
+                     data: bytes,
+                     decode_choices: bool,
+                     scaling: bool,
+                     allow_truncated: bool) -> SignalDictType:
+        """Decode given data of a multiplexed message by unpacking all
+        signals of its multiplexer path at once.
+
+        """
+
+        assert self._codecs is not None
+        assert self._flat_codecs is not None
+
+        key: List[Optional[int]] = []
+        self._flat_key(self._codecs,
+                       int.from_bytes(data, 'little'),
+                       int.from_bytes(data, 'big'),
+                       8 * len(data),
+                       decode_choices,
+                       scaling,
+                       key)
+        flat_key = tuple(key)
+
+        try:
+            codec = self._flat_codecs[flat_key]
+        except KeyError:
+            codec = self._create_flat_codec(
+                self._flat_signals(self._codecs, iter(flat_key)))
+            self._flat_codecs[flat_key] = codec
+
+        if codec is None:
+            return self._decode(self._codecs,
+                                data,
+                                decode_choices,
+                                scaling,
+                                allow_truncated)
+
+        return decode_data(data,
+                           self._length,
+                           codec['signals'],
+                           codec['formats'],
+                           decode_choices,
+                           scaling,
+                           allow_truncated)
+
     def _decode(self,
                 node: Codec,
                 data: bytes,
@@ -1006,6 +1347,10 @@ class Message:
         verifying the correctness of the end-to-end protection or the
         authenticity of a contained message.
 
+        `data` may be any object supporting the buffer protocol. If it
+        is a ``memoryview`` the contained data are views into it
+        instead of copies.
+
         Note that ``contained_message`` is the header ID integer value
         if a contained message is unknown. Further, if something goes
         seriously wrong, a ``DecodeError`` is raised.
@@ -1062,7 +1407,9 @@ class Message:
                decode_choices: bool = True,
                scaling: bool = True,
                decode_containers: bool = False,
-               allow_truncated: bool = False
+               allow_truncated: bool = False,
+               signals: Optional[Iterable[str]] = None,
+               choice_strings: bool = False
                ) \
                -> DecodeResultType:
         """Decode given data as a message of this type.
@@ -1076,6 +1423,10 @@ class Message:
         >>> foo.decode(b'\\x01\\x45\\x23\\x00\\x11')
         {'Bar': 1, 'Fum': 5.0}
 
+        `data` may be any object supporting the buffer protocol, for
+        example a ``bytearray`` or a ``memoryview`` of a receive
+        buffer, which is decoded without copying it.
+
         If `decode_containers` is ``True``, the inner messages are
         decoded if the current message is a container frame. The
         reason why this needs to be explicitly enabled is that the
@@ -1093,24 +1444,61 @@ class Message:
         ``False``, `DecodeError` will be raised when trying to decode
         incomplete messages.
 
+        If `signals` is given, only the signals with given names are
+        decoded, see :meth:`compile_projection()`. The projection is
+        compiled once and reused by later calls with the same
+        signals.
+
+        >>> foo.decode(b'\\x01\\x45\\x23\\x00\\x11', signals=['Fum'])
+        {'Fum': 5.0}
+
+        If `choice_strings` is ``True`` choices are decoded to plain
+        strings instead of
+        :class:`NamedSignalValue<cantools.database.can.signal.NamedSignalValue>`
+        objects. The strings are created once per choice, not for
+        every decoded frame.
+
         """
 
+        if signals is not None:
+            if self.is_container:
+                raise DecodeError(f'Message "{self.name}" is a container')
+
+            decoded = self._get_projection(signals).decode(data,
+                                                           decode_choices,
+                                                           scaling,
+                                                           allow_truncated)
+
+            if choice_strings:
+                self._replace_named_signal_values(decoded)
+
+            return decoded
+
         if decode_containers and self.is_container:
             return self.decode_container(data,
                                          decode_choices,
                                          scaling,
-                                         allow_truncated)
+                                         allow_truncated,
+                                         choice_strings)
 
         return self.decode_simple(data,
                                   decode_choices,
                                   scaling,
-                                  allow_truncated)
+                                  allow_truncated,
+                                  choice_strings)
+
+    @staticmethod
+    def _replace_named_signal_values(decoded: SignalDictType) -> None:
+        for name, value in decoded.items():
+            if isinstance(value, NamedSignalValue):
+                decoded[name] = value.name
 
     def decode_simple(self,
                       data: bytes,
                       decode_choices: bool = True,
                       scaling: bool = True,
-                      allow_truncated: bool = False) \
+                      allow_truncated: bool = False,
+                      choice_strings: bool = False) \
                       -> SignalDictType:
         """Decode given data as a container message.
 
@@ -1121,22 +1509,131 @@ class Message:
 
         if self.is_container:
             raise DecodeError(f'Message "{self.name}" is a container')
-        elif self._codecs is None:
+
+        if self._codecs_pending:
+            self._ensure_codecs()
+
+        if self._codecs is None:
             raise ValueError('Codec is not initialized.')
 
+        if not isinstance(data, bytes):
+            # Slicing a memoryview does not copy the underlying buffer.
+            data = memoryview(data)
+
         data = data[:self._length]
 
-        return self._decode(self._codecs,
-                            data,
-                            decode_choices,
-                            scaling,
-                            allow_truncated)
+        if self._decoder is not None and len(data) == self._length:
+            if not choice_strings:
+                return self._decoder(data, decode_choices, scaling)
+
+            if self._string_decoder is None:
+                self._string_decoder = create_decoder(self._codecs,
+                                                      self._length,
+                                                      self._name,
+                                                      strings=True)
+
+            return self._string_decoder(data, # type: ignore
+                                        decode_choices,
+                                        scaling)
+
+        # Too short data is an error unless truncation is allowed,
+        # which is reported by the recursive codec walk.
+        if (self._flat_codecs is not None
+                and (allow_truncated or len(data) == self._length)):
+            decoded = self._decode_flat(data,
+                                        decode_choices,
+                                        scaling,
+                                        allow_truncated)
+        else:
+            decoded = self._decode(self._codecs,
+                                   data,
+                                   decode_choices,
+                                   scaling,
+                                   allow_truncated)
+
+        if choice_strings:
+            self._replace_named_signal_values(decoded)
+
+        return decoded
+
+    def create_record(self) -> Record:
+        """Returns a new record for the signals of this message, to be
+        filled by :meth:`decode_into()`.
+
+        """
+
+        if self._record_type is None:
+            self._record_type = create_record_type(self)
+
+        return self._record_type()
+
+    def decode_into(self,
+                    record: Record,
+                    data: bytes,
+                    decode_choices: bool = True,
+                    scaling: bool = True,
+                    allow_truncated: bool = False,
+                    choice_strings: bool = False) -> None:
+        """Decode given data as a message of this type into given record,
+        created by :meth:`create_record()`. The record replaces the
+        dictionary returned by :meth:`decode_simple()`, and the
+        remaining arguments are the same. Reusing the record for
+        several frames avoids creating a new dictionary for each of
+        them.
+
+        Records must be recreated after the message is modified.
+
+        >>> foo = db.get_message_by_name('Foo')
+        >>> record = foo.create_record()
+        >>> foo.decode_into(record, b'\\x01\\x45\\x23\\x00\\x11')
+        >>> record['Fum']
+        5.0
+
+        """
+
+        if self.is_container:
+            raise DecodeError(f'Message "{self.name}" is a container')
+
+        if self._codecs_pending:
+            self._ensure_codecs()
+
+        if type(record) is not self._record_type:
+            raise ValueError(
+                f'The record was not created by message "{self.name}".')
+
+        if self._decoder is None or len(data) < self._length:
+            record._fill(self.decode_simple(data,
+                                            decode_choices,
+                                            scaling,
+                                            allow_truncated,
+                                            choice_strings))
+
+            return
+
+        try:
+            decoder = self._record_decoders[choice_strings]
+        except KeyError:
+            decoder = create_record_decoder(self._codecs, # type: ignore
+                                            self._length,
+                                            record._indices,
+                                            self._name,
+                                            choice_strings)
+            self._record_decoders[choice_strings] = decoder
+
+        if not isinstance(data, bytes):
+            data = memoryview(data)
+
+        decoder(record._values, # type: ignore
+                data[:self._length],
+                decode_choices,
+                scaling)
 
     def decode_container(self,
                          data: bytes,
                          decode_choices: bool = True,
                          scaling: bool = True,
-                         allow_truncated: bool = False) \
+                         allow_truncated: bool = False,
+                         choice_strings: bool = False) \
                          -> ContainerDecodeResultType:
         """Decode given data as a container message.
 
@@ -1148,23 +1645,86 @@ class Message:
         if not self.is_container:
             raise DecodeError(f'Message "{self.name}" is not a container')
 
-        unpacked = self.unpack_container(data, allow_truncated)
+        # The contained messages are decoded from views into given
+        # data instead of copies of it.
+        unpacked = self.unpack_container(cast(bytes, memoryview(data)),
+                                         allow_truncated)
 
         result: ContainerDecodeResultListType = []
 
         for contained_message, contained_data in unpacked:
             if not isinstance(contained_message, Message):
-                result.append((contained_message, contained_data))
+                result.append((contained_message, bytes(contained_data)))
                 continue
 
             decoded = contained_message.decode(contained_data,
                                                decode_choices,
                                                scaling,
-                                               allow_truncated)
+                                               allow_truncated,
+                                               choice_strings=choice_strings)
             result.append((contained_message, decoded)) # type: ignore
 
         return result
 
+    def compile_projection(self, names: Iterable[str]) -> Projection:
+        """Returns a projection decoding only the signals with given names,
+        and the multiplexers they depend on. Unlike when decoding the
+        message, the time needed scales with the number of wanted
+        signals rather than the number of signals in the message.
+
+        A ``KeyError`` is raised if a signal does not exist.
+
+        >>> foo = db.get_message_by_name('Foo')
+        >>> projection = foo.compile_projection(['Fum'])
+        >>> projection.decode(b'\\x01\\x45\\x23\\x00\\x11')
+        {'Fum': 5.0}
+
+        """
+
+        self._ensure_codecs()
+
+        return Projection(self, names)
+
+    def _get_projection(self, names: Iterable[str]) -> Projection:
+        key = tuple(names)
+
+        try:
+            return self._projections[key]
+        except KeyError:
+            projection = self.compile_projection(key)
+            self._projections[key] = projection
+
+            return projection
+
+    def decode_batch(self, payloads: Any, scaling: bool = True) -> Columns:
+        """Decode many frames of this message at once. Returns a dictionary
+        mapping each signal name to a column with its value in every
+        frame.
+
+        `payloads` is either a ``(N, length)`` array of ``uint8`` or
+        a sequence of ``N`` ``bytes`` objects, each at least as long as
+        the message.
+
+        If `scaling` is ``False`` the raw signal values are returned.
+        Choices are never decoded.
+
+        If NumPy is installed the columns are NumPy arrays computed by
+        vectorized operations. Signals of multiplexed messages are
+        masked arrays, masked in frames where the multiplexer selects
+        another branch. Without NumPy the columns are lists, with
+        ``None`` in place of masked values.
+
+        >>> foo = db.get_message_by_name('Foo')
+        >>> foo.decode_batch([b'\\x01\\x45\\x23\\x00\\x11',
+        ...                   b'\\x02\\x45\\x23\\x00\\x11'])
+        {'Bar': array([1, 2]), 'Fum': array([5., 5.])}
+
+        """
+
+        self._ensure_codecs()
+
+        return decode_batch(self, payloads, scaling)
+
     def get_contained_message_by_header_id(self, header_id: int) \
         -> Optional['Message']:
 
@@ -1212,6 +1772,9 @@ class Message:
         True
 
         """
+
+        self._ensure_codecs()
+
         if self._codecs is None:
             raise ValueError('Codec is not initialized.')
 
@@ -1301,16 +1864,115 @@ class Message:
         """
 
         self._check_signal_lengths()
-        self._codecs = self._create_codec()
-        self._signal_tree = self._create_signal_tree(self._codecs)
         self._signal_dict = {signal.name: signal for signal in self._signals}
 
+        if not self._is_copy_of_template():
+            self._template = None
+
         if strict is None:
             strict = self._strict
 
+        if self._lazy_codecs:
+            self._codecs = None
+            self._decoder = None
+            self._string_decoder = None
+            self._record_type = None
+            self._record_decoders = {}
+            self._flat_codecs = None
+            self._projections = {}
+            self._signal_tree = None
+            self._codecs_strict = strict
+            self._codecs_pending = True
+        else:
+            self._create_codecs(strict)
+
+    def _is_copy_of_template(self) -> bool:
+        template = self._template
+
+        if template is None:
+            return False
+
+        return (self._length == template._length
+                and len(self._signals) == len(template._signals)
+                and all(signal is template_signal
+                        for signal, template_signal
+                        in zip(self._signals, template._signals)))
+
+    def _create_codecs(self, strict: bool) -> None:
+        template = self._template
+
+        if template is not None:
+            template._ensure_codecs()
+
+        if template is not None and template._codecs is not None:
+            # The codecs only depend on the signals and the length,
+            # which are the ones of the template.
+            self._codecs = template._codecs
+            self._decoder = template._decoder
+            self._flat_codecs = template._flat_codecs
+            self._signal_tree = template._signal_tree
+        else:
+            self._codecs = self._create_codec()
+            self._decoder = create_decoder(self._codecs,
+                                           self._length,
+                                           self._name)
+            self._flat_codecs = self._create_flat_codecs()
+            self._signal_tree = self._create_signal_tree(self._codecs)
+
+        self._string_decoder = None
+        self._record_type = None
+        self._record_decoders = {}
+        self._projections = {}
+
         if strict:
             message_bits = 8 * self.length * [None]
-            self._check_signal_tree(message_bits, self.signal_tree)
+            self._check_signal_tree(message_bits, self._signal_tree)
+
+    def _ensure_codecs(self) -> None:
+        """Create the codecs of a message with lazy codecs, unless already
+        created. May be called by several threads at the same time.
+
+        """
+
+        if self._codecs_pending:
+            with _CODECS_LOCK:
+                if self._codecs_pending:
+                    self._create_codecs(self._codecs_strict)
+                    self._codecs_pending = False
+
+    def warm_up(self) -> None:
+        """Create the codecs of a message with lazy codecs now instead of
+        when first needed. Does nothing if they are already created.
+
+        """
+
+        self._ensure_codecs()
+
+    def __getstate__(self):
+        # Codecs are not pickled, they are recreated when first needed
+        # after the message is unpickled. Compiled decoders cannot be
+        # pickled anyway.
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state['_codecs'] = None
+        state['_decoder'] = None
+        state['_string_decoder'] = None
+        state['_record_type'] = None
+        state['_record_decoders'] = {}
+        state['_flat_codecs'] = None
+        state['_projections'] = {}
+        state['_signal_tree'] = None
+
+        if not self._codecs_pending:
+            # The message has already been checked when its codecs
+            # were created.
+            state['_codecs_pending'] = True
+            state['_codecs_strict'] = False
+
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
 
     def __repr__(self) -> str:
         return \
@@ -0,0 +1,143 @@
+# Selection of the messages to load from a database.
+
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    FrozenSet,
+    Iterable,
+    Optional,
+)
+
+if TYPE_CHECKING:
+    from .message import Message
+
+
+def _frozenset(values: Optional[Iterable]) -> Optional[FrozenSet]:
+    if values is None:
+        return None
+
+    return frozenset(values)
+
+
+class MessageFilter:
+    """Selects the messages loaded into a database. Other messages are
+    skipped by the format loaders before their signals are created,
+    which makes loading large databases faster and the database
+    smaller.
+
+    `messages` is a list of message names, `frame_ids` a list of frame
+    ids, `nodes` a list of names of nodes sending or receiving the
+    message, and `buses` a list of bus names. A message is loaded if
+    it matches at least one item of each given list. If given,
+    `predicate` is called with each otherwise matching
+    :class:`~cantools.database.can.Message` object once it has been
+    loaded, and the message is skipped if it returns false.
+
+    >>> message_filter = cantools.database.can.MessageFilter(
+    ...     nodes=['BMS'])
+    >>> db = cantools.database.load_file('foo.dbc',
+    ...                                  message_filter=message_filter)
+
+    """
+
+    def __init__(self,
+                 messages: Optional[Iterable[str]] = None,
+                 frame_ids: Optional[Iterable[int]] = None,
+                 nodes: Optional[Iterable[str]] = None,
+                 buses: Optional[Iterable[str]] = None,
+                 predicate: Optional[Callable[['Message'], bool]] = None
+                 ) -> None:
+        self._messages = _frozenset(messages)
+        self._frame_ids = _frozenset(frame_ids)
+        self._nodes = _frozenset(nodes)
+        self._buses = _frozenset(buses)
+        self._predicate = predicate
+
+    @property
+    def messages(self) -> Optional[FrozenSet[str]]:
+        """The names of the selected messages, or ``None`` to not select by
+        name.
+
+        """
+
+        return self._messages
+
+    @property
+    def frame_ids(self) -> Optional[FrozenSet[int]]:
+        """The frame ids of the selected messages, or ``None`` to not select
+        by frame id.
+
+        """
+
+        return self._frame_ids
+
+    @property
+    def nodes(self) -> Optional[FrozenSet[str]]:
+        """The names of the nodes sending or receiving the selected
+        messages, or ``None`` to not select by node.
+
+        """
+
+        return self._nodes
+
+    @property
+    def buses(self) -> Optional[FrozenSet[str]]:
+        """The names of the buses of the selected messages, or ``None`` to not
+        select by bus.
+
+        """
+
+        return self._buses
+
+    @property
+    def predicate(self) -> Optional[Callable[['Message'], bool]]:
+        """The function called with each loaded message, or ``None``.
+
+        """
+
+        return self._predicate
+
+    def match(self,
+              name: str,
+              frame_id: int,
+              bus_name: Optional[str],
+              nodes: Optional[Iterable[str]] = None) -> bool:
+        """Returns ``True`` if a message with given name, frame id and bus
+        name, sent or received by given nodes, should be loaded. The
+        nodes are not checked if `nodes` is ``None``, which format
+        loaders pass when the nodes of a message are not known until
+        it has been loaded. The predicate is not called.
+
+        """
+
+        if self._messages is not None and name not in self._messages:
+            return False
+
+        if self._frame_ids is not None and frame_id not in self._frame_ids:
+            return False
+
+        if self._buses is not None and bus_name not in self._buses:
+            return False
+
+        if self._nodes is not None and nodes is not None:
+            return any(node in self._nodes for node in nodes)
+
+        return True
+
+    def match_message(self, message: 'Message') -> bool:
+        """Returns ``True`` if given loaded message should be kept, calling
+        the predicate if given.
+
+        """
+
+        if self._predicate is None:
+            return True
+
+        return bool(self._predicate(message))
+
+    def __repr__(self) -> str:
+        return (f'message_filter(messages={self._messages!r}, '
+                f'frame_ids={self._frame_ids!r}, '
+                f'nodes={self._nodes!r}, '
+                f'buses={self._buses!r}, '
+                f'predicate={self._predicate!r})')
@@ -14,6 +14,8 @@ class Node:
 
     """
 
+    __slots__ = ('_name', '_comments', '_dbc', '_autosar')
+
     def __init__(self,
                  name: str,
                  comment: Optional[typing.Union[str, Comments]] = None,
@@ -69,7 +71,10 @@ class Node:
 
     @comment.setter
     def comment(self, value: Optional[str]) -> None:
-        self._comment = value
+        if value is None:
+            self._comments = None
+        else:
+            self._comments = {None: value}
 
     @property
     def comments(self) -> Optional[Comments]:
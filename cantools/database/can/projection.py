@@ -0,0 +1,146 @@
+# Decoding of a subset of the signals of a message.
+
+from typing import (
+    Iterable,
+    List,
+    Optional,
+    Set,
+    TYPE_CHECKING,
+)
+
+from .decoder import CompiledDecoder
+from .decoder import create_decoder
+from ..utils import create_encode_decode_formats
+from ...typechecking import Codec, SignalDictType
+
+if TYPE_CHECKING:
+    from .message import Message
+
+
+class Projection:
+    """A subset of the signals of a message, which are decoded without
+    unpacking the other signals of the message. Multiplexer signals
+    selecting any of the wanted signals are unpacked as well, but not
+    part of the decoded result unless wanted.
+
+    Projections are created by :meth:`Message.compile_projection()`
+    and must be recreated if the message is modified.
+
+    """
+
+    def __init__(self, message: "Message", names: Iterable[str]) -> None:
+        self._message = message
+        self._signal_names = list(names)
+
+        for name in self._signal_names:
+            # Raises a KeyError for unknown signals.
+            message.get_signal_by_name(name)
+
+        wanted = set(self._signal_names)
+
+        if message._codecs is None:
+            raise ValueError('Codec is not initialized.')
+
+        self._codec = self._create_codec(message._codecs, wanted)
+        self._hidden_signal_names = [
+            name
+            for name in self._selector_names(self._codec)
+            if name not in wanted
+        ]
+        self._decoder: Optional[CompiledDecoder] = create_decoder(
+            self._codec,
+            message.length,
+            message.name)
+
+    def _create_codec(self, node: Codec, wanted: Set[str]) -> Codec:
+        """Create a copy of given codec node with only the wanted signals
+        and the multiplexers they depend on. All multiplexer ids are
+        kept, so that unknown ids are reported as by the message.
+
+        """
+
+        multiplexers = {}
+
+        for signal, nodes in node['multiplexers'].items():
+            children = {
+                mux: self._create_codec(child, wanted)
+                for mux, child in nodes.items()
+            }
+
+            if any(child['signals'] for child in children.values()):
+                multiplexers[signal] = children
+
+        signals = [
+            signal
+            for signal in node['signals']
+            if signal.name in wanted or signal.name in multiplexers
+        ]
+
+        return {
+            'signals': signals,
+            'formats': create_encode_decode_formats(signals,
+                                                    self._message.length),
+            'multiplexers': multiplexers
+        }
+
+    def _selector_names(self, node: Codec) -> List[str]:
+        names = list(node['multiplexers'])
+
+        for nodes in node['multiplexers'].values():
+            for child in nodes.values():
+                names += self._selector_names(child)
+
+        return names
+
+    @property
+    def message(self) -> "Message":
+        """The message of the projection.
+
+        """
+
+        return self._message
+
+    @property
+    def signal_names(self) -> List[str]:
+        """The names of the decoded signals.
+
+        """
+
+        return self._signal_names
+
+    def decode(self,
+               data: bytes,
+               decode_choices: bool = True,
+               scaling: bool = True,
+               allow_truncated: bool = False) -> SignalDictType:
+        """Decode the wanted signals in given data. Signals in multiplexer
+        branches not selected by the data are not part of the
+        result. The arguments are the same as for
+        :meth:`Message.decode()`.
+
+        >>> projection = db.get_message_by_name('Foo').compile_projection(['Fum'])
+        >>> projection.decode(b'\\x01\\x45\\x23\\x00\\x11')
+        {'Fum': 5.0}
+
+        """
+
+        message = self._message
+
+        if not isinstance(data, bytes):
+            data = memoryview(data)
+
+        data = data[:message.length]
+
+        if self._decoder is not None and len(data) == message.length:
+            decoded = self._decoder(data, decode_choices, scaling)
+        else:
+            decoded = message._decode(self._codec,
+                                      data,
+                                      decode_choices,
+                                      scaling,
+                                      allow_truncated)
+
+        for name in self._hidden_signal_names:
+            decoded.pop(name, None)
+
+        return decoded
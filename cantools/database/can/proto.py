@@ -36,9 +36,22 @@ def type_name(database_name, message_name, signal):
 
     return type_name
 
+def get_proto_message(msg, messages):
+    """Returns the message whose proto message is used for given message,
+    which is its template if it is a copy of another message.
+
+    """
+
+    template = msg.template
+    if template is not None and any(m is template for m in messages):
+        return template
+    return msg
+
 def _generate_enums(database_name, messages):
     s = {}
     for msg in messages:
+        if get_proto_message(msg, messages) is not msg:
+            continue
         for signal in msg.signals:
             if signal.choices is not None:
                 s[f"{database_name}_{msg.name}_{signal.name}".lower()] = signal.choices
@@ -61,6 +74,8 @@ def _generate_enums(database_name, messages):
 def _generate_messages(database_name, messages):
     ret = ""
     for msg in messages:
+        if get_proto_message(msg, messages) is not msg:
+            continue
         ret += f"message {msg.name.upper()}{{\n"
         i = 1
         for signal in msg.signals:
@@ -74,7 +89,8 @@ def _generate_messages(database_name, messages):
 def _generate_pack(database_name, messages):
     ret = "message Pack{\n"
     for i, msg in enumerate(messages):
-        ret += f"\trepeated {msg.name.upper()} {msg.name.upper()} = {i+1};\n"
+        proto_msg = get_proto_message(msg, messages)
+        ret += f"\trepeated {proto_msg.name.upper()} {msg.name.upper()} = {i+1};\n"
     ret += "}\n"
     return ret
 
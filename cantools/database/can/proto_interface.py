@@ -4,6 +4,7 @@ from decimal import Decimal
 from typing import List
 
 from ...version import __version__
+from .proto import get_proto_message
 
 class Signal:
 
@@ -552,10 +553,13 @@ def _generate_deserialize(database_name, messages):
 
 def _generate_serialize(database_name, messages: List[Message]):
     ret = ''
+    database_messages = [msg._message for msg in messages]
     for msg in messages:
         name = msg.name.lower()
-        name_m = name.upper()
         proto_name = name
+        # copies of another message use the proto message of it
+        proto_msg = get_proto_message(msg._message, database_messages)
+        name_m = proto_msg.name.upper()
         
         dev_name = "message"
         if msg.has_conversions:
@@ -567,7 +571,7 @@ def _generate_serialize(database_name, messages: List[Message]):
         signals = ''
         for signal in msg.signals:
             if signal.choices is not None:
-              signals += SERIALIZE_SIGNAL_TYPE.format(name=signal.name.lower(), type=f'{database_name}::{database_name}_{msg.name.lower()}_{signal.name.lower()}')
+              signals += SERIALIZE_SIGNAL_TYPE.format(name=signal.name.lower(), type=f'{database_name}::{database_name}_{proto_msg.name.lower()}_{signal.name.lower()}')
             else:
               signals += SERIALIZE_SIGNAL.format(name=signal.name.lower())
         ret += SERIALIZE_MESSAGE.format(db_name=database_name, id=msg.frame_id, name=name, name_m=name, signals=signals, name_m_U=name_m, dev_name=dev_name, proto_name=proto_name)
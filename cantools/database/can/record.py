@@ -0,0 +1,96 @@
+# Reusable containers of decoded signal values.
+
+from collections.abc import Mapping
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Tuple,
+    Type,
+    TYPE_CHECKING,
+)
+
+from ...typechecking import SignalMappingType
+
+if TYPE_CHECKING:
+    from .message import Message
+
+
+class Record(Mapping):
+    """The signal values of a message, filled in place by
+    :meth:`Message.decode_into()<cantools.database.can.Message.decode_into()>`
+    to avoid creating a new dictionary for every decoded frame.
+
+    Records are created by :meth:`Message.create_record()`, and are
+    read-only mappings of signal names to values. Signal values are
+    also available as attributes. Signals of multiplexer branches not
+    selected by the last decoded frame are not part of the record.
+
+    >>> record = foo.create_record()
+    >>> foo.decode_into(record, b'\\x01\\x45\\x23\\x00\\x11')
+    >>> record['Bar'], record.Fum
+    (1, 5.0)
+
+    """
+
+    __slots__ = ('_values', )
+
+    # Set per message by create_record_type().
+    _names: Tuple[str, ...] = ()
+    _indices: Dict[str, int] = {}
+
+    def __init__(self) -> None:
+        self._values: List[Any] = len(self._names) * [None]
+
+    def _fill(self, decoded: SignalMappingType) -> None:
+        values = self._values
+        indices = self._indices
+        values[:] = len(values) * (None, )
+
+        for name, value in decoded.items():
+            values[indices[name]] = value
+
+    def __getitem__(self, name: str) -> Any:
+        value = self._values[self._indices[name]]
+
+        if value is None:
+            raise KeyError(name)
+
+        return value
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __iter__(self) -> Iterator[str]:
+        for name, value in zip(self._names, self._values):
+            if value is not None:
+                yield name
+
+    def __len__(self) -> int:
+        return len(self._values) - self._values.count(None)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({dict(self)})'
+
+
+def create_record_type(message: "Message") -> Type[Record]:
+    """Create a record class for the signals of given message.
+
+    """
+
+    names = tuple(dict.fromkeys(signal.name for signal in message.signals))
+
+    return type(f'{message.name}Record',
+                (Record, ),
+                {
+                    '__slots__': (),
+                    '_names': names,
+                    '_indices': {name: i for i, name in enumerate(names)}
+                })
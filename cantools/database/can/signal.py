@@ -19,6 +19,8 @@ class Decimal:
 
     """
 
+    __slots__ = ('_scale', '_offset', '_minimum', '_maximum')
+
     def __init__(self,
                  scale: Optional[decimal.Decimal] = None,
                  offset: Optional[decimal.Decimal] = None,
@@ -88,6 +90,8 @@ class NamedSignalValue:
     descriptions for the named value.
     """
 
+    __slots__ = ('_name', '_value', '_comments')
+
     def __init__(self,
                  value: int,
                  name: str,
@@ -95,7 +99,9 @@ class NamedSignalValue:
                  ) -> None:
         self._name = name
         self._value = value
-        self._comments = comments or {}
+
+        # An empty comments dictionary is only created when accessed.
+        self._comments = comments or None
 
     @property
     def name(self) -> str:
@@ -129,6 +135,9 @@ class NamedSignalValue:
 
         """
 
+        if self._comments is None:
+            self._comments = {}
+
         return self._comments
 
     def __str__(self) -> str:
@@ -142,7 +151,7 @@ class NamedSignalValue:
             return \
                 x.value == self.value \
                 and x.name == self.name \
-                and x.comments == self.comments
+                and (x._comments or {}) == (self._comments or {})
         elif isinstance(x, str):
             return x == self.name
 
@@ -185,6 +194,31 @@ class Signal:
 
     """
 
+    __slots__ = (
+        'name',
+        'scale',
+        'offset',
+        'is_float',
+        'minimum',
+        'maximum',
+        'choices',
+        'start',
+        'length',
+        'byte_order',
+        'is_signed',
+        'initial',
+        'invalid',
+        'decimal',
+        'unit',
+        'dbc',
+        'receivers',
+        'is_multiplexer',
+        'multiplexer_ids',
+        'multiplexer_signal',
+        'spn',
+        'comments',
+    )
+
     def __init__(self,
                  name: str,
                  start: int,
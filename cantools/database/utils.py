@@ -13,6 +13,8 @@ from typing import (
     Sequence,
     Literal,
     Final,
+    Hashable,
+    Iterator,
     TYPE_CHECKING,
 )
 
@@ -29,6 +31,7 @@ if TYPE_CHECKING:
     from ..database.can.attribute import Attribute
     from ..database.can.message import Message
     from ..database.can.node import Node
+    from ..database.can.signal import NamedSignalValue
     from ..database.can.signal import Signal
     from ..database.diagnostics import Data
 
@@ -119,10 +122,10 @@ def decode_data(data: bytes,
 
     actual_length = len(data)
     if allow_truncated and actual_length < expected_length:
-        data = data.ljust(expected_length, b"\xFF")
+        data = bytes(data).ljust(expected_length, b"\xFF")
 
     unpacked = {
-        **formats.big_endian.unpack(bytes(data)),
+        **formats.big_endian.unpack(data),
         **formats.little_endian.unpack(bytes(data[::-1])),
     }
 
@@ -334,11 +337,7 @@ def prune_signal_choices(signal: "Signal") -> None:
         if m:
             val = m.group(1)
 
-        if isinstance(choice, str):
-            signal.choices[key] = val
-        else:
-            # assert isinstance(choice, NamedSignalValue)
-            choice._name = val
+        signal.choices[key] = _renamed_choice(choice, val)
         return
 
     # if there are multiple choices, remove the longest common prefix
@@ -381,26 +380,72 @@ def prune_signal_choices(signal: "Signal") -> None:
 
     # remove the prefix from the choice names
     for key, choice in signal.choices.items():
-        if isinstance(choice, str):
-            signal.choices[key] = choice[n:]
-        else:
-            # assert isinstance(choice, NamedSignalValue)
-            choice._name = choice._name[n:]
+        signal.choices[key] = _renamed_choice(choice, str(choice)[n:])
+
+
+def _renamed_choice(choice: Union[str, "NamedSignalValue"],
+                    name: str) -> Union[str, "NamedSignalValue"]:
+    if isinstance(choice, str):
+        return name
+
+    # Named signal values may be shared by several signals, see
+    # share_database_metadata(), so a renamed copy is returned instead
+    # of modifying it.
+    comments = choice._comments
+
+    return type(choice)(choice.value,
+                        name,
+                        dict(comments) if comments else None)
+
+
+def _database_signals(database: "Database") -> Iterator["Signal"]:
+    for message in database.messages:
+        yield from message.signals
+
+        if message.contained_messages is not None:
+            for cm in message.contained_messages:
+                yield from cm.signals
 
 
 def prune_database_choices(database: "Database") -> None:
     '''
     Prune names of all named signal values of all signals of a database
     '''
-    for message in database.messages:
+    for signal in _database_signals(database):
+        prune_signal_choices(signal)
 
-        for signal in message.signals:
-            prune_signal_choices(signal)
 
-        if message.contained_messages is not None:
-            for cm in message.contained_messages:
-                for cs in cm.signals:
-                    prune_signal_choices(cs)
+def _choice_key(choice: Union[int, str, "NamedSignalValue"]) -> Hashable:
+    if isinstance(choice, (int, str)):
+        return (type(choice), choice)
+
+    comments = choice._comments
+
+    return (type(choice),
+            choice.value,
+            choice.name,
+            tuple(comments.items()) if comments else ())
+
+
+def share_database_metadata(database: "Database") -> None:
+    '''
+    Make all signals of a database share equal named signal values and
+    comment strings to reduce the memory used by large databases. Each
+    signal keeps its own choices and comments dictionaries.
+    '''
+    choices: Dict[Hashable, Union[str, NamedSignalValue]] = {}
+    strings: Dict[str, str] = {}
+
+    for signal in _database_signals(database):
+        if signal.choices:
+            for value, choice in signal.choices.items():
+                signal.choices[value] = choices.setdefault(_choice_key(choice),
+                                                           choice)
+
+        if signal.comments:
+            for language, comment in signal.comments.items():
+                signal.comments[language] = strings.setdefault(comment,
+                                                               comment)
 
 
 SORT_SIGNALS_DEFAULT: Final = 'default'
@@ -0,0 +1,358 @@
+# Sidecar indexes of CAN log files.
+#
+# A log file is split into blocks of about BLOCK_SIZE bytes, each
+# starting at the beginning of a line. The index stores the byte
+# offset and the lowest and highest timestamp of each block, and a
+# bitmap of the blocks containing each frame id. Readers only read the
+# blocks which may contain frames in a given time window or with given
+# frame ids, instead of the whole log.
+
+import marshal
+import math
+import mmap
+import os
+import struct
+from array import array
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .errors import Error
+from .logreader import FastParser
+
+MAGIC = b'CANTOOLS LOG INDEX\n'
+
+# Incremented whenever the layout of indexes changes.
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct('>I')
+
+# Default number of bytes per block.
+BLOCK_SIZE = 1024 * 1024
+
+# The index of a log file is stored next to it, with this suffix
+# appended to its name.
+SUFFIX = '.index'
+
+
+def index_filename(filename: str) -> str:
+    """Returns the name of the index file of given log file.
+
+    """
+
+    return os.fspath(filename) + SUFFIX
+
+
+def _file_stamp(filename: str) -> Tuple[int, int]:
+    stat = os.stat(filename)
+
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _bitmap(blocks: List[int]) -> int:
+    bitmap = bytearray((blocks[-1] >> 3) + 1)
+
+    for block in blocks:
+        bitmap[block >> 3] |= 1 << (block & 7)
+
+    return int.from_bytes(bitmap, 'little')
+
+
+class LogIndex:
+    """The index of a CAN log file, as created by :meth:`build()`.
+
+    """
+
+    def __init__(self,
+                 size: int,
+                 mtime_ns: int,
+                 offsets: List[int],
+                 min_timestamps: List[float],
+                 max_timestamps: List[float],
+                 frame_ids: Dict[int, int]) -> None:
+        self.size = size
+        self.mtime_ns = mtime_ns
+        # the offset of each block and the size of the file
+        self.offsets = offsets
+        # NaN for blocks without timestamps
+        self.min_timestamps = min_timestamps
+        self.max_timestamps = max_timestamps
+        # bitmaps of the blocks containing each frame id
+        self.frame_ids = frame_ids
+        self._has_timestamps = not all(map(math.isnan, max_timestamps))
+
+    @property
+    def number_of_blocks(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def start(self) -> Optional[float]:
+        """The lowest timestamp in the log, or ``None`` if it has no
+        timestamps.
+
+        """
+
+        if not self._has_timestamps:
+            return None
+
+        return min(t for t in self.min_timestamps if not math.isnan(t))
+
+    @property
+    def stop(self) -> Optional[float]:
+        """The highest timestamp in the log, or ``None`` if it has no
+        timestamps.
+
+        """
+
+        if not self._has_timestamps:
+            return None
+
+        return max(t for t in self.max_timestamps if not math.isnan(t))
+
+    @classmethod
+    def build(cls, filename: str, block_size: int = BLOCK_SIZE) -> 'LogIndex':
+        """Read given log file and return its index. Blocks are at least
+        `block_size` bytes long, except the last one.
+
+        """
+
+        if block_size < 1:
+            raise Error(f'Invalid block size {block_size}.')
+
+        size, mtime_ns = _file_stamp(filename)
+        offsets: List[int] = []
+        min_timestamps: List[float] = []
+        max_timestamps: List[float] = []
+        blocks_by_frame_id: Dict[int, List[int]] = {}
+        parser = FastParser()
+        parse = parser.parse
+
+        # mmap() refuses empty files, which have no blocks anyway.
+        if size > 0:
+            with open(filename, 'rb') as fin, \
+                 mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                start = 0
+
+                while start < size:
+                    end = data.find(b'\n', start + block_size - 1)
+                    end = size if end == -1 else end + 1
+                    block = len(offsets)
+                    frame_ids = set()
+                    timestamps = []
+
+                    for line in data[start:end].split(b'\n'):
+                        frame = parse(line)
+
+                        if frame is None:
+                            continue
+
+                        frame_ids.add(frame.frame_id)
+
+                        if frame.timestamp is not None:
+                            timestamps.append(frame.timestamp)
+
+                    for frame_id in frame_ids:
+                        blocks_by_frame_id.setdefault(frame_id, []).append(block)
+
+                    offsets.append(start)
+                    min_timestamps.append(min(timestamps, default=math.nan))
+                    max_timestamps.append(max(timestamps, default=math.nan))
+                    start = end
+
+        offsets.append(size)
+
+        return cls(size,
+                   mtime_ns,
+                   offsets,
+                   min_timestamps,
+                   max_timestamps,
+                   {frame_id: _bitmap(blocks)
+                    for frame_id, blocks in blocks_by_frame_id.items()})
+
+    def dump_bytes(self) -> bytes:
+        """Returns the index as bytes, as read by :meth:`load_bytes()`.
+
+        """
+
+        return (MAGIC
+                + HEADER.pack(FORMAT_VERSION)
+                + marshal.dumps((self.size,
+                                 self.mtime_ns,
+                                 array('q', self.offsets).tobytes(),
+                                 array('d', self.min_timestamps).tobytes(),
+                                 array('d', self.max_timestamps).tobytes(),
+                                 self.frame_ids)))
+
+    @classmethod
+    def load_bytes(cls, data: bytes) -> 'LogIndex':
+        """Returns the index in given data, as returned by
+        :meth:`dump_bytes()`.
+
+        """
+
+        if data[:len(MAGIC)] != MAGIC:
+            raise Error('Invalid log index.')
+
+        offset = len(MAGIC)
+
+        try:
+            format_version, = HEADER.unpack_from(data, offset)
+        except struct.error:
+            raise Error('Invalid log index.') from None
+
+        if format_version != FORMAT_VERSION:
+            raise Error(
+                f'Unsupported log index format version {format_version}.')
+
+        try:
+            (size,
+             mtime_ns,
+             offsets,
+             min_timestamps,
+             max_timestamps,
+             frame_ids) = marshal.loads(data[offset + HEADER.size:])
+        except (EOFError, ValueError, TypeError):
+            raise Error('Invalid log index.') from None
+
+        return cls(size,
+                   mtime_ns,
+                   array('q', offsets).tolist(),
+                   array('d', min_timestamps).tolist(),
+                   array('d', max_timestamps).tolist(),
+                   frame_ids)
+
+    def save(self, filename: str) -> None:
+        """Write the index of given log file to its index file.
+
+        """
+
+        with open(index_filename(filename), 'wb') as fout:
+            fout.write(self.dump_bytes())
+
+    @classmethod
+    def load(cls, filename: str) -> Optional['LogIndex']:
+        """Returns the index of given log file read from its index file,
+        or ``None`` if there is no index or if the log file has been
+        modified since the index was built.
+
+        """
+
+        try:
+            with open(index_filename(filename), 'rb') as fin:
+                data = fin.read()
+        except FileNotFoundError:
+            return None
+
+        index = cls.load_bytes(data)
+
+        if not index.is_up_to_date(filename):
+            return None
+
+        return index
+
+    def is_up_to_date(self, filename: str) -> bool:
+        """Returns ``True`` if given log file has not been modified since
+        the index was built.
+
+        """
+
+        return _file_stamp(filename) == (self.size, self.mtime_ns)
+
+    def blocks(self,
+               start: Optional[float] = None,
+               stop: Optional[float] = None,
+               frame_ids: Optional[Iterable[int]] = None) -> int:
+        """Returns a bitmap of the blocks which may contain frames with
+        timestamps from `start` to `stop` and with any of given frame
+        ids. Timestamps are in seconds, as in
+        :class:`~cantools.logreader.LogFrame`. The time window is
+        ignored if the log has no timestamps.
+
+        """
+
+        number_of_blocks = self.number_of_blocks
+        blocks = (1 << number_of_blocks) - 1
+
+        if frame_ids is not None:
+            selected = 0
+
+            for frame_id in frame_ids:
+                selected |= self.frame_ids.get(frame_id, 0)
+
+            blocks &= selected
+
+        if (start is not None or stop is not None) and self._has_timestamps:
+            if start is None:
+                start = -math.inf
+
+            if stop is None:
+                stop = math.inf
+
+            selected = 0
+
+            for block in range(number_of_blocks):
+                # comparisons with NaN are false
+                if (self.max_timestamps[block] >= start
+                    and self.min_timestamps[block] <= stop):
+                    selected |= 1 << block
+
+            blocks &= selected
+
+        return blocks
+
+    def ranges(self,
+               start: Optional[float] = None,
+               stop: Optional[float] = None,
+               frame_ids: Optional[Iterable[int]] = None
+               ) -> List[Tuple[int, int]]:
+        """Returns the byte ranges of the log file as (begin, end) tuples
+        which may contain frames with timestamps from `start` to `stop`
+        and with any of given frame ids. Adjacent blocks are merged
+        into one range. See :meth:`blocks()`.
+
+        """
+
+        blocks = self.blocks(start, stop, frame_ids)
+        offsets = self.offsets
+        ranges: List[Tuple[int, int]] = []
+        block = 0
+
+        while blocks:
+            # skip unselected blocks, then take the selected ones
+            skipped = (blocks & -blocks).bit_length() - 1
+            blocks >>= skipped
+            block += skipped
+            taken = (~blocks & (blocks + 1)).bit_length() - 1
+            blocks >>= taken
+            ranges.append((offsets[block], offsets[block + taken]))
+            block += taken
+
+        return ranges
+
+
+def iter_range_lines(stream: BinaryIO,
+                     ranges: Iterable[Tuple[int, int]],
+                     chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+    """Yields the lines of given byte ranges of given binary stream,
+    without line endings. The ranges must start at the beginning of
+    lines, as returned by :meth:`LogIndex.ranges()`.
+
+    """
+
+    for begin, end in ranges:
+        stream.seek(begin)
+        rest = b''
+
+        while begin < end:
+            chunk = stream.read(min(chunk_size, end - begin))
+
+            if not chunk:
+                break
+
+            begin += len(chunk)
+            lines = (rest + chunk).split(b'\n')
+            rest = lines.pop()
+
+            for line in lines:
+                yield line.rstrip(b'\r')
+
+        if rest:
+            yield rest.rstrip(b'\r')
@@ -2,6 +2,18 @@ import re
 import enum
 import binascii
 import datetime
+from typing import (
+    Any,
+    Callable,
+    Container,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    cast,
+)
 
 
 class TimestampFormat(enum.Enum):
@@ -308,9 +320,29 @@ class Parser:
                 print(f'{frame.timestamp}: {frame.frame_id}')
     """
 
-    def __init__(self, stream=None):
+    def __init__(self, stream=None, index=None, start=None, stop=None,
+                 frame_id_filter=None):
+        """If `start` or `stop` are given, only frames with timestamps from
+        `start` to `stop` seconds are returned, as in
+        :class:`LogFrame`. Frames without timestamps are always
+        returned.
+
+        If `frame_id_filter` is given, only frames with frame ids in
+        it are returned. It is a set of frame ids, or any other object
+        supporting ``in``. The frame id field is extracted from each
+        line before matching it with the regular expression of the
+        format, and other lines are skipped without being parsed.
+
+        If `index` is a :class:`~cantools.logindex.LogIndex` of the log
+        file, only the parts of the file which may contain such frames
+        are read. The stream must then be seekable.
+        """
         self.stream = stream
         self.pattern = None
+        self.index = index
+        self.start = start
+        self.stop = stop
+        self.frame_id_filter = frame_id_filter
 
     @staticmethod
     def detect_pattern(line):
@@ -326,21 +358,79 @@ class Parser:
             return None
         return self.pattern.match(line)
 
+    def _readlines(self):
+        while True:
+            nl = self.stream.readline()
+            if nl == '':
+                return
+            yield nl.strip('\r\n')
+
+    def _read_index_lines(self):
+        from .logindex import iter_range_lines
+
+        stream = getattr(self.stream, 'buffer', self.stream)
+        frame_ids = self.frame_id_filter
+
+        if not isinstance(frame_ids, (set, frozenset)):
+            frame_ids = None
+
+        ranges = self.index.ranges(self.start, self.stop, frame_ids)
+
+        for line in iter_range_lines(stream, ranges):
+            yield line.decode('utf-8', 'replace')
+
+    def is_filtered_out(self, line):
+        """Returns ``True`` if given line is a frame with a frame id not in
+        the frame id filter. Only the frame id field of the line is
+        extracted, so lines which are not frames may also be filtered
+        out. The format is detected if not yet known.
+        """
+        if self.frame_id_filter is None:
+            return False
+        if self.pattern is None:
+            self.pattern = self.detect_pattern(line)
+            if self.pattern is None:
+                return False
+        frame_id = _frame_id(self.pattern, line.split(), '#')
+        return frame_id is not None and frame_id not in self.frame_id_filter
+
+    def _is_in_time_window(self, frame):
+        timestamp = _timestamp_seconds(frame)
+
+        if timestamp is None:
+            return True
+
+        if self.start is not None and timestamp < self.start:
+            return False
+
+        return self.stop is None or timestamp <= self.stop
+
     def iterlines(self, keep_unknowns=False):
         """Returns an generator that yields (str, DataFrame) tuples with the
         raw log entry and a parsed log entry. If keep_unknowns=True, (str,
         None) tuples will be returned for log entries that couldn't be decoded.
         If keep_unknowns=False, non-parseable log entries is discarded.
+        Frames outside of the time window or not selected by the frame
+        id filter are discarded.
         """
         if self.stream is None:
             return
-        while True:
-            nl = self.stream.readline()
-            if nl == '':
-                return
-            nl = nl.strip('\r\n')
+        if self.index is None:
+            lines = self._readlines()
+        else:
+            lines = self._read_index_lines()
+        has_time_window = self.start is not None or self.stop is not None
+        frame_id_filter = self.frame_id_filter
+        for nl in lines:
+            if frame_id_filter is not None and self.is_filtered_out(nl):
+                continue
             frame = self.parse(nl)
             if frame:
+                if has_time_window and not self._is_in_time_window(frame):
+                    continue
+                if (frame_id_filter is not None
+                    and frame.frame_id not in frame_id_filter):
+                    continue
                 yield nl, frame
             elif keep_unknowns:
                 yield nl, None
@@ -352,3 +442,477 @@ class Parser:
         discarded."""
         for _, frame in self.iterlines():
             yield frame
+
+
+class LogFrame:
+    """A CAN frame read by :class:`FastParser`.
+
+    Unlike :class:`DataFrame` the timestamp is a float, which is the
+    number of seconds since the epoch if the timestamp format is
+    ABSOLUTE, the number of seconds since start of log or since the
+    last frame if it is RELATIVE, and ``None`` if it is MISSING.
+    """
+
+    __slots__ = ('channel', 'frame_id', 'data', 'timestamp', 'timestamp_format')
+
+    def __init__(self, channel: str,
+                 frame_id: int,
+                 data: bytes,
+                 timestamp: Optional[float],
+                 timestamp_format: TimestampFormat):
+        self.channel = channel
+        self.frame_id = frame_id
+        self.data = data
+        self.timestamp = timestamp
+        self.timestamp_format = timestamp_format
+
+    @classmethod
+    def from_data_frame(cls, frame: DataFrame) -> 'LogFrame':
+        return cls(frame.channel,
+                   frame.frame_id,
+                   frame.data,
+                   _timestamp_seconds(frame),
+                   frame.timestamp_format)
+
+    def to_data_frame(self) -> DataFrame:
+        """Returns the frame as a :class:`DataFrame`, as parsed by
+        :class:`Parser`.
+        """
+        timestamp: Any = self.timestamp
+
+        if self.timestamp_format == TimestampFormat.ABSOLUTE:
+            timestamp = datetime.datetime.utcfromtimestamp(timestamp)
+        elif self.timestamp_format == TimestampFormat.RELATIVE:
+            timestamp = datetime.timedelta(seconds=timestamp)
+
+        return DataFrame(channel=self.channel,
+                         frame_id=self.frame_id,
+                         data=self.data,
+                         timestamp=timestamp,
+                         timestamp_format=self.timestamp_format)
+
+    def __repr__(self):
+        return (f'LogFrame({self.channel!r}, 0x{self.frame_id:x}, '
+                f'{self.data!r}, {self.timestamp!r}, {self.timestamp_format})')
+
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def _timestamp_seconds(frame: DataFrame) -> Optional[float]:
+    # The timestamp of given frame as in LogFrame.
+    if frame.timestamp_format == TimestampFormat.ABSOLUTE:
+        return (frame.timestamp - _EPOCH).total_seconds()
+    elif frame.timestamp_format == TimestampFormat.RELATIVE:
+        return cast(datetime.timedelta, frame.timestamp).total_seconds()
+    else:
+        return None
+
+# Channel names by their bytes, to not decode the same names over and
+# over again.
+_CHANNELS: Dict[bytes, str] = {}
+
+
+def _channel(name: bytes) -> str:
+    try:
+        return _CHANNELS[name]
+    except KeyError:
+        return _CHANNELS.setdefault(name, name.decode())
+
+
+def _candump_frame(tokens: List[bytes],
+                   index: int,
+                   timestamp: Optional[float],
+                   timestamp_format: TimestampFormat) -> LogFrame:
+    # <channel> <can_id> [<length>] <data bytes> ...
+    length = tokens[index + 2]
+
+    if length[:1] != b'[':
+        raise ValueError
+
+    end = index + 3 + int(length[1:-1])
+
+    return LogFrame(_channel(tokens[index]),
+                    int(tokens[index + 1], 16),
+                    binascii.unhexlify(b''.join(tokens[index + 3:end])),
+                    timestamp,
+                    timestamp_format)
+
+
+def _parse_candump_default(tokens: List[bytes]) -> LogFrame:
+    return _candump_frame(tokens, 0, None, TimestampFormat.MISSING)
+
+
+def _parse_candump_timestamped(tokens: List[bytes]) -> LogFrame:
+    timestamp = tokens[0]
+
+    if timestamp[:1] != b'(':
+        raise ValueError
+
+    seconds = float(timestamp[1:-1])
+
+    if seconds < 662688000:
+        timestamp_format = TimestampFormat.RELATIVE
+    else:
+        timestamp_format = TimestampFormat.ABSOLUTE
+
+    return _candump_frame(tokens, 1, seconds, timestamp_format)
+
+
+def _parse_candump_log(tokens: List[bytes]) -> LogFrame:
+    # (<timestamp>) <channel> <can_id>#<data> or <can_id>##<flags><data>
+    timestamp, channel, frame = tokens
+
+    if timestamp[:1] != b'(':
+        raise ValueError
+
+    can_id, _, data = frame.partition(b'#')
+
+    if data[:1] == b'#':
+        data = data[2:]
+
+    return LogFrame(_channel(channel),
+                    int(can_id, 16),
+                    binascii.unhexlify(data),
+                    float(timestamp[1:-1]),
+                    TimestampFormat.ABSOLUTE)
+
+
+def _pcan_frame(tokens: List[bytes],
+                channel: str,
+                can_id_index: int,
+                dlc_index: int) -> LogFrame:
+    # The data bytes are the remaining tokens.
+    start = dlc_index + 1
+
+    if len(tokens) != start + int(tokens[dlc_index]):
+        raise ValueError
+
+    return LogFrame(channel,
+                    int(tokens[can_id_index], 16),
+                    binascii.unhexlify(b''.join(tokens[start:])),
+                    float(tokens[1]) / 1000,
+                    TimestampFormat.RELATIVE)
+
+
+def _pcan_channel(bus: bytes) -> str:
+    return _channel(b'pcan' + bus)
+
+
+def _parse_pcan_trace_v10(tokens: List[bytes]) -> LogFrame:
+    # 1) 1841 0001 8 00 00 00 00 00 00 00 00
+    return _pcan_frame(tokens, 'pcanx', 2, 3)
+
+
+def _parse_pcan_trace_v11(tokens: List[bytes]) -> LogFrame:
+    # 1)      6357.2 Rx        0401  8    00 00 00 00 00 00 00 00
+    return _pcan_frame(tokens, 'pcanx', 3, 4)
+
+
+def _parse_pcan_trace_v12(tokens: List[bytes]) -> LogFrame:
+    # 1)      6357.213 1  Rx        0401  8    00 00 00 00 00 00 00 00
+    return _pcan_frame(tokens, _pcan_channel(tokens[2]), 4, 5)
+
+
+def _parse_pcan_trace_v13(tokens: List[bytes]) -> LogFrame:
+    # 1)      6357.213 1  Rx        0401 -  8    00 00 00 00 00 00 00 00
+    return _pcan_frame(tokens, _pcan_channel(tokens[2]), 4, 6)
+
+
+def _parse_pcan_trace_v20(tokens: List[bytes]) -> LogFrame:
+    # 1      1059.900 DT 0300 Rx 7 00 00 00 00 04 00 00
+    return _pcan_frame(tokens, 'pcanx', 3, 5)
+
+
+def _parse_pcan_trace_v21(tokens: List[bytes]) -> LogFrame:
+    # 1      1059.900 DT 1 0300 Rx - 7 00 00 00 00 04 00 00
+    return _pcan_frame(tokens, _pcan_channel(tokens[3]), 4, 7)
+
+
+# Functions extracting the fields of the whitespace separated tokens of
+# a line of given format. They raise an exception if the line is not
+# as expected, in which case the line is matched with the regular
+# expression of the format instead.
+_TOKEN_PARSERS: Dict[type, Callable[[List[bytes]], LogFrame]] = {
+    CandumpDefaultPattern: _parse_candump_default,
+    CandumpTimestampedPattern: _parse_candump_timestamped,
+    CandumpDefaultLogPattern: _parse_candump_log,
+    PCANTracePatternV10: _parse_pcan_trace_v10,
+    PCANTracePatternV11: _parse_pcan_trace_v11,
+    PCANTracePatternV12: _parse_pcan_trace_v12,
+    PCANTracePatternV13: _parse_pcan_trace_v13,
+    PCANTracePatternV20: _parse_pcan_trace_v20,
+    PCANTracePatternV21: _parse_pcan_trace_v21,
+}
+
+
+def _pcan_frame_id_field(tokens: List[Any],
+                         can_id_index: int,
+                         dlc_index: int) -> Any:
+    if len(tokens) != dlc_index + 1 + int(tokens[dlc_index]):
+        raise ValueError
+
+    return tokens[can_id_index]
+
+
+# Functions returning the frame id field of the whitespace separated
+# tokens of a line of given format, as str or bytes as the line. The
+# second argument is '#' of the same type.
+_FRAME_ID_FIELDS: Dict[type, Callable[[List[Any], Any], Any]] = {
+    CandumpDefaultPattern: lambda tokens, _: tokens[1],
+    CandumpTimestampedPattern: lambda tokens, _: tokens[2],
+    CandumpDefaultLogPattern: lambda tokens, sharp: tokens[2].partition(sharp)[0],
+    CandumpAbsoluteLogPattern: lambda tokens, _: tokens[3],
+    PCANTracePatternV10: lambda tokens, _: _pcan_frame_id_field(tokens, 2, 3),
+    PCANTracePatternV11: lambda tokens, _: _pcan_frame_id_field(tokens, 3, 4),
+    PCANTracePatternV12: lambda tokens, _: _pcan_frame_id_field(tokens, 4, 5),
+    PCANTracePatternV13: lambda tokens, _: _pcan_frame_id_field(tokens, 4, 6),
+    PCANTracePatternV20: lambda tokens, _: _pcan_frame_id_field(tokens, 3, 5),
+    PCANTracePatternV21: lambda tokens, _: _pcan_frame_id_field(tokens, 4, 7),
+}
+
+
+def _frame_id(pattern: type, tokens: List[Any], sharp: Any) -> Optional[int]:
+    """Returns the frame id of the line of given pattern with given
+    tokens, or ``None`` if it is not found where expected.
+
+    """
+
+    try:
+        return int(_FRAME_ID_FIELDS[pattern](tokens, sharp), 16)
+    except (KeyError, ValueError, IndexError):
+        return None
+
+
+# Returned by FastParser._parse() for frames not selected by the frame
+# id filter.
+_FILTERED_OUT = object()
+
+
+def _parse_unsupported(tokens: List[bytes]) -> LogFrame:
+    # Lines of formats without token parser are matched with the
+    # regular expression of their format.
+    raise ValueError
+
+
+class FastParser:
+    """A CAN log file parser for large log files.
+
+    It reads given binary stream in chunks of `chunk_size` bytes and
+    splits them into lines, instead of reading it line by line. The
+    fields of candump and PCAN trace lines are extracted from their
+    whitespace separated tokens instead of by matching regular
+    expressions. Frames are returned as :class:`LogFrame` objects
+    with float timestamps, as creating datetime objects is slow. Use
+    :meth:`LogFrame.to_data_frame()` to convert them.
+
+    The format of the log file is detected as by :class:`Parser`, unless
+    given as the pattern class `pattern`. Lines not parsed by the
+    specialized code are matched with the regular expression of the
+    format, so both parsers return the same frames. Frames are
+    filtered by `frame_id_filter` as by :class:`Parser`.
+
+    >>> with open('candump.log', 'rb') as fd: #doctest: +SKIP
+            for frame in cantools.logreader.FastParser(fd):
+                print(f'{frame.timestamp}: {frame.frame_id}')
+    """
+
+    def __init__(self,
+                 stream: Any = None,
+                 chunk_size: int = 1024 * 1024,
+                 pattern: Optional[type] = None,
+                 frame_id_filter: Optional[Container[int]] = None) -> None:
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.pattern: Optional[Any] = None
+        self.frame_id_filter = frame_id_filter
+        self._parse_tokens: Optional[Callable[[List[bytes]], LogFrame]] = None
+
+        if pattern is not None:
+            self._use_pattern(pattern)
+
+    def _use_pattern(self, pattern: type) -> None:
+        self.pattern = pattern
+        self._parse_tokens = _TOKEN_PARSERS.get(pattern, _parse_unsupported)
+
+    def _set_pattern(self, line: bytes) -> None:
+        pattern = Parser.detect_pattern(self._decode(line))
+
+        if pattern is not None:
+            self._use_pattern(pattern)
+
+    @staticmethod
+    def _decode(line: bytes) -> str:
+        return line.decode('utf-8', 'replace').strip('\r\n')
+
+    def _match(self, line: bytes) -> Optional[LogFrame]:
+        assert self.pattern is not None
+        frame = self.pattern.match(self._decode(line))
+
+        if frame is None:
+            return None
+
+        return LogFrame.from_data_frame(frame)
+
+    def parse(self, line: bytes) -> Optional[LogFrame]:
+        """Returns the frame in given line, or ``None`` if the line is not a
+        frame or a frame not selected by the frame id filter.
+        """
+        frame = self._parse(line)
+
+        if frame is _FILTERED_OUT:
+            return None
+
+        return cast(Optional[LogFrame], frame)
+
+    def _parse(self, line: bytes) -> Any:
+        if self.pattern is None:
+            self._set_pattern(line)
+
+            if self.pattern is None:
+                return None
+
+        tokens = line.split()
+        frame_id_filter = self.frame_id_filter
+
+        if frame_id_filter is not None:
+            frame_id = _frame_id(self.pattern, tokens, b'#')
+
+            if frame_id is not None and frame_id not in frame_id_filter:
+                return _FILTERED_OUT
+
+        assert self._parse_tokens is not None
+
+        try:
+            frame: Optional[LogFrame] = self._parse_tokens(tokens)
+        except (ValueError, IndexError):
+            frame = self._match(line)
+
+        if (frame is not None
+            and frame_id_filter is not None
+            and frame.frame_id not in frame_id_filter):
+            return _FILTERED_OUT
+
+        return frame
+
+    def iterchunks(self) -> Iterator[bytes]:
+        """Returns a generator that yields chunks of the stream, each with
+        complete lines without the newline after the last one.
+        """
+        if self.stream is None:
+            return
+
+        stream = self.stream
+        readinto = getattr(stream, 'readinto', None)
+        buffer = bytearray(self.chunk_size)
+        view = memoryview(buffer)
+        rest = b''
+
+        while True:
+            if readinto is not None:
+                size = readinto(buffer)
+            else:
+                # a stream without readinto(), e.g. a text stream
+                data = stream.read(self.chunk_size)
+
+                if isinstance(data, str):
+                    data = data.encode()
+
+                size = len(data)
+                buffer[:size] = data
+
+            if not size:
+                break
+
+            end = buffer.rfind(b'\n', 0, size)
+
+            if end == -1:
+                rest += view[:size]
+                continue
+
+            yield rest + view[:end]
+            rest = bytes(view[end + 1:size])
+
+        if rest:
+            yield rest
+
+    def iterlines(self,
+                  keep_unknowns: bool = False
+                  ) -> Iterator[Tuple[bytes, Optional[LogFrame]]]:
+        """Returns an generator that yields (bytes, LogFrame) tuples with
+        the raw log entry and a parsed log entry. If
+        keep_unknowns=True, (bytes, None) tuples will be returned for
+        log entries that couldn't be decoded. If keep_unknowns=False,
+        non-parseable log entries is discarded.
+        """
+        for chunk in self.iterchunks():
+            yield from self.parse_lines(chunk.split(b'\n'), keep_unknowns)
+
+    def parse_lines(self,
+                    lines: Iterable[bytes],
+                    keep_unknowns: bool = False
+                    ) -> Iterator[Tuple[bytes, Optional[LogFrame]]]:
+        """Returns a generator that yields (bytes, LogFrame) tuples for given
+        lines, as :meth:`iterlines()` for the lines of the stream.
+        """
+        parse = self._parse
+
+        for line in lines:
+            if line[-1:] == b'\r':
+                line = line[:-1]
+
+            frame = parse(line)
+
+            if frame is _FILTERED_OUT:
+                continue
+
+            if frame is not None:
+                yield line, frame
+            elif keep_unknowns:
+                yield line, None
+
+    def __iter__(self) -> Iterator[LogFrame]:
+        """Returns LogFrame log entries. Non-parseable log entries is
+        discarded."""
+        if self.frame_id_filter is not None:
+            for _, frame in self.iterlines():
+                assert frame is not None
+                yield frame
+
+            return
+
+        for chunk in self.iterchunks():
+            lines = chunk.split(b'\n')
+
+            if self.pattern is None:
+                yield from self._iter_until_pattern(lines)
+                continue
+
+            yield from self._iter_lines(lines)
+
+    def _iter_until_pattern(self, lines: List[bytes]) -> Iterator[LogFrame]:
+        for index, line in enumerate(lines):
+            frame = self.parse(line)
+
+            if frame is not None:
+                yield frame
+
+            if self.pattern is not None:
+                yield from self._iter_lines(lines[index + 1:])
+                break
+
+    def _iter_lines(self, lines: List[bytes]) -> Iterator[LogFrame]:
+        parse_tokens = self._parse_tokens
+        match = self._match
+        assert parse_tokens is not None
+
+        for line in lines:
+            try:
+                frame = parse_tokens(line.split())
+            except (ValueError, IndexError):
+                unknown = match(line)
+
+                if unknown is not None:
+                    yield unknown
+            else:
+                yield frame
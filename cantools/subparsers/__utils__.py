@@ -1,8 +1,11 @@
 from ..database.can.database import Database
 from ..database.can.message import Message
 from ..database.can.signal import NamedSignalValue
+from ..errors import Error
 
 from typing import (
+    FrozenSet,
+    Optional,
     Union,
     Iterable,
 )
@@ -199,3 +202,44 @@ def format_multiplexed_name(message : Message,
                 result.append('0')
 
     return '__'.join(result)
+
+def parse_frame_id_filter(dbase : Database,
+                          frame_ids : Optional[str],
+                          messages : Optional[str],
+                          frame_id_mask : Optional[int] = None
+                          ) -> Optional[FrozenSet[int]]:
+    """Returns the frame ids selected by given comma separated frame ids
+    and message names, or ``None`` if neither is given.
+
+    """
+
+    if frame_ids is None and messages is None:
+        return None
+
+    selected = set()
+
+    for frame_id in (frame_ids or '').split(','):
+        if not frame_id:
+            continue
+
+        try:
+            selected.add(int(frame_id, 0))
+        except ValueError:
+            raise Error(f"Invalid frame id '{frame_id}'.") from None
+
+    if messages is not None:
+        # Frame ids in the log file may differ from those in the
+        # database in masked bits.
+        if frame_id_mask is not None:
+            raise Error('--messages cannot be used with --frame-id-mask.')
+
+        for name in messages.split(','):
+            if not name:
+                continue
+
+            try:
+                selected.add(dbase.get_message_by_name(name).frame_id)
+            except KeyError:
+                raise Error(f"Unknown message '{name}'.") from None
+
+    return frozenset(selected)
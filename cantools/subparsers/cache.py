@@ -0,0 +1,78 @@
+import argparse
+
+from .. import database
+from ..database import cache
+
+
+def _do_info(args):
+    cache_info = cache.info(args.cache_dir)
+
+    print(f'Databases:  {cache_info["databases"]}')
+    print(f'Digests:    {cache_info["digests"]}')
+    print(f'Size:       {cache_info["size"]} bytes')
+    print(f'Size limit: {cache_info["size_limit"]} bytes')
+
+
+def _do_clear(args):
+    cache.clear(args.cache_dir)
+
+
+def _do_warm(args):
+    for filename in args.infiles:
+        database.load_file(filename,
+                           encoding=args.encoding,
+                           prune_choices=args.prune,
+                           strict=not args.no_strict,
+                           cache_dir=args.cache_dir)
+
+
+def add_subparser(subparsers):
+    cache_parser = subparsers.add_parser(
+        'cache',
+        description='Manage a cache of loaded databases.',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    cache_subparsers = cache_parser.add_subparsers(title='subcommands',
+                                                   dest='cache_subcommand')
+    cache_subparsers.required = True
+
+    info_parser = cache_subparsers.add_parser(
+        'info',
+        description='Print the number of entries and the size of the cache.')
+    info_parser.add_argument(
+        'cache_dir',
+        help='Cache directory.')
+    info_parser.set_defaults(func=_do_info)
+
+    clear_parser = cache_subparsers.add_parser(
+        'clear',
+        description='Remove all entries of the cache.')
+    clear_parser.add_argument(
+        'cache_dir',
+        help='Cache directory.')
+    clear_parser.set_defaults(func=_do_clear)
+
+    warm_parser = cache_subparsers.add_parser(
+        'warm',
+        description=('Load given database files into the cache. Databases '
+                     'are only found in the cache when later loaded with '
+                     'the same options.'),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    warm_parser.add_argument(
+        '-e', '--encoding',
+        help='File encoding.')
+    warm_parser.add_argument(
+        '--prune',
+        action='store_true',
+        help='Try to shorten the names of named signal choices.')
+    warm_parser.add_argument(
+        '--no-strict',
+        action='store_true',
+        help='Skip database consistency checks.')
+    warm_parser.add_argument(
+        'cache_dir',
+        help='Cache directory.')
+    warm_parser.add_argument(
+        'infiles',
+        nargs='+',
+        help='Database files.')
+    warm_parser.set_defaults(func=_do_warm)
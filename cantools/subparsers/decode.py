@@ -1,41 +1,252 @@
 import argparse
+import mmap
+import os
 import sys
 import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from argparse_addons import Integer
 
 from .. import database
 from .. import logreader
-from .__utils__ import format_message_by_frame_id
+from ..logindex import LogIndex
+from ..database.can.formats import cdb
+from ..errors import Error
+from .__utils__ import format_message_by_frame_id, parse_frame_id_filter
 
 logging.basicConfig(level=logging.WARNING)
 
+# Maximum number of bytes of the log file decoded by a worker process
+# at a time.
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# The database and options of a worker process.
+_worker_args = None
+_worker_database = None
+_worker_frame_id_filter = None
+
+
+def _format_line(dbase, args, line, frame):
+    if frame is not None:
+        line += ' ::'
+        line += format_message_by_frame_id(dbase,
+                                           frame.frame_id,
+                                           frame.data,
+                                           not args.no_decode_choices,
+                                           args.single_line,
+                                           not args.no_decode_containers)
+
+    return line
+
+
+def _selects_frames(args, frame_id_filter):
+    """Returns ``True`` if only frames in a time window or with selected
+    frame ids are decoded. Lines which are not frames are then not
+    printed, as which of them are read depends on whether the log file
+    has an index.
+
+    """
+
+    return (args.start is not None
+            or args.stop is not None
+            or frame_id_filter is not None)
+
+
+def _decode_lines(args, dbase, parser, frame_id_filter):
+    keep_unknowns = not _selects_frames(args, frame_id_filter)
+
+    for line, frame in parser.iterlines(keep_unknowns=keep_unknowns):
+        print(_format_line(dbase, args, line, frame))
+
+
+def _init_worker(args, data, frame_id_filter):
+    global _worker_args
+    global _worker_database
+    global _worker_frame_id_filter
+
+    _worker_args = args
+    _worker_database = cdb.load_bytes(data)
+    _worker_frame_id_filter = frame_id_filter
+
+
+def _decode_chunk(filename, start, end, pattern):
+    """Decode the lines of given byte range of given log file and return
+    the output.
+
+    """
+
+    with open(filename, 'rb') as fin:
+        with mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            chunk = mm[start:end]
+
+    if chunk.endswith(b'\n'):
+        chunk = chunk[:-1]
+
+    parser = logreader.FastParser(pattern=pattern,
+                                  frame_id_filter=_worker_frame_id_filter)
+    time_start = _worker_args.start
+    time_stop = _worker_args.stop
+    keep_unknowns = not _selects_frames(_worker_args, _worker_frame_id_filter)
+    output = []
+
+    for line, frame in parser.parse_lines(chunk.split(b'\n'),
+                                          keep_unknowns=keep_unknowns):
+        if frame is not None and frame.timestamp is not None:
+            if time_start is not None and frame.timestamp < time_start:
+                continue
+
+            if time_stop is not None and frame.timestamp > time_stop:
+                continue
+
+        output.append(_format_line(_worker_database,
+                                   _worker_args,
+                                   line.decode('utf-8', 'replace'),
+                                   frame))
+        output.append('\n')
+
+    return ''.join(output)
+
+
+def _find_chunks(filename, chunk_size, ranges=None):
+    """Returns the byte ranges of the chunks of given byte ranges of given
+    file, or of the whole file, each ending after a newline or at the
+    end of its range.
+
+    """
+
+    chunks = []
+
+    with open(filename, 'rb') as fin:
+        size = os.fstat(fin.fileno()).st_size
+
+        if size == 0:
+            return chunks
+
+        if ranges is None:
+            ranges = [(0, size)]
+
+        with mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for start, stop in ranges:
+                while start < stop:
+                    end = mm.find(b'\n', start + chunk_size - 1, stop)
+
+                    if end == -1:
+                        end = stop
+                    else:
+                        end += 1
+
+                    chunks.append((start, end))
+                    start = end
+
+    return chunks
+
+
+def _detect_pattern(filename):
+    """Returns the pattern of the first frame of given log file, which all
+    chunks are parsed with, as when decoding it line by line.
+
+    """
+
+    with open(filename, 'rb') as fin:
+        parser = logreader.FastParser(fin)
+        next(iter(parser), None)
+
+        return parser.pattern
+
+
+def _load_index(args, frame_id_filter):
+    """Returns the index of the log file if it is up to date and only
+    frames in a time window or with selected frame ids are decoded,
+    and ``None`` otherwise.
+
+    """
+
+    if not _selects_frames(args, frame_id_filter):
+        return None
+
+    return LogIndex.load(args.logfile)
+
+
+def _decode_parallel(args, dbase, jobs, frame_id_filter):
+    index = _load_index(args, frame_id_filter)
+
+    if index is None:
+        ranges = None
+        size = os.path.getsize(args.logfile)
+    else:
+        ranges = index.ranges(args.start, args.stop, frame_id_filter)
+        size = sum(end - start for start, end in ranges)
+
+    chunk_size = max(1, min(CHUNK_SIZE, size // jobs + 1))
+    pattern = _detect_pattern(args.logfile)
+    pending = deque()
+
+    with ProcessPoolExecutor(max_workers=jobs,
+                             initializer=_init_worker,
+                             initargs=(args,
+                                       cdb.dump_bytes(dbase),
+                                       frame_id_filter)) as executor:
+        # Only a few chunks are decoded ahead of the output, so memory
+        # use does not depend on the size of the log file.
+        for start, end in _find_chunks(args.logfile, chunk_size, ranges):
+            pending.append(executor.submit(_decode_chunk,
+                                           args.logfile,
+                                           start,
+                                           end,
+                                           pattern))
+
+            if len(pending) >= 2 * jobs:
+                sys.stdout.write(pending.popleft().result())
+
+        while pending:
+            sys.stdout.write(pending.popleft().result())
+
+
 def _do_decode(args):
     dbase = database.load_file(args.database,
                                encoding=args.encoding,
                                frame_id_mask=args.frame_id_mask,
                                prune_choices=args.prune,
-                               strict=not args.no_strict)
-    decode_choices = not args.no_decode_choices
-    decode_containers = not args.no_decode_containers
-    parser = logreader.Parser(sys.stdin)
-    for line, frame in parser.iterlines(keep_unknowns=True):
-        if frame is not None:
-            line += ' ::'
-            line += format_message_by_frame_id(dbase,
-                                               frame.frame_id,
-                                               frame.data,
-                                               decode_choices,
-                                               args.single_line,
-                                               decode_containers)
-
-        print(line)
+                               strict=not args.no_strict,
+                               cache_dir=args.cache_dir)
+    jobs = args.jobs or os.cpu_count() or 1
+    frame_id_filter = parse_frame_id_filter(dbase,
+                                            args.frame_ids,
+                                            args.messages,
+                                            args.frame_id_mask)
+
+    if args.logfile is None:
+        if args.jobs != 1:
+            raise Error('--jobs requires a log file.')
+
+        _decode_lines(args,
+                      dbase,
+                      logreader.Parser(sys.stdin,
+                                       start=args.start,
+                                       stop=args.stop,
+                                       frame_id_filter=frame_id_filter),
+                      frame_id_filter)
+    elif jobs > 1:
+        _decode_parallel(args, dbase, jobs, frame_id_filter)
+    else:
+        with open(args.logfile) as fin:
+            _decode_lines(args,
+                          dbase,
+                          logreader.Parser(fin,
+                                           index=_load_index(args,
+                                                             frame_id_filter),
+                                           start=args.start,
+                                           stop=args.stop,
+                                           frame_id_filter=frame_id_filter),
+                          frame_id_filter)
 
 
 def add_subparser(subparsers):
     decode_parser = subparsers.add_parser(
         'decode',
         description=('Decode "candump" CAN frames read from standard input '
-                     'and print them in a human readable format.'),
+                     'or a log file and print them in a human readable '
+                     'format.'),
         formatter_class=argparse.ArgumentDefaultsHelpFormatter)
     decode_parser.add_argument(
         '-c', '--no-decode-choices',
@@ -66,7 +277,45 @@ def add_subparser(subparsers):
         help=('Only compare selected frame id bits to find the message in the '
               'database. By default the candump and database frame ids must '
               'be equal for a match.'))
+    decode_parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help=('Number of processes decoding chunks of the log file in '
+              'parallel, or 0 for one per CPU. The output is in the order '
+              'of the log file.'))
+    decode_parser.add_argument(
+        '--cache-dir',
+        help='Load the database from and store it in this cache directory.')
+    decode_parser.add_argument(
+        '--start',
+        type=float,
+        help=('Only decode frames with a timestamp of at least this many '
+              'seconds, which is the time since the epoch for absolute '
+              'timestamps. Lines which are not frames are not printed. The '
+              'log file is read using its index, if built by "cantools index '
+              'build" and up to date.'))
+    decode_parser.add_argument(
+        '--stop',
+        type=float,
+        help=('Only decode frames with a timestamp of at most this many '
+              'seconds. See --start.'))
+    decode_parser.add_argument(
+        '--frame-ids',
+        help=('Comma separated frame ids of the frames to decode. Other '
+              'frames are skipped, as are lines which look like them, without '
+              'parsing their data, and lines which are not frames. The frame '
+              'ids are matched with those in the log file, which is read '
+              'using its index as with --start.'))
+    decode_parser.add_argument(
+        '--messages',
+        help=('Comma separated names of the messages to decode, in addition '
+              'to --frame-ids.'))
     decode_parser.add_argument(
         'database',
         help='Database file.')
+    decode_parser.add_argument(
+        'logfile',
+        nargs='?',
+        help='Log file to decode instead of standard input.')
     decode_parser.set_defaults(func=_do_decode)
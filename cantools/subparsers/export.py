@@ -0,0 +1,359 @@
+import argparse
+import csv
+import os
+import shutil
+import tempfile
+import zipfile
+
+from argparse_addons import Integer
+
+from .. import database
+from .. import logreader
+from ..errors import Error
+from .__utils__ import parse_frame_id_filter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Number of frames of a message decoded and written at a time.
+BATCH_SIZE = 65536
+
+
+def _column_values(column):
+    """Returns given column as a list, with ``None`` in place of masked
+    values.
+
+    """
+
+    if np is None:
+        return column
+
+    if np.ma.isMaskedArray(column):
+        return np.where(np.ma.getmaskarray(column),
+                        None,
+                        column.data.astype(object)).tolist()
+
+    return column.tolist()
+
+
+class _CsvWriter:
+    """Writes rows of a message to a CSV file, with a header row of
+    column names.
+
+    """
+
+    def __init__(self, filename, names):
+        self._file = open(filename, 'w', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(names)
+
+    def write(self, timestamps, columns):
+        self._writer.writerows(
+            zip(timestamps, *[_column_values(column) for column in columns]))
+
+    def close(self):
+        self._file.close()
+
+
+class _NpzWriter:
+    """Writes columns of a message to a NumPy .npz file, as by
+    ``numpy.savez()``. The header of each array contains its length,
+    so columns are appended to temporary files and copied into the
+    .npz file once all rows have been written.
+
+    Masked columns of multiplexed signals are stored as their data and
+    a boolean ``<signal>.mask`` array. Columns of signals longer than
+    64 bits are stored as floats.
+
+    """
+
+    def __init__(self, filename, names):
+        self._filename = filename
+        self._names = names
+        self._tmpdir = tempfile.mkdtemp(dir=os.path.dirname(filename) or None)
+        self._files = {}
+        self._dtypes = {}
+        self._length = 0
+
+    def _append(self, key, array):
+        dtype = self._dtypes.setdefault(key, array.dtype)
+
+        if key not in self._files:
+            self._files[key] = open(os.path.join(self._tmpdir,
+                                                 str(len(self._files))),
+                                    'wb')
+
+        np.ascontiguousarray(array, dtype=dtype).tofile(self._files[key])
+
+    def write(self, timestamps, columns):
+        self._append(self._names[0], np.array(timestamps, dtype=float))
+
+        for name, column in zip(self._names[1:], columns):
+            if np.ma.isMaskedArray(column):
+                self._append(name + '.mask', np.ma.getmaskarray(column))
+                column = column.data
+
+            if column.dtype == object:
+                column = column.astype(float)
+
+            self._append(name, column)
+
+        self._length += len(timestamps)
+
+    def close(self):
+        try:
+            with zipfile.ZipFile(self._filename, 'w', allowZip64=True) as fzip:
+                for key, fin in self._files.items():
+                    fin.close()
+                    header = {
+                        'descr': np.lib.format.dtype_to_descr(self._dtypes[key]),
+                        'fortran_order': False,
+                        'shape': (self._length, )
+                    }
+
+                    with fzip.open(key + '.npy', 'w', force_zip64=True) as fout:
+                        np.lib.format.write_array_header_1_0(fout, header)
+
+                        with open(fin.name, 'rb') as fdata:
+                            shutil.copyfileobj(fdata, fout)
+        finally:
+            for fin in self._files.values():
+                fin.close()
+
+            shutil.rmtree(self._tmpdir)
+
+
+class _ParquetWriter:
+    """Writes rows of a message to a Parquet file, one row group per
+    batch.
+
+    """
+
+    def __init__(self, filename, names):
+        self._filename = filename
+        self._names = names
+        self._writer = None
+
+    def write(self, timestamps, columns):
+        arrays = [pyarrow.array(timestamps, type=pyarrow.float64())]
+
+        for column in columns:
+            if np is None:
+                arrays.append(pyarrow.array(column))
+            elif np.ma.isMaskedArray(column):
+                arrays.append(pyarrow.array(column.data,
+                                            mask=np.ma.getmaskarray(column)))
+            elif column.dtype == object:
+                arrays.append(pyarrow.array(column.astype(float)))
+            else:
+                arrays.append(pyarrow.array(column))
+
+        table = pyarrow.Table.from_arrays(arrays, names=self._names)
+
+        if self._writer is None:
+            self._writer = pyarrow.parquet.ParquetWriter(self._filename,
+                                                         table.schema)
+
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+WRITERS = {
+    'csv': _CsvWriter,
+    'npz': _NpzWriter,
+    'parquet': _ParquetWriter
+}
+
+
+class _MessageBuffer:
+    """The timestamps and payloads of frames of a message not yet
+    decoded and written.
+
+    """
+
+    def __init__(self, message, writer, batch_size, scaling):
+        self.message = message
+        self.writer = writer
+        self.batch_size = batch_size
+        self.scaling = scaling
+        self.signal_names = [signal.name for signal in message.signals]
+        self.timestamps = []
+        self.payloads = []
+        self.number_of_skipped_frames = 0
+
+    def append(self, timestamp, data):
+        if len(data) < self.message.length:
+            self.number_of_skipped_frames += 1
+            return
+
+        self.timestamps.append(timestamp)
+        self.payloads.append(data)
+
+        if len(self.payloads) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.payloads:
+            return
+
+        columns = self.message.decode_batch(self.payloads, self.scaling)
+        self.writer.write(self.timestamps,
+                          [columns[name] for name in self.signal_names])
+        self.timestamps = []
+        self.payloads = []
+
+
+def _do_export(args):
+    if args.format == 'npz' and np is None:
+        raise Error('The npz format requires NumPy.')
+
+    if args.format == 'parquet' and pyarrow is None:
+        raise Error('The parquet format requires pyarrow.')
+
+    if args.batch_size < 1:
+        raise Error(f'Invalid batch size {args.batch_size}.')
+
+    dbase = database.load_file(args.database,
+                               encoding=args.encoding,
+                               frame_id_mask=args.frame_id_mask,
+                               prune_choices=args.prune,
+                               strict=not args.no_strict,
+                               cache_dir=args.cache_dir)
+    frame_id_filter = parse_frame_id_filter(dbase,
+                                            None,
+                                            args.messages,
+                                            args.frame_id_mask)
+
+    if args.messages is not None:
+        for name in args.messages.split(','):
+            if name and dbase.get_message_by_name(name).is_container:
+                raise Error(f"Cannot export container message '{name}'.")
+
+    os.makedirs(args.output_directory, exist_ok=True)
+    writer_class = WRITERS[args.format]
+
+    # Message buffers by frame id in the log file, or None for frames
+    # not exported, and by message name.
+    buffers = {}
+    message_buffers = {}
+
+    def get_buffer(frame_id):
+        try:
+            message = dbase.get_message_by_frame_id(frame_id)
+        except KeyError:
+            return None
+
+        if message.is_container:
+            return None
+
+        buffer = message_buffers.get(message.name)
+
+        if buffer is None:
+            filename = os.path.join(args.output_directory,
+                                    f'{message.name}.{args.format}')
+            names = ['timestamp'] + [signal.name for signal in message.signals]
+            buffer = _MessageBuffer(message,
+                                    writer_class(filename, names),
+                                    args.batch_size,
+                                    not args.no_scaling)
+            message_buffers[message.name] = buffer
+
+        return buffer
+
+    try:
+        with open(args.logfile, 'rb') as fin:
+            parser = logreader.FastParser(fin, frame_id_filter=frame_id_filter)
+
+            for frame in parser:
+                try:
+                    buffer = buffers[frame.frame_id]
+                except KeyError:
+                    buffer = get_buffer(frame.frame_id)
+                    buffers[frame.frame_id] = buffer
+
+                if buffer is not None:
+                    buffer.append(frame.timestamp, frame.data)
+
+        for buffer in message_buffers.values():
+            buffer.flush()
+    finally:
+        for buffer in message_buffers.values():
+            buffer.writer.close()
+
+    for name, buffer in message_buffers.items():
+        if buffer.number_of_skipped_frames > 0:
+            print(f'Skipped {buffer.number_of_skipped_frames} frame(s) of '
+                  f'message {name} with too short data.')
+
+
+def add_subparser(subparsers):
+    export_parser = subparsers.add_parser(
+        'export',
+        description=('Decode the frames of given log file and write the '
+                     'signals of each message as columns to a file in the '
+                     'output directory, named after the message. Each file '
+                     'has a timestamp column and one column per signal. '
+                     'Frames are decoded and written in batches, so memory '
+                     'use does not depend on the size of the log file.'),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    export_parser.add_argument(
+        '-f', '--format',
+        choices=sorted(WRITERS),
+        default='csv',
+        help=('Output file format. npz requires NumPy and parquet requires '
+              'pyarrow.'))
+    export_parser.add_argument(
+        '--messages',
+        help=('Comma separated names of the messages to export. All messages '
+              'are exported by default, except container messages.'))
+    export_parser.add_argument(
+        '-o', '--output-directory',
+        default='.',
+        help='Directory to write the files to.')
+    export_parser.add_argument(
+        '-b', '--batch-size',
+        type=int,
+        default=BATCH_SIZE,
+        help='Number of frames of a message decoded and written at a time.')
+    export_parser.add_argument(
+        '--no-scaling',
+        action='store_true',
+        help='Write raw signal values instead of scaled values.')
+    export_parser.add_argument(
+        '-e', '--encoding',
+        help='File encoding.')
+    export_parser.add_argument(
+        '--prune',
+        action='store_true',
+        help='Try to shorten the names of named signal choices.')
+    export_parser.add_argument(
+        '--no-strict',
+        action='store_true',
+        help='Skip database consistency checks.')
+    export_parser.add_argument(
+        '-m', '--frame-id-mask',
+        type=Integer(0),
+        help=('Only compare selected frame id bits to find the message in the '
+              'database. By default the log file and database frame ids must '
+              'be equal for a match.'))
+    export_parser.add_argument(
+        '--cache-dir',
+        help='Load the database from and store it in this cache directory.')
+    export_parser.add_argument(
+        'logfile',
+        help='Log file.')
+    export_parser.add_argument(
+        'database',
+        help='Database file.')
+    export_parser.set_defaults(func=_do_export)
@@ -1,8 +1,24 @@
 import argparse
+import contextlib
+import hashlib
+import io
+import json
 import os
 import os.path
+import re
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
 
 from .. import database
+from ..errors import Error
+from ..version import __version__
 from ..database.can.c_source import generate, generate_devices_sources
 from ..database.can.c_source import camel_to_snake_case
 from ..database.can.proto import generate_proto
@@ -15,13 +31,29 @@ LIBPATH = '/lib/{network}/'
 PROTOPATH = '/proto/{network}/'
 DBCPATH = '/dbc/{network}'
 
-def load_database_folder(args, path):
+# Name of the file in the library folder of each network recording the
+# fingerprint of its last generation.
+FINGERPRINT_FILENAME = '.cantools_fingerprint.json'
+
+# Lines of generated files that change on every generation.
+VOLATILE_LINES_RE = re.compile(
+    r'^(.*This file was generated by cantools version .*'
+    r'|#define CANLIB_BUILD_TIME .*)$',
+    re.MULTILINE)
+
+def _find_networks(path):
+    """Returns the name and the database files of each network in given
+    folder, which contains one subfolder per network. The networks are
+    sorted by subfolder name.
+
+    """
+
     # Check if path is a folder
     if not os.path.isdir(path):
         raise argparse.ArgumentTypeError(f"{path} is not a folder")
     # Check if folder contains multiple subfolders (one for each network) but
     # with only no subsubfolder
-    subfolders = [f.path for f in os.scandir(path) if f.is_dir()]
+    subfolders = sorted(f.path for f in os.scandir(path) if f.is_dir())
     if len(subfolders) == 0:
         raise argparse.ArgumentTypeError(f"{path} does not contain any subfolder")
     for subfolder in subfolders:
@@ -31,80 +63,596 @@ def load_database_folder(args, path):
 
 
     # Check for every subfolder if contains a .dbc file or .json file
-    dbs = []
-    dbs_names = []
+    networks = []
     for subfolder in subfolders:
-        dbs_names.append(camel_to_snake_case(os.path.basename(subfolder)))
-        files = [(f.name, f.path) for f in os.scandir(subfolder) if f.is_file()]
-        dbc_files = [f for f in files if f[1].endswith('.dbc')]
-        json_files = [f for f in files if f[1].endswith('.json') and "network" in f[0]] # check if json and contains network
+        files = sorted((f.name, f.path) for f in os.scandir(subfolder) if f.is_file())
+        dbc_files = [f[1] for f in files if f[1].endswith('.dbc')]
+        json_files = [f[1] for f in files if f[1].endswith('.json') and "network" in f[0]] # check if json and contains network
         if len(dbc_files) == 0 and len(json_files) == 0:
             raise argparse.ArgumentTypeError(f"{subfolder} does not contain a .dbc or .json file")
         # Load dbc files, then json files
-        db = None
-        for dbc_name, dbc_path in dbc_files:
-            if db is None:
-                db = database.load_file(dbc_path, encoding=args.encoding,
-                                        prune_choices=args.prune,
-                                        strict=not args.no_strict)
-            else:
-                db.add_dbc_file(dbc_path)
-        for json_name, json_path in json_files:
-            if db is None:
-                db = database.load_file(json_path, encoding=args.encoding,
-                                        prune_choices=args.prune,
-                                        strict=not args.no_strict)
-            else:
-                db.add_json_file(json_path)
-        dbs.append(db)
+        networks.append((camel_to_snake_case(os.path.basename(subfolder)),
+                         dbc_files + json_files))
+    return networks
+
+def _read_id_allocations(path):
+    """Returns the frame ids recorded in given lockfile, as ``{network:
+    {message: frame_id}}``, or an empty dictionary if it does not exist
+    yet.
+
+    """
+
+    try:
+        with open(path) as fin:
+            allocations = json.load(fin)
+    except FileNotFoundError:
+        return {}
+    except ValueError:
+        raise Error(f'{path}: Invalid frame id allocations.') from None
+
+    if (not isinstance(allocations, dict)
+        or not all(isinstance(ids, dict) for ids in allocations.values())):
+        raise Error(f'{path}: Invalid frame id allocations.')
+
+    return allocations
+
+def _write_id_allocations(path, allocations):
+    _write_file(path,
+                json.dumps(allocations, indent=4, sort_keys=True) + '\n',
+                incremental=True)
+
+def _add_json_file(db, filename, encoding, allocations):
+    """Add given JSON network file to given database and return the frame
+    ids given to its messages. Messages in `allocations` keep their
+    frame id, so adding or removing a message does not change the ids
+    of the others.
+
+    """
+
+    names = {message.name for message in db.messages}
+    db.add_json_file(filename, encoding, allocations)
+
+    return {
+        message.name: message.frame_id
+        for message in db.messages
+        if message.name not in names
+    }
+
+def _load_network(args, filenames, allocations=None):
+    """Load given database files of a network. Returns the database and,
+    if `allocations` is not ``None``, the frame ids given to the
+    messages of its JSON files, which are otherwise allocated in
+    message order.
+
+    """
+
+    db = None
+    ids = {}
+    for filename in filenames:
+        if db is None and filename.endswith('.json'):
+            db = database.can.Database(strict=not args.no_strict)
+            ids.update(_add_json_file(db, filename, args.encoding or 'utf-8',
+                                      allocations))
+
+            if args.prune:
+                database.utils.prune_database_choices(db)
+        elif db is None:
+            db = database.load_file(filename, encoding=args.encoding,
+                                    prune_choices=args.prune,
+                                    strict=not args.no_strict)
+        elif filename.endswith('.dbc'):
+            db.add_dbc_file(filename)
+        else:
+            ids.update(_add_json_file(db, filename, 'cp1252', allocations))
+    return db, None if allocations is None else ids
+
+def load_database_folder(args, path):
+    networks = _find_networks(path)
+    dbs = [_load_network(args, filenames)[0] for _, filenames in networks]
+    dbs_names = [name for name, _ in networks]
     return dbs, dbs_names
 
-def _do_generate_c_source(args):
-    dbases = []
-    dbases_names = []
-    if args.infile is None:
-        dbase, dbase_name = load_database_folder(args, args.infolder)
-        dbases.append(dbase)
-        dbases_names.append(dbase_name)
+def _write_file(path, contents, incremental=False):
+    """Write given contents to given file. If `incremental` is ``True``,
+    the file is left untouched if it has the same contents except for
+    its generation date, and is otherwise replaced atomically, so that
+    build tools never see a partially written file.
+
+    """
+
+    if not incremental:
+        with open(path, 'w') as fout:
+            fout.write(contents)
+
+        return
+
+    try:
+        with open(path) as fin:
+            old_contents = fin.read()
+    except OSError:
+        pass
     else:
-        dbases.append(database.load_file(args.infile,
-                                encoding=args.encoding,
-                                prune_choices=args.prune,
-                                strict=not args.no_strict))
-        if args.database_name is None or len(dbases) > 1:
-            basename = os.path.basename(args.infile)
-            database_name = os.path.splitext(basename)[0]
-            database_name = camel_to_snake_case(database_name)
-        else:
-            database_name = args.database_name
-        dbases_names.append(database_name)
+        if (VOLATILE_LINES_RE.sub('', old_contents)
+            == VOLATILE_LINES_RE.sub('', contents)):
+            return
+
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+
+    try:
+        with open(tmp_path, 'w') as fout:
+            fout.write(contents)
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def _network_fingerprint(args, database_name, filenames):
+    """Returns a digest of the database files of given network, the
+    generator options and the cantools version.
+
+    """
+
+    options = {
+        'version': __version__,
+        'database_name': database_name,
+        'encoding': args.encoding,
+        'prune': args.prune,
+        'no_strict': args.no_strict,
+        'no_floating_point_numbers': args.no_floating_point_numbers,
+        'generate_fuzzer': args.generate_fuzzer,
+        'bit_fields': args.bit_fields,
+        'use_float': args.use_float,
+        'node': args.node,
+        'generate_dbc': args.generate_dbc
+    }
+    digest = hashlib.blake2b(json.dumps(options, sort_keys=True).encode(),
+                             digest_size=16)
+
+    for filename in filenames:
+        with open(filename, 'rb') as fin:
+            contents = fin.read()
+
+        digest.update(f'{os.path.basename(filename)}:{len(contents)}:'.encode())
+        digest.update(contents)
+
+    return digest.hexdigest()
+
+def _with_id_allocations(fingerprint, allocations):
+    """Returns given network fingerprint combined with the frame ids
+    given to the messages of the network, if recorded in a lockfile.
+
+    """
+
+    if allocations is None:
+        return fingerprint
+
+    return hashlib.blake2b(
+        json.dumps([fingerprint, allocations], sort_keys=True).encode(),
+        digest_size=16).hexdigest()
+
+def _fingerprint_path(args, database_name):
+    return os.path.join(
+        args.output_directory + LIBPATH.format(network=database_name),
+        FINGERPRINT_FILENAME)
+
+def _write_fingerprint(args, database_name, fingerprint, paths):
+    paths = [os.path.relpath(path, args.output_directory) for path in paths]
+    _write_file(_fingerprint_path(args, database_name),
+                json.dumps({'fingerprint': fingerprint, 'files': paths},
+                           indent=4) + '\n',
+                incremental=True)
+
+def _is_up_to_date(output_directory, fingerprint_path, fingerprint):
+    """Returns True if the network was last generated with given
+    fingerprint and all files generated back then still exist.
+
+    """
+
+    try:
+        with open(fingerprint_path) as fin:
+            previous = json.load(fin)
+    except (OSError, ValueError):
+        return False
+
+    return (previous.get('fingerprint') == fingerprint
+            and all(os.path.exists(os.path.join(output_directory, path))
+                    for path in previous.get('files', [])))
+
+def _run_network_stages(args, database_name, filenames, allocations, timings):
+    """Load and generate given network and return the frame ids given to
+    its messages, see :func:`_load_network()`.
+
+    """
+
+    if args.incremental:
+        start = time.perf_counter()
+        fingerprint = _network_fingerprint(args, database_name, filenames)
+        fingerprint_path = _fingerprint_path(args, database_name)
+        timings.append(('fingerprint', time.perf_counter() - start))
+
+        if _is_up_to_date(args.output_directory,
+                          fingerprint_path,
+                          _with_id_allocations(fingerprint, allocations)):
+            print(f'{database_name} is up to date.')
+
+            return allocations
+
+    start = time.perf_counter()
+    dbase, allocations = _load_network(args, filenames, allocations)
+    timings.append(('load', time.perf_counter() - start))
+
+    start = time.perf_counter()
+    paths = generate_from_db(dbase, database_name, args.no_floating_point_numbers,
+                             args.generate_fuzzer, args.bit_fields, args.use_float,
+                             args.node, args.output_directory, args.generate_dbc,
+                             args.incremental)
+    timings.append(('generate', time.perf_counter() - start))
+
+    # recorded last, so that a failed generation is retried, and with
+    # the new frame ids, so that recording them does not trigger
+    # another generation
+    if args.incremental:
+        _write_fingerprint(args,
+                           database_name,
+                           _with_id_allocations(fingerprint, allocations),
+                           paths)
+
+    return allocations
+
+def _generate_network(args, database_name, filenames, allocations):
+    """Load and generate given network. Returns its name, what it printed,
+    the duration of each stage in seconds, the error, if any, and the
+    frame ids given to its messages.
 
-    # flatten list of lists
-    dbases = [item for sublist in dbases for item in sublist]
-    dbases_names = [item for sublist in dbases_names for item in sublist]
-    
+    Runs in a worker process when generating networks in parallel.
+
+    """
+
+    output = io.StringIO()
+    timings = []
+    error = None
+
+    try:
+        with contextlib.redirect_stdout(output):
+            allocations = _run_network_stages(args,
+                                              database_name,
+                                              filenames,
+                                              allocations,
+                                              timings)
+    except Exception as e:
+        error = ''.join(traceback.format_exception_only(type(e), e)).strip()
+
+    return database_name, output.getvalue(), timings, error, allocations
+
+def _format_timings(name, timings):
+    stages = ', '.join(f'{stage} {duration:.3f} s' for stage, duration in timings)
+
+    return f'{name}: {stages}'
+
+def _network_id_allocations(allocations, database_name):
+    if allocations is None:
+        return None
+
+    return allocations.get(database_name, {})
+
+def _generate_networks(args, networks, allocations):
+    """Generate given networks and the shared device sources, and return
+    the names of the networks that failed. The frame ids given to the
+    messages of the networks are added to `allocations` and written to
+    the lockfile, unless it is ``None``.
+
+    """
+
+    # the devices sources are shared by all networks
+    start = time.perf_counter()
     DEVICES_DIR = args.output_directory+'/lib'
     os.makedirs(DEVICES_DIR, exist_ok=True)
     
     devices_header, devices_source = generate_devices_sources()
     
     devices_h = os.path.join(DEVICES_DIR, "canlib_device.h")
-    
-    with open(devices_h, 'w') as fout:
-        fout.write(devices_header)
+    _write_file(devices_h, devices_header, args.incremental)
 
     devices_c = os.path.join(DEVICES_DIR, "canlib_device.c")
+    _write_file(devices_c, devices_source, args.incremental)
+
+    devices_timings = [('generate', time.perf_counter() - start)]
+
+    # the networks are generated in parallel if requested, but their
+    # output is printed in network order once all are done
+    jobs = args.jobs or os.cpu_count() or 1
+
+    if jobs == 1 or len(networks) == 1:
+        results = [
+            _generate_network(args,
+                              name,
+                              filenames,
+                              _network_id_allocations(allocations, name))
+            for name, filenames in networks
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(_generate_network,
+                                args,
+                                name,
+                                filenames,
+                                _network_id_allocations(allocations, name))
+                for name, filenames in networks
+            ]
+            results = [future.result() for future in futures]
 
-    with open(devices_c, 'w') as fout:
-        fout.write(devices_source)
-    
-    for dbase, dbase_name in zip(dbases, dbases_names):
-        generate_from_db(dbase, dbase_name, args.no_floating_point_numbers, args.generate_fuzzer, args.bit_fields,
-                        args.use_float, args.node, args.output_directory, args.generate_dbc)
+    failed = []
+
+    for name, output, timings, error, network_allocations in results:
+        print(output, end='')
+
+        if error is not None:
+            print(f'error: {name}: {error}', file=sys.stderr)
+            failed.append(name)
+
+        if network_allocations is not None:
+            allocations[name] = network_allocations
+
+    if allocations is not None:
+        _write_id_allocations(args.id_allocations, allocations)
+
+    if args.timings:
+        print(_format_timings('canlib_device', devices_timings))
+
+        for name, _, timings, _, _ in results:
+            print(_format_timings(name, timings))
+
+    return failed
+
+class _PollingWatcher:
+    """Finds changed network folders by comparing the modification times
+    and sizes of their files every `interval` seconds.
+
+    """
+
+    def __init__(self, path, interval):
+        self._path = path
+        self._interval = interval
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self):
+        snapshot = {}
+
+        for folder in os.scandir(self._path):
+            if not folder.is_dir():
+                continue
+
+            snapshot[folder.path] = (folder.path, None, None)
+
+            try:
+                for entry in os.scandir(folder.path):
+                    stat = entry.stat()
+                    snapshot[entry.path] = (folder.path,
+                                            stat.st_mtime_ns,
+                                            stat.st_size)
+            except OSError:
+                # removed while scanning
+                pass
+
+        return snapshot
+
+    def wait(self):
+        """Wait for changes and return the paths of the changed network
+        folders.
+
+        """
+
+        while True:
+            time.sleep(self._interval)
+            snapshot = self._take_snapshot()
+            changed = self._snapshot.items() ^ snapshot.items()
+            self._snapshot = snapshot
+
+            if changed:
+                return {folder for _, (folder, _, _) in changed}
+
+    def close(self):
+        pass
+
+class _InotifyWatcher:
+    """Finds changed network folders using inotify.
+
+    """
+
+    # wait this long for more events once a file has changed, as
+    # editors often save in several steps
+    READ_DELAY = 100
+
+    def __init__(self, path):
+        flags = inotify_simple.flags
+        self._path = path
+        self._inotify = inotify_simple.INotify()
+        self._folders = {}
+        self._root_wd = self._inotify.add_watch(
+            path,
+            flags.CREATE | flags.DELETE | flags.MOVED_FROM | flags.MOVED_TO)
+
+        for entry in os.scandir(path):
+            if entry.is_dir():
+                self._add_folder(entry.path)
+
+    def _add_folder(self, path):
+        flags = inotify_simple.flags
+        wd = self._inotify.add_watch(
+            path,
+            flags.CLOSE_WRITE | flags.DELETE | flags.MOVED_FROM | flags.MOVED_TO)
+        self._folders[wd] = path
+
+    def wait(self):
+        """Wait for changes and return the paths of the changed network
+        folders.
+
+        """
+
+        flags = inotify_simple.flags
+
+        while True:
+            changed = set()
+
+            for event in self._inotify.read(read_delay=self.READ_DELAY):
+                if event.wd == self._root_wd:
+                    if not event.mask & flags.ISDIR:
+                        continue
+
+                    path = os.path.join(self._path, event.name)
+
+                    if event.mask & (flags.CREATE | flags.MOVED_TO):
+                        try:
+                            self._add_folder(path)
+                        except OSError:
+                            # removed again
+                            pass
+
+                    changed.add(path)
+                elif event.mask & flags.IGNORED:
+                    self._folders.pop(event.wd, None)
+                elif event.wd in self._folders:
+                    changed.add(self._folders[event.wd])
+
+            if changed:
+                return changed
+
+    def close(self):
+        self._inotify.close()
+
+def _create_watcher(path, poll_interval):
+    """Returns an inotify watcher of given folder if available, and a
+    polling watcher otherwise.
+
+    """
+
+    if inotify_simple is not None:
+        try:
+            return _InotifyWatcher(path)
+        except OSError:
+            # not on Linux, or out of watches
+            pass
+
+    return _PollingWatcher(path, poll_interval)
+
+def _regenerate_network(args, database_name, filenames, fingerprints, allocations):
+    start = time.perf_counter()
+
+    try:
+        network_allocations = _network_id_allocations(allocations, database_name)
+        files_fingerprint = _network_fingerprint(args, database_name, filenames)
+        fingerprint = _with_id_allocations(files_fingerprint, network_allocations)
+
+        # editors often touch files without changing them
+        if fingerprints.get(database_name) == fingerprint:
+            return
+
+        dbase, network_allocations = _load_network(args,
+                                                   filenames,
+                                                   network_allocations)
+        fingerprint = _with_id_allocations(files_fingerprint,
+                                           network_allocations)
+        fingerprints[database_name] = fingerprint
+        paths = generate_from_db(dbase, database_name, args.no_floating_point_numbers,
+                                 args.generate_fuzzer, args.bit_fields, args.use_float,
+                                 args.node, args.output_directory, args.generate_dbc,
+                                 incremental=True)
+
+        if args.incremental:
+            _write_fingerprint(args, database_name, fingerprint, paths)
+
+        if allocations is not None:
+            allocations[database_name] = network_allocations
+            _write_id_allocations(args.id_allocations, allocations)
+    except Exception as e:
+        error = ''.join(traceback.format_exception_only(type(e), e)).strip()
+        print(f'error: {database_name}: {error}', file=sys.stderr)
+
+        return
+
+    print(f'Regenerated {database_name} in {time.perf_counter() - start:.3f} s.')
+
+def _watch(args, networks, allocations):
+    """Regenerate each network of the input folder when the files in its
+    folder change, until interrupted. The fingerprint of each network is
+    kept, so only changed networks are loaded and generated again, and
+    only files with changed contents are written.
+
+    """
+
+    watcher = _create_watcher(args.infolder, args.poll_interval)
+    fingerprints = {
+        name: _with_id_allocations(_network_fingerprint(args, name, filenames),
+                                   _network_id_allocations(allocations, name))
+        for name, filenames in networks
+    }
+
+    print(f'Watching {args.infolder} for changes. Press Ctrl-C to stop.')
+
+    try:
+        while True:
+            changed = {
+                camel_to_snake_case(os.path.basename(path))
+                for path in watcher.wait()
+            }
+
+            try:
+                networks = _find_networks(args.infolder)
+            except argparse.ArgumentTypeError as e:
+                print(f'error: {e}', file=sys.stderr)
+                continue
+
+            for name, filenames in networks:
+                if name in changed:
+                    _regenerate_network(args,
+                                        name,
+                                        filenames,
+                                        fingerprints,
+                                        allocations)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+def _do_generate_c_source(args):
+    if args.watch and args.infolder is None:
+        raise Error('--watch requires --infolder.')
+
+    if args.infile is None:
+        networks = _find_networks(args.infolder)
+    else:
+        if args.database_name is None:
+            basename = os.path.basename(args.infile)
+            database_name = os.path.splitext(basename)[0]
+            database_name = camel_to_snake_case(database_name)
+        else:
+            database_name = args.database_name
+        networks = [(database_name, [args.infile])]
+
+    if args.id_allocations is None:
+        allocations = None
+    else:
+        allocations = _read_id_allocations(args.id_allocations)
+
+    failed = _generate_networks(args, networks, allocations)
+
+    if args.watch:
+        _watch(args, networks, allocations)
+    elif failed:
+        raise Error(f'Failed to generate {len(failed)} of {len(networks)} '
+                    f'networks: {", ".join(failed)}.')
 
 
 def generate_from_db(dbase, database_name, no_floating_point_numbers = False, generate_fuzzer = False, bit_fields=False,
-                     use_float=True, node=None, output_directory='.', generate_dbc=False):
+                     use_float=True, node=None, output_directory='.', generate_dbc=False,
+                     incremental=False):
+    """Generate the sources of given database and return the paths of the
+    generated files. If `incremental` is ``True``, files whose contents
+    are unchanged except for their generation date are not written.
+
+    """
 
     filename_h = database_name + '_network.h'
     filename_c = database_name + '_network.c'
@@ -143,76 +691,49 @@ def generate_from_db(dbase, database_name, no_floating_point_numbers = False, ge
 
     os.makedirs(output_directory+libpath, exist_ok=True)
     os.makedirs(output_directory+protopath, exist_ok=True)
-    
-    path_h = os.path.join(output_directory+libpath, filename_h)
-    
-    with open(path_h, 'w') as fout:
-        fout.write(header)
 
+    path_h = os.path.join(output_directory+libpath, filename_h)
     path_c = os.path.join(output_directory+libpath, filename_c)
-
-    with open(path_c, 'w') as fout:
-        fout.write(source)
-
     path_proto = os.path.join(output_directory+protopath, filename_proto)
-
-    with open(path_proto, 'w') as fout:
-        fout.write(proto)
-
     path_proto_interface = os.path.join(output_directory+protopath, filename_proto_interface)
-
-    with open(path_proto_interface, 'w') as fout:
-        fout.write(proto_interface)
-
-    path_watchdog = os.path.join(output_directory+libpath, file_name_watchdog)
-
-    with open(path_watchdog, 'w') as fout:
-        fout.write(watchdog)
-    
-    path_watchdog_implementation = os.path.join(output_directory+libpath, file_name_watchdog_implementation)
-
-    with open(path_watchdog_implementation, 'w') as fout:
-        fout.write(watchdog_implementation)
-
-    path_utils_c = os.path.join(output_directory+libpath, filename_utils_c)
-
-    with open(path_utils_c, 'w') as fout:
-        fout.write(utils_c)
-
-    path_utils_c_implementation = os.path.join(output_directory+libpath, filename_utils_c_implementation)
-
-    with open(path_utils_c_implementation, 'w') as fout:
-        fout.write(utils_c_implementation)
-
-    path_utils_cpp = os.path.join(output_directory+libpath, filename_utils_cpp)
-
-    with open(path_utils_cpp, 'w') as fout:
-        fout.write(utils_cpp)
-
-    path_utils_cpp_implementation = os.path.join(output_directory+libpath, filename_utils_cpp_implementation)
-
-    with open(path_utils_cpp_implementation, 'w') as fout:
-        fout.write(utils_cpp_implementation)
+    outputs = [
+        (path_h, header),
+        (path_c, source),
+        (path_proto, proto),
+        (path_proto_interface, proto_interface),
+        (os.path.join(output_directory+libpath, file_name_watchdog),
+         watchdog),
+        (os.path.join(output_directory+libpath, file_name_watchdog_implementation),
+         watchdog_implementation),
+        (os.path.join(output_directory+libpath, filename_utils_c),
+         utils_c),
+        (os.path.join(output_directory+libpath, filename_utils_c_implementation),
+         utils_c_implementation),
+        (os.path.join(output_directory+libpath, filename_utils_cpp),
+         utils_cpp),
+        (os.path.join(output_directory+libpath, filename_utils_cpp_implementation),
+         utils_cpp_implementation)
+    ]
 
     if generate_dbc:
         os.makedirs(output_directory+dbcpath, exist_ok=True)
-        path_dbc = os.path.join(output_directory+dbcpath, filename_dbc)
+        outputs.append((os.path.join(output_directory+dbcpath, filename_dbc),
+                        dbase.as_dbc_string(shorten_long_names=False)))
+
+    for path, contents in outputs:
+        _write_file(path, contents, incremental)
 
-        with open(path_dbc, 'w') as fout:
-            fout.write(dbase.as_dbc_string(shorten_long_names=False))
+    paths = [path for path, _ in outputs]
 
     print(f'Successfully generated {path_h} and {path_c} and {path_proto} and {path_proto_interface}.')
 
     if generate_fuzzer:
         fuzzer_path_c = os.path.join(output_directory, fuzzer_filename_c)
-
-        with open(fuzzer_path_c, 'w') as fout:
-            fout.write(fuzzer_source)
-
         fuzzer_path_mk = os.path.join(output_directory, fuzzer_filename_mk)
 
-        with open(fuzzer_filename_mk, 'w') as fout:
-            fout.write(fuzzer_makefile)
+        _write_file(fuzzer_path_c, fuzzer_source, incremental)
+        _write_file(fuzzer_filename_mk, fuzzer_makefile, incremental)
+        paths += [fuzzer_path_c, fuzzer_filename_mk]
 
         print('Successfully generated {} and {}.'.format(fuzzer_path_c,
                                                          fuzzer_path_mk))
@@ -222,6 +743,8 @@ def generate_from_db(dbase, database_name, no_floating_point_numbers = False, ge
                 fuzzer_filename_mk))
         print('recent version of clang.')
 
+    return paths
+
 
 def add_subparser(subparsers):
     generate_c_source_parser = subparsers.add_parser(
@@ -275,6 +798,42 @@ def add_subparser(subparsers):
         help='Generate the dbc file'
     )
 
+    generate_c_source_parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help=('Number of networks of the input folder to load and generate in '
+              'parallel, or 0 for one per CPU.'))
+    generate_c_source_parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help=('Skip networks whose database files and options are unchanged '
+              'since they were last generated, and only write files whose '
+              'contents changed.'))
+    generate_c_source_parser.add_argument(
+        '--watch',
+        action='store_true',
+        help=('Keep running and regenerate each network of the input folder '
+              'when its files change. Uses inotify if the inotify_simple '
+              'package is installed, and polling otherwise.'))
+    generate_c_source_parser.add_argument(
+        '--poll-interval',
+        type=float,
+        default=0.5,
+        help='Seconds between checks for changes when watching by polling.')
+    generate_c_source_parser.add_argument(
+        '--timings',
+        action='store_true',
+        help='Print the duration of each stage of each network.')
+    generate_c_source_parser.add_argument(
+        '--id-allocations',
+        metavar='FILE',
+        help=('Lockfile of the frame ids given to the messages of JSON '
+              'networks. Messages keep the ids recorded in it, so adding or '
+              'removing a message does not change the ids of the others, and '
+              'the ids of new messages are added to it. Created if missing. '
+              'Keep it under version control with the networks.'))
+
     in_group = generate_c_source_parser.add_mutually_exclusive_group(required=True)
     in_group.add_argument(
         '--infile',
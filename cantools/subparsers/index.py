@@ -0,0 +1,59 @@
+import argparse
+
+from ..logindex import BLOCK_SIZE, LogIndex, index_filename
+
+
+def _do_build(args):
+    for filename in args.logfiles:
+        LogIndex.build(filename, args.block_size).save(filename)
+
+
+def _do_info(args):
+    index = LogIndex.load(args.logfile)
+
+    if index is None:
+        print(f'{index_filename(args.logfile)}: Missing or out of date.')
+        return
+
+    print(f'Size:      {index.size} bytes')
+    print(f'Blocks:    {index.number_of_blocks}')
+    print(f'Frame ids: {len(index.frame_ids)}')
+    print(f'Start:     {index.start}')
+    print(f'Stop:      {index.stop}')
+
+
+def add_subparser(subparsers):
+    index_parser = subparsers.add_parser(
+        'index',
+        description=('Manage indexes of CAN log files, which let decode and '
+                     'plot only read the parts of a log file in a time '
+                     'window.'))
+    index_subparsers = index_parser.add_subparsers(title='subcommands',
+                                                   dest='index_subcommand')
+    index_subparsers.required = True
+
+    build_parser = index_subparsers.add_parser(
+        'build',
+        description=('Build the index of given log files, stored next to '
+                     'each log file with the suffix ".index". The index must '
+                     'be built again once the log file is modified.'),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    build_parser.add_argument(
+        '-b', '--block-size',
+        type=int,
+        default=BLOCK_SIZE,
+        help=('Number of bytes of the log file per block. Smaller blocks '
+              'make the index larger but less of the log file read.'))
+    build_parser.add_argument(
+        'logfiles',
+        nargs='+',
+        help='Log files.')
+    build_parser.set_defaults(func=_do_build)
+
+    info_parser = index_subparsers.add_parser(
+        'info',
+        description='Print a summary of the index of given log file.')
+    info_parser.add_argument(
+        'logfile',
+        help='Log file.')
+    info_parser.set_defaults(func=_do_info)
@@ -64,6 +64,9 @@ except ImportError:
 from .. import database
 from ..database.can.signal import NamedSignalValue
 from .. import errors
+from .. import logreader
+from ..logindex import LogIndex, iter_range_lines
+from .__utils__ import parse_frame_id_filter
 
 
 PYPLOT_BASE_COLORS = "bgrcmykwC"
@@ -291,6 +294,18 @@ class TimestampParser:
     def parse_seconds(timestamp):
         return float(timestamp)
 
+    def to_log_seconds(self, x):
+        '''
+        Convert a parsed timestamp to seconds as in the log file,
+        which is what log indexes store.
+        '''
+        if self._parse_timestamp == self.parse_absolute_timestamp:
+            return (x - datetime.datetime(1970, 1, 1)).total_seconds()
+        elif self._parse_timestamp == self.parse_absolute_seconds:
+            return x.timestamp()
+        else:
+            return x
+
     def get_label(self):
         if self.use_timestamp:
             if self.relative:
@@ -305,6 +320,104 @@ class TimestampParser:
 
         return label
 
+class _PlottedFrameIds:
+
+    '''
+    Contains the frame ids of messages with displayed signals
+    and of frames not in the database, which are reported.
+    '''
+
+    def __init__(self, frame_ids, known_frame_ids):
+        self.frame_ids = frame_ids
+        self.known_frame_ids = known_frame_ids
+
+    def __contains__(self, frame_id):
+        return frame_id in self.frame_ids or frame_id not in self.known_frame_ids
+
+def _get_frame_id_filter(args, dbase, signals):
+    '''
+    Return the frame ids of the frames to be decoded,
+    or None to decode all frames.
+    '''
+    frame_id_filter = parse_frame_id_filter(dbase,
+                                            args.frame_ids,
+                                            args.messages,
+                                            args.frame_id_mask)
+    if frame_id_filter is not None:
+        return frame_id_filter
+
+    # Frame ids in the log file may differ from those in the
+    # database in masked bits.
+    if args.frame_id_mask is not None:
+        return None
+
+    # Frames of all messages are decoded to report invalid data.
+    if args.show_invalid_data or not args.ignore_invalid_data:
+        return None
+
+    frame_ids = frozenset(
+        message.frame_id
+        for message in dbase.messages
+        if message.is_container or any(
+            signals.is_displayed_signal(message.name + '.' + signal.name)
+            for signal in message.signals))
+
+    if args.show_unknown_frames or not args.ignore_unknown_frames:
+        known_frame_ids = frozenset(message.frame_id
+                                    for message in dbase.messages)
+        return _PlottedFrameIds(frame_ids, known_frame_ids)
+
+    return frame_ids
+
+def _read_lines(args, timestamp_parser, frame_id_filter=None):
+    '''
+    Yield the lines of the log file or standard input.
+    If a time window is given and the log file has an up to date index
+    only the parts of the log file in the time window are read
+    once the first timestamp has been parsed.
+    '''
+    if args.log_file is None:
+        yield from iter(sys.stdin.readline, '')
+        return
+
+    index = None
+    if (args.start is not None or args.stop is not None
+        or isinstance(frame_id_filter, frozenset)):
+        index = LogIndex.load(args.log_file)
+
+    with open(args.log_file, 'rb') as fin:
+        position = 0
+        for line in iter(fin.readline, b''):
+            position += len(line)
+            yield line.decode('utf-8', 'replace')
+
+            if index is not None and timestamp_parser.use_timestamp is not None:
+                break
+        else:
+            return
+
+        if not timestamp_parser.use_timestamp:
+            for line in iter(fin.readline, b''):
+                yield line.decode('utf-8', 'replace')
+            return
+
+        start = args.start
+        if start is not None:
+            start = timestamp_parser.to_log_seconds(start)
+        stop = args.stop
+        if stop is not None:
+            stop = timestamp_parser.to_log_seconds(stop)
+
+        if not isinstance(frame_id_filter, frozenset):
+            frame_id_filter = None
+
+        ranges = [(max(begin, position), end)
+                  for begin, end in index.ranges(start, stop, frame_id_filter)
+                  if end > position]
+
+        for line in iter_range_lines(fin, ranges):
+            yield line.decode('utf-8', 'replace')
+
 def _do_decode(args):
     '''
     The entry point of the program.
@@ -346,19 +459,20 @@ def _do_decode(args):
         plt.style.use(args.style)
 
     plotter = Plotter(dbase, args)
+    frame_id_filter = _get_frame_id_filter(args, dbase, plotter.signals)
+    line_filter = logreader.Parser(frame_id_filter=frame_id_filter)
 
     line_number = 1
-    while True:
-        line = sys.stdin.readline()
-
-        # Break at EOF.
-        if not line:
-            break
-
+    for line in _read_lines(args, timestamp_parser, frame_id_filter):
         line = line.strip('\r\n')
         if not line:
             continue
 
+        # Skip frames of other messages without parsing them.
+        if frame_id_filter is not None and line_filter.is_filtered_out(line):
+            line_number += 1
+            continue
+
         # Auto-detect on first valid line.
         if re_format is None:
             mo = RE_CANDUMP.match(line)
@@ -375,6 +489,9 @@ def _do_decode(args):
 
         if mo:
             timestamp, frame_id, data = _mo_unpack(mo)
+            if frame_id_filter is not None and frame_id not in frame_id_filter:
+                line_number += 1
+                continue
             timestamp = timestamp_parser.parse_timestamp(timestamp, line_number)
             if args.start is not None and timestamp < args.start:
                 line_number += 1
@@ -875,6 +992,21 @@ def add_subparser(subparsers):
         '-o', '--output-file',
         help='A file to write the plot to instead of displaying it in a window.')
 
+    plot_parser.add_argument(
+        '--frame-ids',
+        help='Comma separated frame ids of the frames to decode. '
+             'Other lines are skipped after looking at their frame id. '
+             'With --ignore-invalid-data or --quiet only frames of messages '
+             'with signals to be plotted, and of unknown messages unless they '
+             'are ignored too, are decoded by default.')
+    plot_parser.add_argument(
+        '--messages',
+        help='Comma separated names of the messages to decode, in addition to --frame-ids.')
+    plot_parser.add_argument(
+        '--log-file',
+        help='A log file to read the frames from instead of standard input. '
+             'If it has an up to date index built by "cantools index build" '
+             'only the parts of it between --start and --stop are read.')
     plot_parser.add_argument(
         '-ss', '--start',
         help='A start time or line number. Everything before is ignored. '
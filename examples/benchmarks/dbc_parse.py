@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+#
+# Compares the time it takes to parse DBC files with the hand-written
+# parser and the grammar based textparser parser, and to load them
+# with lazy codecs using either parser. Times are in milliseconds.
+# Defaults to the largest DBC files in the test suite.
+#
+# > python3 dbc_parse.py
+# File                                          Fast  Textparser   Load fast   Load textparser
+# vehicle.dbc                                    8.5        34.6        20.6              37.1
+# abs.dbc                                        1.8         6.0         5.3              12.1
+# multiplex_2_dumped.dbc                         1.1         4.4         1.8               5.1
+# multiplex_2.dbc                                1.1         4.3         1.8               5.1
+# long_names_multiple_relations_dumped.dbc       0.8         2.8         1.3               3.4
+#
+
+import argparse
+import glob
+import os
+import timeit
+
+from cantools.database.can.formats import dbc
+
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+DBC_DIR = os.path.join(SCRIPT_DIR, '..', '..', 'tests', 'files', 'dbc')
+NUMBER_OF_FILES = 5
+
+
+def largest_files():
+    filenames = glob.glob(os.path.join(DBC_DIR, '*.dbc'))
+    filenames.sort(key=os.path.getsize, reverse=True)
+
+    return filenames[:NUMBER_OF_FILES]
+
+
+def measure(function, repeat):
+    return 1000 * min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-r', '--repeat',
+                        type=int,
+                        default=5,
+                        help='Number of measurements per file.')
+    parser.add_argument('infiles', nargs='*', help='DBC files.')
+    args = parser.parse_args()
+
+    print(f'{"File":<42}{"Fast":>8}{"Textparser":>12}{"Load fast":>12}'
+          f'{"Load textparser":>18}')
+
+    for filename in args.infiles or largest_files():
+        with open(filename, encoding='cp1252') as fin:
+            string = fin.read()
+
+        fast = measure(lambda: dbc.FastParser().parse(string), args.repeat)
+        grammar = measure(lambda: dbc.Parser().parse(string), args.repeat)
+        load_fast = measure(
+            lambda: dbc.load_string(string, strict=False, lazy_codecs=True),
+            args.repeat)
+        load_grammar = measure(
+            lambda: dbc.load_string(string,
+                                    strict=False,
+                                    lazy_codecs=True,
+                                    parser='textparser'),
+            args.repeat)
+        print(f'{os.path.basename(filename):<42}{fast:>8.1f}{grammar:>12.1f}'
+              f'{load_fast:>12.1f}{load_grammar:>18.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+#
+# Reports the memory used by a loaded database, in bytes per message.
+#
+# > python3 memory.py ../../tests/files/dbc/vehicle.dbc
+# Messages:                 217
+# Signals:                  462
+# Bytes per message:        9383
+#
+
+import argparse
+import gc
+import os
+import tracemalloc
+
+import cantools
+
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+VEHICLE_PATH = os.path.join(SCRIPT_DIR,
+                            '..',
+                            '..',
+                            'tests',
+                            'files',
+                            'dbc',
+                            'vehicle.dbc')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lazy-codecs',
+                        action='store_true',
+                        help='Create codecs when first needed.')
+    parser.add_argument('database', nargs='?', default=VEHICLE_PATH)
+    args = parser.parse_args()
+
+    gc.collect()
+    tracemalloc.start()
+    database = cantools.database.load_file(args.database,
+                                           strict=False,
+                                           lazy_codecs=args.lazy_codecs)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    number_of_messages = len(database.messages)
+    number_of_signals = sum(len(message.signals)
+                            for message in database.messages)
+
+    print(f'{"Messages:":<26}{number_of_messages}')
+    print(f'{"Signals:":<26}{number_of_signals}')
+    print(f'{"Bytes per message:":<26}{size // max(number_of_messages, 1)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+#
+# Compares the decoding speed of a message with three levels of nested
+# multiplexers using the recursive codec walk, the flat multiplexer
+# dispatch table and the compiled decoder.
+#
+# > python3 multiplexed_decode.py
+# Recursive codec walk:     14.99 us per frame
+# Flat dispatch table:      10.99 us per frame
+# Compiled decoder:         2.75 us per frame
+#
+
+import random
+import timeit
+
+from cantools.database.can import Message
+from cantools.database.can import Signal
+
+
+NUMBER_OF_FRAMES = 1000
+NUMBER_OF_REPEATS = 20
+MUX_1_IDS = range(16)
+MUX_2_IDS = range(8)
+MUX_3_IDS = range(4)
+SIGNALS_PER_BRANCH = 4
+
+
+def create_message():
+    signals = [
+        Signal('Mux1', start=0, length=8, is_multiplexer=True)
+    ]
+
+    for mux_1 in MUX_1_IDS:
+        mux_2_name = f'Mux2_{mux_1}'
+        signals.append(Signal(mux_2_name,
+                              start=8,
+                              length=8,
+                              is_multiplexer=True,
+                              multiplexer_ids=[mux_1],
+                              multiplexer_signal='Mux1'))
+
+        for mux_2 in MUX_2_IDS:
+            mux_3_name = f'Mux3_{mux_1}_{mux_2}'
+            signals.append(Signal(mux_3_name,
+                                  start=16,
+                                  length=8,
+                                  is_multiplexer=True,
+                                  multiplexer_ids=[mux_2],
+                                  multiplexer_signal=mux_2_name))
+
+            for mux_3 in MUX_3_IDS:
+                for index in range(SIGNALS_PER_BRANCH):
+                    signals.append(Signal(
+                        f'Signal_{mux_1}_{mux_2}_{mux_3}_{index}',
+                        start=24 + 16 * index,
+                        length=16,
+                        is_signed=True,
+                        scale=0.1,
+                        offset=-10,
+                        multiplexer_ids=[mux_3],
+                        multiplexer_signal=mux_3_name))
+
+    return Message(frame_id=0x100,
+                   name='Nested',
+                   length=16,
+                   signals=signals)
+
+
+def create_frames():
+    frames = []
+
+    for _ in range(NUMBER_OF_FRAMES):
+        payload = bytes([random.choice(MUX_1_IDS),
+                         random.choice(MUX_2_IDS),
+                         random.choice(MUX_3_IDS)])
+        payload += bytes(random.getrandbits(8) for _ in range(13))
+        frames.append(payload)
+
+    return frames
+
+
+def measure(name, function, frames):
+    def decode_all():
+        for frame in frames:
+            function(frame)
+
+    seconds = min(timeit.repeat(decode_all,
+                                number=1,
+                                repeat=NUMBER_OF_REPEATS))
+    print(f'{name + ":":<26}{1e6 * seconds / len(frames):.2f} us per frame')
+
+
+def main():
+    random.seed(0)
+    message = create_message()
+    frames = create_frames()
+
+    for frame in frames:
+        assert message._decode(message._codecs, frame, True, True, False) \
+            == message._decode_flat(frame, True, True, False) \
+            == message.decode(frame)
+
+    measure('Recursive codec walk',
+            lambda frame: message._decode(message._codecs,
+                                          frame,
+                                          True,
+                                          True,
+                                          False),
+            frames)
+    measure('Flat dispatch table',
+            lambda frame: message._decode_flat(frame, True, True, False),
+            frames)
+    measure('Compiled decoder', message.decode, frames)
+
+
+if __name__ == '__main__':
+    main()
@@ -38,6 +38,8 @@ setup(name='cantools',
       ],
       extras_require={
           'plot': ['matplotlib'],
+          'numpy': ['numpy'],
+          'watch': ["inotify_simple;platform_system=='Linux'"],
           'windows-all': ["windows-curses;platform_system=='Windows'"],
       },
       test_suite="tests",
@@ -2,6 +2,7 @@ import sys
 import os
 import re
 import shutil
+import subprocess
 import unittest
 import types
 import functools
@@ -360,6 +361,286 @@ IO_DEBUG(
                     actual_output = stdout.getvalue()
                     self.assertEqual(actual_output, expected_output)
 
+    def test_decode_jobs(self):
+        filename = 'test_decode_jobs.log'
+        frames = [
+            '(1594172461.968006) vcan0 0C8#F000000000000000',
+            '(1594172462.127684) vcan0 ERROR',
+            '',
+            '(1594172462.356874) vcan0 1F4#01020304',
+            '(1594172462.688432) vcan0 1F3#010203'
+        ]
+
+        with open(filename, 'w') as fout:
+            fout.write('not a frame\n')
+
+            for _ in range(200):
+                fout.write('\n'.join(frames) + '\n')
+
+        def decode(*options):
+            argv = [
+                'cantools',
+                'decode',
+                *options,
+                'tests/files/dbc/socialledge.dbc',
+                filename
+            ]
+            stdout = StringIO()
+
+            with patch('sys.stdout', stdout):
+                with patch('sys.argv', argv):
+                    cantools._main()
+
+            return stdout.getvalue()
+
+        try:
+            expected_output = decode()
+            self.assertEqual(expected_output.count('SENSOR_SONARS('), 200)
+
+            # Chunks of a few lines are decoded by two processes, and
+            # printed in order.
+            with patch('cantools.subparsers.decode.CHUNK_SIZE', 100):
+                self.assertEqual(decode('--jobs', '2'), expected_output)
+                self.assertEqual(decode('--jobs', '2', '--single-line'),
+                                 decode('--single-line'))
+        finally:
+            os.remove(filename)
+
+        # Parallel decoding requires a log file.
+        argv = [
+            'cantools',
+            'decode',
+            '--jobs', '2',
+            'tests/files/dbc/socialledge.dbc'
+        ]
+
+        with patch('sys.argv', argv):
+            with self.assertRaises(cantools.errors.Error) as cm:
+                cantools._main()
+
+        self.assertEqual(str(cm.exception), '--jobs requires a log file.')
+
+    def test_decode_frame_id_filter(self):
+        filename = 'test_decode_frame_id_filter.log'
+
+        with open(filename, 'w') as fout:
+            for _ in range(20):
+                fout.write('(1594172461.968006) vcan0 0C8#F000000000000000\n'
+                           '(1594172462.127684) vcan0 ERROR\n'
+                           '(1594172462.356874) vcan0 1F4#01020304\n')
+
+        def decode(*options):
+            argv = [
+                'cantools',
+                'decode',
+                '--single-line',
+                *options,
+                'tests/files/dbc/socialledge.dbc',
+                filename
+            ]
+            stdout = StringIO()
+
+            with patch('sys.stdout', stdout):
+                with patch('sys.argv', argv):
+                    cantools._main()
+
+            return stdout.getvalue()
+
+        try:
+            output = decode('--frame-ids', '0x1f4')
+            self.assertEqual(output.count('IO_DEBUG('), 20)
+            self.assertNotIn('ERROR', output)
+            self.assertNotIn('0C8#', output)
+            self.assertEqual(decode('--messages', 'IO_DEBUG'), output)
+
+            with patch('cantools.subparsers.decode.CHUNK_SIZE', 100):
+                self.assertEqual(decode('--jobs', '2', '--frame-ids', '500'),
+                                 output)
+
+            output = decode('--frame-ids', '0xc8', '--messages', 'IO_DEBUG')
+            self.assertEqual(output.count('IO_DEBUG('), 20)
+            self.assertEqual(output.count('0C8#'), 20)
+
+            with self.assertRaises(cantools.errors.Error) as cm:
+                decode('--messages', 'FOO')
+
+            self.assertEqual(str(cm.exception), "Unknown message 'FOO'.")
+        finally:
+            os.remove(filename)
+
+    def test_export(self):
+        import numpy as np
+
+        filename = 'test_export.log'
+        output_directory = 'test_export'
+
+        with open(filename, 'w') as fout:
+            for _ in range(5):
+                fout.write('(1594172461.968006) vcan0 0C8#F000000000000000\n'
+                           '(1594172462.127684) vcan0 ERROR\n'
+                           '(1594172462.127685) vcan0 0C8#F101FFFFFFFFFFFF\n'
+                           '(1594172462.356874) vcan0 1F4#01020304\n'
+                           '(1594172462.356875) vcan0 1F4#0102\n'
+                           '(1594172462.688432) vcan0 7FF#010203\n')
+
+        def export(*options):
+            argv = [
+                'cantools',
+                'export',
+                '-o', output_directory,
+                *options,
+                filename,
+                'tests/files/dbc/socialledge.dbc'
+            ]
+            stdout = StringIO()
+
+            with patch('sys.stdout', stdout):
+                with patch('sys.argv', argv):
+                    cantools._main()
+
+            return stdout.getvalue()
+
+        def read(name):
+            with open(os.path.join(output_directory, name)) as fin:
+                return fin.read()
+
+        try:
+            self.assertEqual(
+                export(),
+                'Skipped 5 frame(s) of message IO_DEBUG with too short data.\n')
+            self.assertEqual(sorted(os.listdir(output_directory)),
+                             ['IO_DEBUG.csv', 'SENSOR_SONARS.csv'])
+            self.assertEqual(
+                read('IO_DEBUG.csv'),
+                'timestamp,IO_DEBUG_test_unsigned,IO_DEBUG_test_enum,'
+                'IO_DEBUG_test_signed,IO_DEBUG_test_float\n'
+                + 5 * '1594172462.356874,1,2,3,2.0\n')
+            sonars = read('SENSOR_SONARS.csv')
+            self.assertEqual(
+                sonars.splitlines()[:3],
+                [
+                    'timestamp,SENSOR_SONARS_mux,SENSOR_SONARS_err_count,'
+                    'SENSOR_SONARS_left,SENSOR_SONARS_no_filt_left,'
+                    'SENSOR_SONARS_middle,SENSOR_SONARS_no_filt_middle,'
+                    'SENSOR_SONARS_right,SENSOR_SONARS_no_filt_right,'
+                    'SENSOR_SONARS_rear,SENSOR_SONARS_no_filt_rear',
+                    '1594172461.968006,0,15,0.0,,0.0,,0.0,,0.0,',
+                    '1594172462.127685,1,31,,409.5,,409.5,,409.5,,409.5'
+                ])
+            shutil.rmtree(output_directory)
+
+            # Batches of a few frames give the same output.
+            export('--batch-size', '2', '--messages', 'SENSOR_SONARS')
+            self.assertEqual(os.listdir(output_directory),
+                             ['SENSOR_SONARS.csv'])
+            self.assertEqual(read('SENSOR_SONARS.csv'), sonars)
+
+            export('--format', 'npz', '--batch-size', '3', '--no-scaling')
+
+            with np.load(os.path.join(output_directory,
+                                      'SENSOR_SONARS.npz')) as npz:
+                self.assertEqual(npz['timestamp'].tolist(),
+                                 5 * [1594172461.968006, 1594172462.127685])
+                self.assertEqual(npz['SENSOR_SONARS_mux'].tolist(), 5 * [0, 1])
+                self.assertEqual(npz['SENSOR_SONARS_left'].tolist(),
+                                 5 * [0, 4095])
+                self.assertEqual(npz['SENSOR_SONARS_left.mask'].tolist(),
+                                 5 * [False, True])
+
+            with patch('cantools.subparsers.export.pyarrow', None):
+                with self.assertRaises(cantools.errors.Error) as cm:
+                    export('--format', 'parquet')
+
+            self.assertEqual(str(cm.exception),
+                             'The parquet format requires pyarrow.')
+        finally:
+            os.remove(filename)
+
+            if os.path.exists(output_directory):
+                shutil.rmtree(output_directory)
+
+    def test_index_build_decode_window(self):
+        filename = 'test_index_build_decode_window.log'
+
+        with open(filename, 'w') as fout:
+            fout.write('not a frame\n')
+
+            for i in range(100):
+                fout.write(f'({1594172461 + i}.000000) vcan0 1F4#01020304\n')
+                fout.write(f'({1594172461 + i}.500000) vcan0 ERROR\n')
+
+        def decode(*options):
+            argv = [
+                'cantools',
+                'decode',
+                '--single-line',
+                '--start', '1594172511',
+                '--stop', '1594172512.5',
+                *options,
+                'tests/files/dbc/socialledge.dbc',
+                filename
+            ]
+            stdout = StringIO()
+
+            with patch('sys.stdout', stdout):
+                with patch('sys.argv', argv):
+                    cantools._main()
+
+            return stdout.getvalue()
+
+        expected_frames = [
+            '(1594172511.000000) vcan0 1F4#01020304 :: IO_DEBUG(IO_DEBUG_test_unsigned: 1, IO_DEBUG_test_enum: IO_DEBUG_test2_enum_two, IO_DEBUG_test_signed: 3, IO_DEBUG_test_float: 2.0)',
+            '(1594172512.000000) vcan0 1F4#01020304 :: IO_DEBUG(IO_DEBUG_test_unsigned: 1, IO_DEBUG_test_enum: IO_DEBUG_test2_enum_two, IO_DEBUG_test_signed: 3, IO_DEBUG_test_float: 2.0)'
+        ]
+
+        def frames(output):
+            return [line for line in output.splitlines() if '::' in line]
+
+        try:
+            # Without an index the whole log file is read. Lines which
+            # are not frames are not printed.
+            output = decode()
+            self.assertEqual(frames(output), expected_frames)
+            self.assertEqual(output.splitlines(), expected_frames)
+            self.assertEqual(decode('--frame-ids', '0x1f4'), output)
+
+            argv = [
+                'cantools',
+                'index',
+                'build',
+                '--block-size', '200',
+                filename
+            ]
+
+            with patch('sys.argv', argv):
+                cantools._main()
+
+            self.assertTrue(os.path.exists(filename + '.index'))
+
+            # With the index only blocks around the time window are
+            # read, instead of the log file line by line, and the
+            # output is the same.
+            with patch.object(cantools.logreader.Parser,
+                              '_readlines',
+                              side_effect=AssertionError):
+                self.assertEqual(decode(), output)
+                self.assertEqual(decode('--frame-ids', '0x1f4'), output)
+
+            with patch('cantools.subparsers.decode.CHUNK_SIZE', 100):
+                self.assertEqual(decode('--jobs', '2'), output)
+
+            # An out of date index is not used.
+            with open(filename, 'a') as fout:
+                fout.write('(1594172600.000000) vcan0 1F4#01020304\n')
+
+            self.assertIsNone(cantools.logindex.LogIndex.load(filename))
+            self.assertEqual(decode(), output)
+        finally:
+            os.remove(filename)
+
+            if os.path.exists(filename + '.index'):
+                os.remove(filename + '.index')
+
     def test_decode_muxed_data(self):
         argv = [
             'cantools',
@@ -1254,6 +1535,37 @@ BATTERY_VT(
                 str(cm.exception),
                 "error: Unsupported output database format 'foo'.")
 
+    def test_cache(self):
+        cache_dir = 'test_command_line_cache'
+
+        if os.path.exists(cache_dir):
+            shutil.rmtree(cache_dir)
+
+        argv = [
+            'cantools',
+            'cache',
+            'warm',
+            cache_dir,
+            'tests/files/dbc/motohawk.dbc',
+            'tests/files/dbc/foobar.dbc'
+        ]
+
+        with patch('sys.argv', argv):
+            cantools._main()
+
+        for subcommand, databases in [('info', 2), ('clear', None), ('info', 0)]:
+            argv = ['cantools', 'cache', subcommand, cache_dir]
+            stdout = StringIO()
+
+            with patch('sys.stdout', stdout):
+                with patch('sys.argv', argv):
+                    cantools._main()
+
+            if databases is not None:
+                self.assertIn(f'Databases:  {databases}\n', stdout.getvalue())
+
+        shutil.rmtree(cache_dir)
+
     def test_generate_c_source(self):
         databases = [
             'motohawk',
@@ -1447,6 +1759,249 @@ BATTERY_VT(
         self.assert_files_equal(database_c,
                                 'tests/files/c_source/' + os.path.basename(database_c))
 
+    def test_generate_c_source_infolder_jobs(self):
+        input_directory = 'some_networks'
+        output_directory = 'some_networks_output'
+
+        shutil.rmtree(input_directory, ignore_errors=True)
+        shutil.rmtree(output_directory, ignore_errors=True)
+
+        for network, database in [('Primary', 'motohawk'),
+                                  ('Secondary', 'abs')]:
+            os.makedirs(os.path.join(input_directory, network))
+            shutil.copy(f'tests/files/dbc/{database}.dbc',
+                        os.path.join(input_directory, network))
+
+        argv = [
+            'cantools',
+            'generate_c_source',
+            '--jobs', '2',
+            '--timings',
+            '--output-directory', output_directory,
+            '--infolder', input_directory
+        ]
+
+        stdout = StringIO()
+
+        with patch('sys.stdout', stdout):
+            with patch('sys.argv', argv):
+                cantools._main()
+
+        # The output is printed in network order.
+        lines = stdout.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith(
+            f'Successfully generated {output_directory}/lib/primary/'))
+        self.assertTrue(lines[1].startswith(
+            f'Successfully generated {output_directory}/lib/secondary/'))
+        self.assertTrue(lines[2].startswith('canlib_device: generate '))
+        self.assertTrue(lines[3].startswith('primary: load '))
+        self.assertTrue(lines[4].startswith('secondary: load '))
+
+        for filename in ['lib/canlib_device.h',
+                         'lib/primary/primary_network.c',
+                         'lib/secondary/secondary_network.c',
+                         'proto/secondary/secondary.proto']:
+            self.assertTrue(
+                os.path.exists(os.path.join(output_directory, filename)))
+
+        # Errors are reported per network.
+        os.makedirs(os.path.join(input_directory, 'Broken'))
+
+        with open(os.path.join(input_directory, 'Broken', 'broken.dbc'),
+                  'w') as fout:
+            fout.write('BO_ x')
+
+        stderr = StringIO()
+
+        with patch('sys.stdout', StringIO()):
+            with patch('sys.stderr', stderr):
+                with patch('sys.argv', argv):
+                    with self.assertRaises(cantools.errors.Error) as cm:
+                        cantools._main()
+
+        self.assertEqual(str(cm.exception),
+                         'Failed to generate 1 of 3 networks: broken.')
+        self.assertTrue(stderr.getvalue().startswith('error: broken: '))
+
+        shutil.rmtree(input_directory)
+        shutil.rmtree(output_directory)
+
+    def test_generate_c_source_incremental(self):
+        input_directory = 'some_networks'
+        output_directory = 'some_networks_output'
+
+        shutil.rmtree(input_directory, ignore_errors=True)
+        shutil.rmtree(output_directory, ignore_errors=True)
+
+        for network, database in [('Primary', 'motohawk'),
+                                  ('Secondary', 'abs')]:
+            os.makedirs(os.path.join(input_directory, network))
+            shutil.copy(f'tests/files/dbc/{database}.dbc',
+                        os.path.join(input_directory, network))
+
+        def generate(*options):
+            argv = [
+                'cantools',
+                'generate_c_source',
+                '--incremental',
+                '--output-directory', output_directory,
+                '--infolder', input_directory,
+                *options
+            ]
+            stdout = StringIO()
+
+            with patch('sys.stdout', stdout):
+                with patch('sys.argv', argv):
+                    cantools._main()
+
+            return [line.split(' ')[:3] for line in stdout.getvalue().splitlines()]
+
+        primary_h = os.path.join(output_directory, 'lib/primary/primary_network.h')
+        primary_proto = os.path.join(output_directory, 'proto/primary/primary.proto')
+
+        self.assertEqual(generate(),
+                         [
+                             ['Successfully', 'generated', primary_h],
+                             ['Successfully', 'generated',
+                              os.path.join(output_directory,
+                                           'lib/secondary/secondary_network.h')]
+                         ])
+        mtime_h = os.stat(primary_h).st_mtime_ns
+        mtime_proto = os.stat(primary_proto).st_mtime_ns
+
+        # Nothing changed.
+        self.assertEqual(generate(),
+                         [
+                             ['primary', 'is', 'up'],
+                             ['secondary', 'is', 'up']
+                         ])
+
+        # Changed options regenerate all networks, but only files
+        # with changed contents are written.
+        self.assertEqual(generate('--use-float')[0],
+                         ['Successfully', 'generated', primary_h])
+        self.assertNotEqual(os.stat(primary_h).st_mtime_ns, mtime_h)
+        self.assertEqual(os.stat(primary_proto).st_mtime_ns, mtime_proto)
+
+        # Missing output files are generated again.
+        os.remove(primary_proto)
+
+        self.assertEqual(generate('--use-float'),
+                         [
+                             ['Successfully', 'generated', primary_h],
+                             ['secondary', 'is', 'up']
+                         ])
+        self.assertTrue(os.path.exists(primary_proto))
+
+        shutil.rmtree(input_directory)
+        shutil.rmtree(output_directory)
+
+    def test_generate_c_source_watch(self):
+        input_directory = 'some_networks'
+        output_directory = 'some_networks_output'
+
+        shutil.rmtree(input_directory, ignore_errors=True)
+        shutil.rmtree(output_directory, ignore_errors=True)
+
+        for network, database in [('Primary', 'motohawk'),
+                                  ('Secondary', 'abs')]:
+            os.makedirs(os.path.join(input_directory, network))
+            shutil.copy(f'tests/files/dbc/{database}.dbc',
+                        os.path.join(input_directory, network))
+
+        primary_dbc = os.path.join(input_directory, 'Primary', 'motohawk.dbc')
+        primary_h = os.path.join(output_directory,
+                                 'lib/primary/primary_network.h')
+
+        def modify_primary():
+            with open(primary_dbc, 'a') as fout:
+                fout.write('\nBO_ 1 Added: 8 Vector__XXX\n')
+
+        def break_primary():
+            with open(primary_dbc, 'a') as fout:
+                fout.write('\nBO_ x\n')
+
+        # Each call to wait() makes a change and returns the changed
+        # folders, until interrupted.
+        changes = [
+            (modify_primary, ['Primary']),
+            (lambda: None, ['Primary', 'Secondary']),
+            (break_primary, ['Primary']),
+        ]
+
+        class Watcher:
+
+            def wait(self):
+                if not changes:
+                    raise KeyboardInterrupt()
+
+                change, folders = changes.pop(0)
+                change()
+
+                return {os.path.join(input_directory, folder)
+                        for folder in folders}
+
+            def close(self):
+                pass
+
+        argv = [
+            'cantools',
+            'generate_c_source',
+            '--watch',
+            '--output-directory', output_directory,
+            '--infolder', input_directory
+        ]
+        stdout = StringIO()
+        stderr = StringIO()
+
+        with patch('cantools.subparsers.generate_c_source._create_watcher',
+                   return_value=Watcher()):
+            with patch('sys.stdout', stdout):
+                with patch('sys.stderr', stderr):
+                    with patch('sys.argv', argv):
+                        cantools._main()
+
+        # Only changed networks are generated again.
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(lines[2].startswith('Watching '))
+        self.assertTrue(lines[3].startswith(f'Successfully generated {primary_h}'))
+        self.assertTrue(lines[4].startswith('Regenerated primary in '))
+
+        with open(primary_h) as fin:
+            self.assertIn('ADDED', fin.read().upper())
+
+        # Errors are printed and watching continues.
+        self.assertTrue(stderr.getvalue().startswith('error: primary: '))
+
+        shutil.rmtree(input_directory)
+        shutil.rmtree(output_directory)
+
+    def test_generate_c_source_polling_watcher(self):
+        from cantools.subparsers.generate_c_source import _PollingWatcher
+
+        input_directory = 'some_networks'
+
+        shutil.rmtree(input_directory, ignore_errors=True)
+        os.makedirs(os.path.join(input_directory, 'Primary'))
+        os.makedirs(os.path.join(input_directory, 'Secondary'))
+
+        watcher = _PollingWatcher(input_directory, 0.01)
+
+        with open(os.path.join(input_directory, 'Secondary', 'a.dbc'),
+                  'w') as fout:
+            fout.write('VERSION ""')
+
+        self.assertEqual(watcher.wait(),
+                         {os.path.join(input_directory, 'Secondary')})
+
+        shutil.rmtree(os.path.join(input_directory, 'Primary'))
+
+        self.assertEqual(watcher.wait(),
+                         {os.path.join(input_directory, 'Primary')})
+
+        shutil.rmtree(input_directory)
+
     def test_generate_c_source_bit_fields(self):
         databases = [
             'motohawk',
@@ -1519,6 +2074,157 @@ BATTERY_VT(
                 self.assert_files_equal(database_c,
                                         'tests/files/c_source/' + expected_database_c)
 
+    def test_generate_c_source_json_senders(self):
+        # A message sent by several nodes is generated once per
+        # sender. The structs of the copies are typedefs of the struct
+        # of the first one.
+        input_directory = 'some_networks'
+        output_directory = 'some_networks_output'
+
+        shutil.rmtree(input_directory, ignore_errors=True)
+        os.makedirs(os.path.join(input_directory, 'Primary'))
+
+        with open(os.path.join(input_directory, 'Primary', 'network.json'),
+                  'w') as fout:
+            fout.write('{"types": {}, "messages": [{"name": "Temp", '
+                       '"topic": "BMS", "priority": 1, '
+                       '"sending": ["BMS", "ECU", "INV"], '
+                       '"receiving": ["LOG"], '
+                       '"contents": {"a": "uint8", "b": "uint16"}}]}')
+
+        shutil.rmtree(output_directory, ignore_errors=True)
+        argv = [
+            'cantools',
+            'generate_c_source',
+            '--output-directory', output_directory,
+            '--infolder', input_directory
+        ]
+
+        with patch('sys.stdout', StringIO()):
+            with patch('sys.argv', argv):
+                cantools._main()
+
+        library_directory = os.path.join(output_directory, 'lib', 'primary')
+
+        with open(os.path.join(library_directory, 'primary_network.h')) as fin:
+            header = fin.read()
+
+        self.assertIn('} primary_temp_bms_t;', header)
+        self.assertIn('typedef primary_temp_bms_t primary_temp_ecu_t;', header)
+        self.assertIn('typedef primary_temp_bms_t primary_temp_inv_t;', header)
+
+        with open(os.path.join(library_directory, 'primary_network.c')) as fin:
+            source = fin.read()
+
+        self.assertIn('    return primary_temp_bms_pack(\n'
+                      '        dst_p,\n'
+                      '        src_p,\n',
+                      source)
+
+        # The copies use the proto message of the first one.
+        with open(os.path.join(output_directory, 'proto', 'primary',
+                               'primary.proto')) as fin:
+            proto = fin.read()
+
+        self.assertNotIn('message TEMP_INV', proto)
+        self.assertIn('repeated TEMP_BMS TEMP_INV = 3;', proto)
+
+        # The copies are packed and unpacked without type punning.
+        if shutil.which('gcc') is not None:
+            subprocess.run(['gcc',
+                            '-O2',
+                            '-Wall',
+                            '-Wstrict-aliasing=1',
+                            '-Werror',
+                            '-c', os.path.join(library_directory,
+                                               'primary_network.c'),
+                            '-o', os.devnull],
+                           check=True)
+
+        shutil.rmtree(input_directory)
+        shutil.rmtree(output_directory)
+
+    def test_generate_c_source_json_id_allocations(self):
+        input_directory = 'some_networks'
+        output_directory = 'some_networks_output'
+        network_json = os.path.join(input_directory, 'Primary', 'network.json')
+        lockfile = os.path.join(output_directory, 'ids.json')
+
+        shutil.rmtree(input_directory, ignore_errors=True)
+        shutil.rmtree(output_directory, ignore_errors=True)
+        os.makedirs(os.path.join(input_directory, 'Primary'))
+
+        def generate(names, options=('--id-allocations', lockfile)):
+            messages = ', '.join(
+                f'{{"name": "{name}", "topic": "BMS", "priority": 1, '
+                f'"sending": ["BMS"], "receiving": ["ECU"], '
+                f'"contents": {{"a": "uint8"}}}}'
+                for name in names)
+
+            with open(network_json, 'w') as fout:
+                fout.write(f'{{"types": {{}}, "messages": [{messages}]}}')
+
+            argv = [
+                'cantools',
+                'generate_c_source',
+                '--output-directory', output_directory,
+                '--infolder', input_directory,
+                *options
+            ]
+
+            with patch('sys.stdout', StringIO()):
+                with patch('sys.argv', argv):
+                    cantools._main()
+
+            with open(os.path.join(output_directory, 'lib', 'primary',
+                                   'primary_network.h')) as fin:
+                return re.findall(r'#define PRIMARY_ID_(\w+) (0x\w+)',
+                                  fin.read())
+
+        self.assertEqual(generate(['Foo', 'Bar']),
+                         [('FOO', '0x200'), ('BAR', '0x208')])
+
+        with open(lockfile) as fin:
+            self.assertEqual(fin.read(),
+                             '{\n'
+                             '    "primary": {\n'
+                             '        "Bar": 520,\n'
+                             '        "Foo": 512\n'
+                             '    }\n'
+                             '}\n')
+
+        # Nothing is written to the input folder.
+        self.assertEqual(os.listdir(os.path.join(input_directory, 'Primary')),
+                         ['network.json'])
+
+        # A new message first in the file does not change the ids of
+        # the others.
+        self.assertEqual(generate(['Fie', 'Foo', 'Bar']),
+                         [('FIE', '0x210'), ('FOO', '0x200'), ('BAR', '0x208')])
+
+        # Removed messages free their ids.
+        self.assertEqual(generate(['Fie', 'Bar', 'Fum']),
+                         [('FIE', '0x210'), ('BAR', '0x208'), ('FUM', '0x200')])
+
+        # Changing the lockfile regenerates the network when
+        # generating incrementally.
+        options = ('--id-allocations', lockfile, '--incremental')
+        self.assertEqual(generate(['Fie', 'Bar', 'Fum'], options),
+                         [('FIE', '0x210'), ('BAR', '0x208'), ('FUM', '0x200')])
+
+        with open(lockfile, 'w') as fout:
+            fout.write('{"primary": {"Fie": 512}}')
+
+        self.assertEqual(generate(['Fie', 'Bar', 'Fum'], options),
+                         [('FIE', '0x200'), ('BAR', '0x208'), ('FUM', '0x210')])
+
+        # Without the lockfile the ids are given in message order.
+        self.assertEqual(generate(['Fum', 'Fie', 'Bar'], ()),
+                         [('FUM', '0x200'), ('FIE', '0x208'), ('BAR', '0x210')])
+
+        shutil.rmtree(input_directory)
+        shutil.rmtree(output_directory)
+
     def test_generate_c_source_generate_fuzzer(self):
         argv = [
             'cantools',
@@ -2,6 +2,7 @@
 
 import sys
 import math
+import json
 import unittest
 from decimal import Decimal
 from collections import namedtuple
@@ -13,6 +14,7 @@ import shutil
 import logging
 from xml.etree import ElementTree
 import timeit
+import warnings
 
 import cantools.autosar
 from cantools.database.utils import prune_signal_choices, sort_choices_by_value, sort_signals_by_name
@@ -24,6 +26,7 @@ except ImportError:
 
 import cantools
 from cantools.database.can.formats import dbc
+from cantools.database.can.formats import json as json_format
 from cantools.database import UnsupportedDatabaseFormatError
 from cantools.database.can.signal import NamedSignalValue
 
@@ -3126,6 +3129,221 @@ class CanToolsDatabaseTest(unittest.TestCase):
             "error: line 1, column 0\", SYM: \"Only SYM version 6.0 is "
             "supported.\", CDD: \"syntax error: line 1, column 0\"")
 
+    def test_dbc_fast_parser(self):
+        """The hand-written parser creates the same parse tree as the
+        grammar based parser.
+
+        """
+
+        directory = 'tests/files/dbc'
+
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith('.dbc'):
+                continue
+
+            with open(os.path.join(directory, filename),
+                      encoding='cp1252') as fin:
+                string = fin.read()
+
+            try:
+                expected = dbc.Parser().parse(string)
+            except textparser.ParseError:
+                self.assertIsNone(dbc.FastParser().parse(string), filename)
+            else:
+                self.assertEqual(dbc.FastParser().parse(string),
+                                 expected,
+                                 filename)
+
+        # Syntax errors are reported by the grammar based parser.
+        self.assertIsNone(dbc.FastParser().parse('VERSION "1.0"\n'
+                                                 'BO_ dssd\n'))
+        self.assertIsNone(dbc.FastParser().parse('CM_ BO_ "Foo.";'))
+        self.assertIsNone(dbc.FastParser().parse('VERSION "1.0" $'))
+
+        db = cantools.db.Database()
+        db.add_dbc_file('tests/files/dbc/vehicle.dbc', parser='textparser')
+        db_fast = cantools.db.Database()
+        db_fast.add_dbc_file('tests/files/dbc/vehicle.dbc')
+        self.assertEqual(db_fast.as_dbc_string(), db.as_dbc_string())
+
+        with self.assertRaises(ValueError) as cm:
+            dbc.load_string('VERSION "1.0"', parser='foo')
+
+        self.assertEqual(str(cm.exception), "Invalid DBC parser 'foo'.")
+
+    def test_message_filter(self):
+        """Only messages selected by a message filter are loaded.
+
+        """
+
+        MessageFilter = cantools.database.can.MessageFilter
+        filename = 'tests/files/dbc/foobar.dbc'
+
+        def load_names(filename, **kwargs):
+            db = cantools.database.load_file(
+                filename,
+                message_filter=MessageFilter(**kwargs))
+
+            return [message.name for message in db.messages]
+
+        self.assertEqual(load_names(filename, messages=['Fum', 'Missing']),
+                         ['Fum'])
+        self.assertEqual(load_names(filename, frame_ids=[0x12332, 0x30c]),
+                         ['Bar', 'FOOBAR'])
+        self.assertEqual(load_names(filename, nodes=['FUM']),
+                         ['Bar', 'CanFd'])
+        self.assertEqual(load_names(filename, nodes=['FIE', 'BAR']),
+                         ['Foo', 'Fum', 'Bar', 'FOOBAR'])
+        self.assertEqual(load_names(filename, buses=['TheBusName']),
+                         ['Foo', 'Fum', 'Bar', 'CanFd', 'FOOBAR'])
+        self.assertEqual(load_names(filename, buses=['OtherBus']), [])
+        self.assertEqual(
+            load_names(filename,
+                       nodes=['FOO'],
+                       predicate=lambda message: message.length > 8),
+            ['CanFd'])
+
+        # Nodes and buses of KCD messages.
+        self.assertEqual(load_names('tests/files/kcd/the_homer.kcd',
+                                    nodes=['BodyControl', 'BodyComputer'],
+                                    buses=['Instrumentation']),
+                         ['Headlights', 'Wiper', 'BCC'])
+        self.assertEqual(load_names('tests/files/sym/jopp-6.0.sym',
+                                    messages=['Symbol1', 'Symbol2']),
+                         ['Symbol1', 'Symbol2'])
+
+        # ARXML messages are selected by their nodes once all senders
+        # and receivers are known.
+        self.assertEqual(load_names('tests/files/arxml/system-4.2.arxml',
+                                    nodes=['Guard', 'Dancer']),
+                         ['Message1', 'Message2', 'OneToContainThemAll',
+                          'AlarmStatus'])
+
+        # The filter is kept when adding more data to the database.
+        db = cantools.db.Database(
+            message_filter=MessageFilter(messages=['Foo']))
+        db.add_dbc_file(filename)
+        db.add_kcd_file('tests/files/kcd/the_homer.kcd')
+        self.assertEqual([message.name for message in db.messages], ['Foo'])
+
+    def test_json_id_allocation(self):
+        def json_message(name, priority, sending, topic='BMS'):
+            return {
+                'name': name,
+                'topic': topic,
+                'priority': priority,
+                'sending': sending,
+                'receiving': ['ECU'],
+                'contents': {'value': 'uint8'}
+            }
+
+        def load_ids(messages, id_allocations=None):
+            db = cantools.db.Database()
+            db.add_json_string(json.dumps({'types': {}, 'messages': messages}),
+                               id_allocations)
+
+            return {message.name: message.frame_id for message in db.messages}
+
+        messages = [
+            json_message('Voltage', 1, ['BMS']),
+            json_message('Temp', 1, ['BMS', 'ECU']),
+            json_message('Speed', 2, ['ECU'], 'ECU'),
+            {
+                'name': 'Hello',
+                'fixed_id': 520,
+                'priority': 1,
+                'sending': ['ECU'],
+                'receiving': [],
+                'contents': {'value': 'uint8'}
+            }
+        ]
+        ids = load_ids(messages)
+        self.assertEqual(ids,
+                         {
+                             'Voltage': 512,
+                             'Temp_BMS': 528,
+                             'Temp_ECU': 536,
+                             'Speed': 1025,
+                             'Hello': 520
+                         })
+
+        # Adding a message shifts the following ids, unless the
+        # previous allocations are given.
+        messages.insert(0, json_message('Current', 1, ['BMS']))
+        self.assertEqual(load_ids(messages)['Voltage'], 520 + 8)
+        new_ids = load_ids(messages, ids)
+        self.assertEqual({name: new_ids[name] for name in ids}, ids)
+        self.assertEqual(new_ids['Current'], 544)
+
+        # Previous ids of another priority band are not kept.
+        messages[1]['priority'] = 3
+        self.assertEqual(load_ids(messages, ids)['Voltage'], 1536)
+
+        allocator = json_format.IdAllocator({'messages': messages}, [], ids)
+        self.assertEqual(allocator.utilisation()['BMS'][1],
+                         {'allocated': 3, 'reserved': 1, 'free': 60})
+        self.assertEqual(allocator.utilisation()['BMS'][3],
+                         {'allocated': 1, 'reserved': 0, 'free': 63})
+
+        with self.assertRaises(Exception) as cm:
+            json_format.IdAllocator(
+                {
+                    'messages': [
+                        json_message(f'M{i}', 0, ['BMS']) for i in range(65)
+                    ]
+                })
+
+        self.assertEqual(str(cm.exception), 'No more messages (>64)')
+
+    def test_json_message_templates(self):
+        network = {
+            'types': {},
+            'messages': [
+                {
+                    'name': 'Temp',
+                    'topic': 'BMS',
+                    'priority': 1,
+                    'sending': ['BMS', 'ECU', 'INV'],
+                    'receiving': ['LOG'],
+                    'contents': {'a': 'uint8', 'b': 'uint16'}
+                }
+            ]
+        }
+
+        for lazy_codecs in [False, True]:
+            db = cantools.db.Database(lazy_codecs=lazy_codecs)
+            db.add_json_string(json.dumps(network))
+            temp_bms, temp_ecu, temp_inv = db.messages
+
+            # The messages of other senders are copies of the first
+            # one.
+            self.assertIsNone(temp_bms.template)
+            self.assertIs(temp_ecu.template, temp_bms)
+            self.assertIs(temp_inv.template, temp_bms)
+            self.assertEqual(temp_inv.name, 'Temp_INV')
+            self.assertNotEqual(temp_inv.frame_id, temp_bms.frame_id)
+            self.assertIs(temp_inv.signals[1], temp_bms.signals[1])
+
+            encoded = temp_inv.encode({'a': 1, 'b': 515})
+            self.assertEqual(encoded, b'\x01\x03\x02')
+            self.assertEqual(temp_inv.decode(encoded), {'a': 1, 'b': 515})
+            self.assertIs(temp_inv._codecs, temp_bms._codecs)
+
+        # Once its signals are changed the message is no longer a
+        # copy.
+        temp_inv.signals.pop()
+        temp_inv.refresh()
+        self.assertIsNone(temp_inv.template)
+        self.assertIs(temp_ecu.template, temp_bms)
+        self.assertEqual(temp_inv.decode(b'\x05\x00\x00'), {'a': 5})
+        self.assertEqual(temp_bms.decode(b'\x05\x00\x00'), {'a': 5, 'b': 0})
+
+        # Compiled databases keep the copies.
+        db = cantools.database.can.formats.cdb.load_bytes(
+            cantools.database.can.formats.cdb.dump_bytes(db))
+        temp_bms, temp_ecu, _ = db.messages
+        self.assertIs(temp_ecu.template, temp_bms)
+
     def test_get_node_by_name(self):
         db = cantools.db.load_file('tests/files/kcd/the_homer.kcd')
 
@@ -4468,6 +4686,94 @@ class CanToolsDatabaseTest(unittest.TestCase):
             str(cm.exception),
             'ARXML: "Could not parse AUTOSAR version \'4.2.2.1.0\'"')
 
+    def test_arxml_index(self):
+        """The ARXML paths collected while parsing are the same as when
+        walking the tree.
+
+        """
+
+        from cantools.database.can.formats.arxml.index import iterparse_arxml
+
+        for filename in ['tests/files/arxml/system-4.2.arxml',
+                         'tests/files/arxml/system-3.2.3.arxml',
+                         'tests/files/arxml/ecu-extract-4.2.arxml']:
+            root, arxml_index = iterparse_arxml(filename)
+            walked = cantools.db.can.formats.arxml.SystemLoader(root,
+                                                                strict=False)
+            indexed = cantools.db.can.formats.arxml.SystemLoader(
+                root,
+                strict=False,
+                arxml_index=arxml_index)
+
+            # Elements without children are only indexed if they are
+            # references.
+            self.assertEqual(indexed._node_to_arxml_path,
+                             {
+                                 elem: path
+                                 for elem, path in walked._node_to_arxml_path.items()
+                                 if len(elem) > 0 or elem.tag.endswith('-REF')
+                             })
+            self.assertEqual(indexed._arxml_path_to_node,
+                             walked._arxml_path_to_node)
+            self.assertEqual(indexed._package_refbase_paths,
+                             walked._package_refbase_paths)
+            self.assertEqual(indexed._package_default_refbase_path,
+                             walked._package_default_refbase_path)
+
+        # Short names after other children are found by walking the
+        # tree.
+        root, arxml_index = iterparse_arxml(StringIO(
+            '<AUTOSAR xmlns="http://autosar.org/schema/r4.0">'
+            '<AR-PACKAGES><AR-PACKAGE><ELEMENTS/><SHORT-NAME>Foo</SHORT-NAME>'
+            '</AR-PACKAGE></AR-PACKAGES></AUTOSAR>'))
+        self.assertIsNone(arxml_index)
+        loader = cantools.db.can.formats.arxml.SystemLoader(root, strict=False)
+        self.assertEqual(list(loader._arxml_path_to_node), ['/Foo'])
+
+        # Unused package elements are dropped while parsing.
+        with open('tests/files/arxml/system-4.2.arxml') as fin:
+            document = fin.read()
+
+        swc = ('<APPLICATION-SW-COMPONENT-TYPE><SHORT-NAME>Swc</SHORT-NAME>'
+               '<PORTS><P-PORT-PROTOTYPE><SHORT-NAME>Port</SHORT-NAME>'
+               '</P-PORT-PROTOTYPE></PORTS></APPLICATION-SW-COMPONENT-TYPE>')
+        document_with_swc = document.replace(
+            '<AR-PACKAGES>',
+            '<AR-PACKAGES><AR-PACKAGE><SHORT-NAME>Swcs</SHORT-NAME>'
+            f'<ELEMENTS>{swc}</ELEMENTS></AR-PACKAGE>',
+            1)
+        root, arxml_index = iterparse_arxml(StringIO(document_with_swc))
+        self.assertEqual(arxml_index.number_of_dropped_elements, 1)
+        self.assertIn('/Swcs', arxml_index.arxml_path_to_node)
+        self.assertNotIn('/Swcs/Swc', arxml_index.arxml_path_to_node)
+        self.assertNotIn('/Swcs/Swc/Port', arxml_index.arxml_path_to_node)
+        self.assertEqual(
+            str(cantools.db.load_string(document_with_swc,
+                                        database_format='arxml')),
+            str(cantools.db.load_string(document, database_format='arxml')))
+
+        # Duplicated paths.
+        with self.assertRaises(UnsupportedDatabaseFormatError) as cm:
+            cantools.db.load_string(
+                '<AUTOSAR xmlns="http://autosar.org/schema/r4.0">'
+                '<AR-PACKAGES>'
+                '<AR-PACKAGE><SHORT-NAME>Foo</SHORT-NAME></AR-PACKAGE>'
+                '<AR-PACKAGE><SHORT-NAME>Foo</SHORT-NAME></AR-PACKAGE>'
+                '</AR-PACKAGES></AUTOSAR>',
+                database_format='arxml')
+
+        self.assertEqual(
+            str(cm.exception),
+            'ARXML: "File contains multiple elements with path \'/Foo\'"')
+
+        # Files are parsed incrementally.
+        with open('tests/files/arxml/system-4.2.arxml') as fin:
+            db = cantools.db.load(fin, database_format='arxml')
+            fin.seek(0)
+            db_string = cantools.db.load_string(fin.read())
+
+        self.assertEqual(str(db), str(db_string))
+
     def test_arxml_version(self):
         root = ElementTree.parse('tests/files/arxml/system-4.2.arxml').getroot()
         loader = cantools.db.can.formats.arxml.SystemLoader(root, strict=False)
@@ -6188,6 +6494,89 @@ class CanToolsDatabaseTest(unittest.TestCase):
         self.assertEqual(sig.choices[1], 'DRIVER_HEARTBEAT_cmd_SYNC')
         self.assertEqual(sig.choices[2], 'DRIVER_HEARTBEAT_cmd_REBOOT')
 
+    def test_compiled_database(self):
+        filename = 'tests/files/dbc/socialledge.dbc'
+        db = cantools.database.load_file(filename, prune_choices=True)
+        cantools.database.dump_file(db, 'test_compiled_database.cdb')
+        compiled_db = cantools.database.load_file('test_compiled_database.cdb')
+        os.remove('test_compiled_database.cdb')
+
+        self.assertEqual(repr(compiled_db), repr(db))
+        self.assertEqual(compiled_db.as_dbc_string(), db.as_dbc_string())
+        message = compiled_db.get_message_by_name('DRIVER_HEARTBEAT')
+        self.assertEqual(message.decode(b'\x01'), {'DRIVER_HEARTBEAT_cmd': 'SYNC'})
+        self.assertEqual(compiled_db.decode_message(100, b'\x02'),
+                         {'DRIVER_HEARTBEAT_cmd': 'REBOOT'})
+
+        # ARXML specifics are kept.
+        db = cantools.database.load_file('tests/files/arxml/system-4.2.arxml')
+        compiled_db = cantools.database.can.formats.cdb.load_bytes(
+            cantools.database.can.formats.cdb.dump_bytes(db))
+        message = compiled_db.get_message_by_name('Message3')
+        self.assertEqual(message.autosar.pdu_paths,
+                         db.get_message_by_name('Message3').autosar.pdu_paths)
+
+        # Other versions of cantools cannot load compiled databases.
+        version = cantools.__version__
+        data = cantools.database.can.formats.cdb.dump_bytes(db)
+        data = data.replace(version.encode(), len(version) * b'9', 1)
+
+        with self.assertRaises(cantools.database.ParseError) as cm:
+            cantools.database.can.formats.cdb.load_bytes(data)
+
+        self.assertEqual(
+            str(cm.exception),
+            f'The compiled database was created by cantools {len(version) * "9"}, '
+            f'but this is cantools {version}. Compile it again.')
+
+    def test_cache_options(self):
+        filename = 'tests/files/dbc/socialledge.dbc'
+
+        # The load options are part of the key.
+        for prune_choices, choice in [(False, 'DRIVER_HEARTBEAT_cmd_NOOP'),
+                                      (True, 'NOOP'),
+                                      (False, 'DRIVER_HEARTBEAT_cmd_NOOP')]:
+            db = cantools.database.load_file(filename,
+                                             prune_choices=prune_choices,
+                                             cache_dir=self.cache_dir)
+            msg = db.get_message_by_name('DRIVER_HEARTBEAT')
+            self.assertEqual(msg.signals[0].choices[0], choice)
+
+        self.assertEqual(cantools.database.cache.info(self.cache_dir)['databases'], 2)
+
+        # Databases sorted by lambdas are not cached.
+        cantools.database.load_file(filename,
+                                    sort_signals=lambda signals: signals,
+                                    cache_dir=self.cache_dir)
+        self.assertEqual(cantools.database.cache.info(self.cache_dir)['databases'], 2)
+
+        # The digest of a file is stored with its modification time and
+        # size, and only computed again once they change.
+        filename = 'test_cache_options.txt'
+
+        with open(filename, 'w') as fout:
+            fout.write('a')
+
+        os.utime(filename, (0, 0))
+
+        with cantools.database.cache.open_cache(self.cache_dir) as cache:
+            digest = cantools.database.cache.file_digest(cache, filename)
+
+            with open(filename, 'w') as fout:
+                fout.write('b')
+
+            os.utime(filename, (0, 0))
+            self.assertEqual(cantools.database.cache.file_digest(cache, filename),
+                             digest)
+            os.utime(filename, (1, 1))
+            self.assertNotEqual(cantools.database.cache.file_digest(cache, filename),
+                                digest)
+
+        os.remove(filename)
+
+        cantools.database.cache.clear(self.cache_dir)
+        self.assertEqual(cantools.database.cache.info(self.cache_dir)['databases'], 0)
+
 
     def test_sort_signals_by_name(self):
         filename = 'tests/files/dbc/vehicle.dbc'
@@ -6357,6 +6746,593 @@ class CanToolsDatabaseTest(unittest.TestCase):
 
         self.assertNotIn('BA_ "SystemSignalLongSymbol"', long_output)
 
+    def test_compiled_decoder(self):
+        filenames = [
+            'tests/files/dbc/vehicle.dbc',
+            'tests/files/dbc/motohawk.dbc',
+            'tests/files/dbc/multiplex_2.dbc',
+            'tests/files/dbc/choices.dbc',
+            'tests/files/dbc/floating_point.dbc',
+            'tests/files/dbc/issue_184_extended_mux_multiple_values.dbc',
+            'tests/files/kcd/the_homer.kcd',
+        ]
+
+        for filename in filenames:
+            db = cantools.database.load_file(filename)
+
+            for message in db.messages:
+                self.assertIsNotNone(message._decoder)
+
+                for i in range(16):
+                    data = bytes((17 * i + 3 * j) & 0xff
+                                 for j in range(message.length))
+
+                    for decode_choices in [True, False]:
+                        for scaling in [True, False]:
+                            try:
+                                expected = message._decode(message._codecs,
+                                                           data,
+                                                           decode_choices,
+                                                           scaling,
+                                                           False)
+                            except Exception as e:
+                                with self.assertRaises(type(e)) as cm:
+                                    message.decode(data,
+                                                   decode_choices,
+                                                   scaling)
+
+                                self.assertEqual(str(cm.exception), str(e))
+                                continue
+
+                            decoded = message.decode(data,
+                                                     decode_choices,
+                                                     scaling)
+                            self.assertEqual(list(decoded.items()),
+                                             list(expected.items()))
+
+    def test_compiled_decoder_fallback(self):
+        db = cantools.database.load_file('tests/files/dbc/motohawk.dbc')
+        message = db.get_message_by_name('ExampleMessage')
+
+        # Truncated data is decoded by the generic path.
+        decoded = message.decode(b'\xc0\x06', allow_truncated=True)
+        self.assertEqual(decoded, {'Enable': 'Enabled', 'AverageRadius': 3.2})
+
+        # The compiled decoder is recreated when first needed after
+        # unpickling.
+        import pickle
+        message = pickle.loads(pickle.dumps(message))
+        self.assertIsNone(message._decoder)
+        self.assertEqual(message.decode(b'\xc0\x06\xe0\x00\x00\x00\x00\x00'),
+                         {
+                             'Enable': 'Enabled',
+                             'AverageRadius': 3.2,
+                             'Temperature': 250.55
+                         })
+        self.assertIsNotNone(message._decoder)
+
+    def test_lazy_codecs(self):
+        db = cantools.database.load_file('tests/files/dbc/motohawk.dbc',
+                                         lazy_codecs=True)
+        message = db.get_message_by_name('ExampleMessage')
+        self.assertIsNone(message._codecs)
+        self.assertEqual(message.decode(b'\xc0\x06\xe0\x00\x00\x00\x00\x00'),
+                         {
+                             'Enable': 'Enabled',
+                             'AverageRadius': 3.2,
+                             'Temperature': 250.55
+                         })
+        self.assertIsNotNone(message._codecs)
+
+        # Warm up.
+        db = cantools.database.load_file('tests/files/dbc/foobar.dbc',
+                                         lazy_codecs=True)
+        db.warm_up(['Foo'])
+        self.assertIsNotNone(db.get_message_by_name('Foo')._codecs)
+        self.assertIsNone(db.get_message_by_name('Bar')._codecs)
+        db.warm_up()
+        self.assertIsNotNone(db.get_message_by_name('Bar')._codecs)
+
+        # Codecs are created once, even if several threads decode at
+        # the same time.
+        import threading
+        import unittest.mock
+
+        db = cantools.database.load_file('tests/files/dbc/motohawk.dbc',
+                                         lazy_codecs=True)
+        message = db.get_message_by_name('ExampleMessage')
+        results = []
+
+        def decode():
+            results.append(db.decode_message(496,
+                                             b'\xc0\x06\xe0\x00\x00\x00\x00\x00'))
+
+        create_codecs = cantools.database.can.Message._create_codecs
+
+        with unittest.mock.patch.object(cantools.database.can.Message,
+                                        '_create_codecs',
+                                        autospec=True,
+                                        side_effect=create_codecs) as mock:
+            threads = [threading.Thread(target=decode) for _ in range(8)]
+
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(mock.call_count, 1)
+        self.assertEqual(len(results), 8)
+
+        # Strict checks are made when the codecs are created.
+        signals = [
+            cantools.db.Signal('S0', 0, 4),
+            cantools.db.Signal('S1', 2, 4)
+        ]
+        message = cantools.db.Message(1, 'M', 1, signals, lazy_codecs=True)
+
+        for _ in range(2):
+            with self.assertRaises(cantools.database.Error) as cm:
+                message.decode(b'\x00')
+
+            self.assertEqual(str(cm.exception),
+                             'The signals S1 and S0 are overlapping in message M.')
+
+    def test_compact_objects(self):
+        db = cantools.database.load_file('tests/files/dbc/abs.dbc')
+        message = db.get_message_by_name('BREMSE_53')
+        signal = message.get_signal_by_name('Diag_FL')
+
+        for obj in [message, signal, db.nodes[0]]:
+            self.assertFalse(hasattr(obj, '__dict__'))
+
+        # Equal named signal values are shared, but not the choices
+        # dictionaries.
+        other_choices = message.get_signal_by_name('Diag_RR').choices
+        self.assertIsNot(signal.choices, other_choices)
+
+        for value, choice in signal.choices.items():
+            self.assertIs(choice, other_choices[value])
+
+        # Pickling still works.
+        import pickle
+        message = pickle.loads(pickle.dumps(message))
+        self.assertEqual(message.get_signal_by_name('Diag_FL').choices,
+                         signal.choices)
+
+    def test_decode_into_record(self):
+        db = cantools.database.load_file('tests/files/dbc/foobar.dbc')
+        message = db.get_message_by_name('Fum')
+
+        # Choices as strings.
+        decoded = message.decode(b'\x00\x10\x00\x00\x00', choice_strings=True)
+        self.assertEqual(decoded, {'Fum': 0, 'Fam': 'Enabled'})
+        self.assertIs(type(decoded['Fam']), str)
+        self.assertIs(
+            message.decode(b'\x00\x10\x00\x00\x00', choice_strings=True)['Fam'],
+            decoded['Fam'])
+        decoded = db.decode_message('Fum',
+                                    b'\x00\x10\x00\x00\x00',
+                                    choice_strings=True)
+        self.assertIs(type(decoded['Fam']), str)
+
+        # Records.
+        record = message.create_record()
+        self.assertEqual(record, {})
+        message.decode_into(record, b'\x00\x10\x00\x00\x00')
+        self.assertEqual(record, {'Fum': 0, 'Fam': 'Enabled'})
+        self.assertIsInstance(record.Fam, NamedSignalValue)
+        message.decode_into(record,
+                            bytearray(b'\x00\x10\x00\x00\x00'),
+                            choice_strings=True)
+        self.assertIs(type(record['Fam']), str)
+
+        with self.assertRaises(AttributeError):
+            record.Foo
+
+        # Multiplexed message.
+        db = cantools.database.load_file('tests/files/dbc/multiplex.dbc')
+        message = db.get_message_by_name('Message1')
+        record = message.create_record()
+
+        for data in [b'\x20\x00\x8c\x01\x00\x00\x00\x00',
+                     b'\x60\x00\x8c\x35\xc3\x00\x00\x00']:
+            message.decode_into(record, data)
+            self.assertEqual(record, message.decode(data))
+
+        # Truncated data.
+        message.decode_into(record, data[:1], allow_truncated=True)
+        self.assertEqual(record,
+                         message.decode(data[:1], allow_truncated=True))
+
+        # Records of other messages are not accepted.
+        with self.assertRaises(ValueError) as cm:
+            db.get_message_by_name('Message1').decode_into(
+                cantools.database.load_file(
+                    'tests/files/dbc/multiplex.dbc').messages[0].create_record(),
+                data)
+
+        self.assertEqual(str(cm.exception),
+                         'The record was not created by message "Message1".')
+
+    def test_modify_shared_metadata(self):
+        db = cantools.database.load_file('tests/files/dbc/vehicle.dbc',
+                                         prune_choices=True)
+
+        def metadata():
+            return {
+                (message.name, signal.name): (dict(signal.choices or {}),
+                                              dict(signal.comments or {}))
+                for message in db.messages
+                for signal in message.signals
+            }
+
+        expected = metadata()
+        message = db.get_message_by_name('RT_SB_INS_Attitude')
+        signal = message.get_signal_by_name('Validity_Yaw')
+        signal.choices[1] = 'CHANGED'
+        signal.comments = {None: 'Changed.'}
+        signal.comments[None] += ' Again.'
+        expected[(message.name, signal.name)] = ({1: 'CHANGED', 0: 'Invalid'},
+                                                 {None: 'Changed. Again.'})
+        db.refresh()
+
+        # Only the modified signal has changed.
+        self.assertEqual(metadata(), expected)
+        self.assertEqual(
+            message.get_signal_by_name('Validity_Pitch').choices,
+            {1: 'Valid', 0: 'Invalid'})
+
+    def test_decode_from_buffer(self):
+        db = cantools.database.load_file('tests/files/dbc/motohawk.dbc')
+        message = db.get_message_by_name('ExampleMessage')
+        expected = {
+            'Enable': 'Enabled',
+            'AverageRadius': 3.2,
+            'Temperature': 250.55
+        }
+        buf = bytearray(b'\xff\xff\xc0\x06\xe0\x00\x00\x00\x00\x00\xff')
+
+        self.assertEqual(db.decode_from_buffer(496, buf, 2, 8), expected)
+        self.assertEqual(message.decode(memoryview(buf)[2:]), expected)
+        self.assertEqual(message.decode(buf[2:]), expected)
+        self.assertEqual(db.decode_from_buffer(496,
+                                               buf,
+                                               2,
+                                               2,
+                                               allow_truncated=True),
+                         {'Enable': 'Enabled', 'AverageRadius': 3.2})
+
+        # Contained messages are decoded from views into the buffer.
+        db = cantools.db.load_file('tests/files/arxml/system-4.2.arxml')
+        message = db.get_message_by_name('OneToContainThemAll')
+        buf = bytearray(b'\x00\n\x0b\x0c\t{\x00\xc8\x01\x04V\x0eI@\x00')
+        decoded = db.decode_from_buffer(message.frame_id,
+                                        buf,
+                                        1,
+                                        13,
+                                        decode_containers=True)
+        self.assertEqual(decoded,
+                         message.decode(bytes(buf[1:14]),
+                                        decode_containers=True))
+        self.assertEqual(decoded[0][0].name, 'message1')
+        self.assertEqual(decoded[0][1]['message1_SeqCounter'], 123)
+
+        unpacked = message.unpack_container(memoryview(buf)[1:14])
+        self.assertIsInstance(unpacked[0][1], memoryview)
+        self.assertEqual(bytes(unpacked[0][1]), b'{\x00\xc8\x01\x04V\x0eI@')
+
+    def test_decode_projection(self):
+        db = cantools.database.load_file('tests/files/dbc/multiplex_2.dbc')
+        message = db.get_message_by_name('Extended')
+        data = b'\x00\x11\x22\x33\x01\x55\x66\x77'
+
+        self.assertEqual(message.decode(data, signals=['S7', 'S2']),
+                         {'S2': 17, 'S7': 7824981})
+        self.assertEqual(db.decode_message('Extended',
+                                           data,
+                                           signals=['S6', 'S0']),
+                         {'S0': 0, 'S6': 1})
+
+        # Signals of multiplexer branches not selected are omitted.
+        self.assertEqual(message.decode(data, signals=['S8']), {})
+        self.assertEqual(message.decode(data[:5],
+                                        signals=['S7', 'S3'],
+                                        allow_truncated=True),
+                         {'S3': 13090})
+
+        # Only the wanted signals and their multiplexers are unpacked.
+        projection = message.compile_projection(['S7'])
+        self.assertEqual(projection.signal_names, ['S7'])
+        self.assertIs(projection.message, message)
+        self.assertEqual([s.name for s in projection._codec['signals']], ['S6'])
+        self.assertEqual(projection.decode(data), {'S7': 7824981})
+        self.assertEqual(projection.decode(bytearray(data), scaling=False),
+                         {'S7': 7824981})
+
+        with self.assertRaises(KeyError):
+            message.compile_projection(['S7', 'Missing'])
+
+    def test_delta_decoder(self):
+        db = cantools.database.load_file('tests/files/dbc/motohawk.dbc')
+        decoder = cantools.database.can.DeltaDecoder(db)
+
+        self.assertEqual(decoder.decode(496, b'\xc0\x06\xe0\x00\x00\x00\x00\x00'),
+                         {
+                             'Enable': 'Enabled',
+                             'AverageRadius': 3.2,
+                             'Temperature': 250.55
+                         })
+        self.assertEqual(decoder.decode(496, b'\xc0\x06\xe0\x00\x00\x00\x00\x00'),
+                         {})
+        self.assertEqual(decoder.decode(496, b'\xc0\x06\xe0\x00\x00\x00\x00\x01'),
+                         {})
+        self.assertEqual(decoder.decode(496, b'\x40\x06\xe0\x00\x00\x00\x00\x01'),
+                         {'Enable': 'Disabled'})
+        self.assertEqual(decoder.decode(496, b'\x40\x16\xe0\x00\x00\x00\x00\x01'),
+                         {'Temperature': 251.83})
+        self.assertEqual(decoder.decoded(496),
+                         {
+                             'Enable': 'Disabled',
+                             'AverageRadius': 3.2,
+                             'Temperature': 251.83
+                         })
+
+        # Channels are independent.
+        self.assertEqual(len(decoder.decode(496,
+                                            b'\x40\x16\xe0\x00\x00\x00\x00\x01',
+                                            channel=1)),
+                         3)
+
+        # The whole frame is compared if a multiplexer changes.
+        db = cantools.database.load_file('tests/files/dbc/multiplex_2.dbc')
+        decoder = cantools.database.can.DeltaDecoder(db)
+        frame_id = db.get_message_by_name('Extended').frame_id
+        decoder.decode(frame_id, b'\x00\x11\x22\x33\x01\x55\x66\x77')
+        self.assertEqual(decoder.decode(frame_id,
+                                        b'\x00\x11\x22\x33\x02\x55\x66\x77'),
+                         {'S6': 2, 'S8': 85})
+        self.assertEqual(decoder.decoded(frame_id),
+                         {'S0': 0, 'S6': 2, 'S1': 0, 'S2': 17, 'S3': 13090, 'S8': 85})
+        self.assertEqual(decoder.decode(frame_id,
+                                        b'\x00\x11\x22\x34\x02\x56\x66\x77'),
+                         {'S3': 13346, 'S8': 86})
+
+        decoder.reset()
+
+        with self.assertRaises(KeyError):
+            decoder.decoded(frame_id)
+
+    def test_flat_multiplexer_dispatch(self):
+        db = cantools.database.load_file('tests/files/dbc/multiplex_2.dbc')
+        message = db.get_message_by_name('Extended')
+
+        # One codec per multiplexer path, keyed by the multiplexer ids
+        # in depth first order.
+        self.assertEqual(sorted(message._flat_codecs),
+                         [
+                             (0, 0, 1),
+                             (0, 0, 2),
+                             (0, 2, 1),
+                             (0, 2, 2),
+                             (1, 1),
+                             (1, 2)
+                         ])
+        self.assertEqual(
+            [signal.name for signal in message._flat_codecs[(0, 0, 1)]['signals']],
+            ['S0', 'S6', 'S1', 'S2', 'S3', 'S7'])
+
+        datas = [
+            b'\x00\x11\x22\x33\x01\x55\x66\x77',
+            b'\x01\x11\x22\x33\x02\x55\x66\x77',
+            b'\x00\x11\x22\x33',
+            b'\x00\x11'
+        ]
+
+        for data in datas:
+            for decode_choices in [False, True]:
+                for scaling in [False, True]:
+                    self.assertEqual(
+                        message._decode_flat(data,
+                                             decode_choices,
+                                             scaling,
+                                             True),
+                        message._decode(message._codecs,
+                                        data,
+                                        decode_choices,
+                                        scaling,
+                                        True))
+
+        # Truncated multiplexer signals are part of the key as None.
+        self.assertEqual(message.decode(b'\x00\x11\x22\x33',
+                                        allow_truncated=True),
+                         {'S0': 0, 'S1': 0, 'S2': 17, 'S3': 13090})
+        self.assertIn((0, 0, None), message._flat_codecs)
+
+        with self.assertRaises(cantools.database.DecodeError) as cm:
+            message.decode(b'\x00\x11\x22\x33\x44', allow_truncated=True)
+
+        self.assertEqual(str(cm.exception),
+                         'expected multiplexer id 1 or 2, but got 68')
+
+    def test_decode_batch(self):
+        db = cantools.database.load_file('tests/files/dbc/motohawk.dbc')
+        message = db.get_message_by_name('ExampleMessage')
+        payloads = [
+            b'\xc0\x06\xe0\x00\x00\x00\x00\x00',
+            b'\x00\x00\x00\x00\x00\x00\x00\x00',
+            b'\x80\x00\x00\x00\x00\x00\x00\x00'
+        ]
+
+        columns = message.decode_batch(payloads)
+        self.assertEqual(list(columns), ['Enable', 'AverageRadius', 'Temperature'])
+        self.assertEqual(list(columns['Enable']), [1, 0, 1])
+        self.assertEqual(list(columns['AverageRadius']), [3.2, 0.0, 0.0])
+        self.assertEqual(list(columns['Temperature']), [250.55, 250.0, 250.0])
+
+        columns = message.decode_batch(payloads, scaling=False)
+        self.assertEqual(list(columns['AverageRadius']), [32, 0, 0])
+        self.assertEqual(list(columns['Temperature']), [55, 0, 0])
+
+        columns = db.decode_batch([496, 1, 496], payloads)
+        self.assertEqual(list(columns), ['ExampleMessage'])
+        self.assertEqual(list(columns['ExampleMessage']['Enable']), [1, 1])
+
+        with self.assertRaises(cantools.database.DecodeError):
+            message.decode_batch([b'\x00'])
+
+    def test_decode_batch_signal_outside_message(self):
+        from cantools.database.can import batch
+
+        db = cantools.database.load_file('tests/files/kcd/message_layout.kcd',
+                                         strict=False)
+        message = db.get_message_by_name('Message3')
+        np = batch.np
+
+        try:
+            for module in [np, None]:
+                batch.np = module
+
+                with self.assertRaises(cantools.database.DecodeError) as cm:
+                    message.decode_batch([b'\x00', b'\x01'])
+
+                self.assertEqual(
+                    str(cm.exception),
+                    'The signal "Signal1" does not fit in the 1 bytes of '
+                    'message "Message3"')
+        finally:
+            batch.np = np
+
+    def test_decode_batch_float_nan(self):
+        db = cantools.database.load_file('tests/files/dbc/multiplex_2.dbc')
+        message = db.get_message_by_name('ExtendedTypes')
+        payloads = [
+            b'\x05\x00\x00\x00\x00\xa0\x7f\x00',
+            b'\x05\x00\x00\x00\x00\xc0\x7f\x00'
+        ]
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            columns = message.decode_batch(payloads)
+
+        self.assertTrue(all(math.isnan(value) for value in columns['S9']))
+
+    def test_decode_batch_multiplexed(self):
+        db = cantools.database.load_file('tests/files/dbc/multiplex_2.dbc')
+        message = db.get_message_by_name('Shared')
+        payloads = [
+            message.encode({'S0': 1, 'S1': 2}),
+            message.encode({'S0': 2, 'S2': 3}),
+            b'\x00\x00\x00\x00\x00\x00\x00\x00',
+        ]
+
+        columns = message.decode_batch(payloads)
+        self.assertEqual(list(columns['S0']), [1, 2, 0])
+        self.assertEqual(columns['S1'].tolist(), [2, None, None])
+        self.assertEqual(columns['S2'].tolist(), [None, 3, None])
+
+    def test_decode_batch_without_numpy(self):
+        from cantools.database.can import batch
+
+        db = cantools.database.load_file('tests/files/dbc/multiplex_2.dbc')
+        message = db.get_message_by_name('Shared')
+        payloads = [
+            message.encode({'S0': 1, 'S1': 2}),
+            message.encode({'S0': 2, 'S2': 3}),
+            b'\x00\x00\x00\x00\x00\x00\x00\x00',
+        ]
+        np = batch.np
+        batch.np = None
+
+        try:
+            columns = message.decode_batch(payloads)
+            self.assertEqual(columns['S0'], [1, 2, 0])
+            self.assertEqual(columns['S1'], [2, None, None])
+            self.assertEqual(columns['S2'], [None, 3, None])
+
+            columns = db.decode_batch([0xc02fefe, 0xc02fefe, 1], payloads)
+            self.assertEqual(columns['Shared']['S0'], [1, 2])
+        finally:
+            batch.np = np
+
+    def test_encode_batch(self):
+        db = cantools.database.load_file('tests/files/dbc/motohawk.dbc')
+        message = db.get_message_by_name('ExampleMessage')
+        columns = {
+            'Enable': ['Enabled', 'Disabled', 1],
+            'AverageRadius': [3.2, 0.0, 0.5],
+            'Temperature': [250.55, 250.0, 229.53]
+        }
+        rows = [
+            {name: column[i] for name, column in columns.items()}
+            for i in range(3)
+        ]
+
+        for padding in [False, True]:
+            encoded = message.encode_batch(columns, padding=padding)
+            self.assertEqual(encoded.shape, (3, 8))
+            self.assertEqual([bytes(payload) for payload in encoded],
+                             [message.encode(row, padding=padding)
+                              for row in rows])
+
+        columns['Temperature'][1] = 300.0
+
+        with self.assertRaises(cantools.database.EncodeError) as cm:
+            message.encode_batch(columns)
+
+        self.assertEqual(
+            str(cm.exception),
+            'Expected signal "Temperature" value less than or equal to 270.47 '
+            'in message "ExampleMessage", but got 300.0.')
+
+        with self.assertRaises(cantools.database.EncodeError) as cm:
+            message.encode_batch({'Enable': ['Foo']})
+
+        self.assertEqual(str(cm.exception),
+                         'Invalid value specified for signal "Enable": "Foo"')
+
+    def test_encode_batch_multiplexed(self):
+        db = cantools.database.load_file('tests/files/dbc/multiplex_2.dbc')
+        message = db.get_message_by_name('Extended')
+        rows = [
+            {'S0': 0, 'S1': 0, 'S2': 1, 'S3': 2, 'S6': 1, 'S7': 3},
+            {'S0': 0, 'S1': 2, 'S4': 5, 'S6': 2, 'S8': 4},
+            {'S0': 1, 'S5': 7, 'S6': 1, 'S7': 0},
+        ]
+        names = ['S0', 'S1', 'S2', 'S3', 'S4', 'S5', 'S6', 'S7', 'S8']
+        columns = {
+            name: [row.get(name) for row in rows] for name in names
+        }
+
+        encoded = message.encode_batch(columns, padding=True)
+        self.assertEqual([bytes(payload) for payload in encoded],
+                         [message.encode(row, padding=True) for row in rows])
+
+        columns['S0'][2] = 3
+
+        with self.assertRaises(cantools.database.EncodeError) as cm:
+            message.encode_batch(columns)
+
+        self.assertEqual(str(cm.exception),
+                         'Expected multiplexer id in {0 or 1}, for multiplexer '
+                         '"S0" but got 3')
+
+    def test_encode_batch_without_numpy(self):
+        from cantools.database.can import batch
+
+        db = cantools.database.load_file('tests/files/dbc/multiplex_2.dbc')
+        message = db.get_message_by_name('Shared')
+        columns = {'S0': [1, 2], 'S1': [2, None], 'S2': [None, 3]}
+        np = batch.np
+        batch.np = None
+
+        try:
+            self.assertEqual(message.encode_batch(columns),
+                             [message.encode({'S0': 1, 'S1': 2}),
+                              message.encode({'S0': 2, 'S2': 3})])
+        finally:
+            batch.np = np
+
 
 # This file is not '__main__' when executed via 'python setup.py3
 # test'.
@@ -1,5 +1,7 @@
 import unittest
 import io
+import os
+import tempfile
 
 import cantools
 
@@ -557,3 +559,256 @@ class TestLogreaderStreams(unittest.TestCase):
         self.assertEqual(f5.frame_id, 0x500)
         f6 = next(frame_iter)
         self.assertEqual(f6.frame_id, 0x18EFC034)
+
+
+class TestLogreaderFastParser(unittest.TestCase):
+    def assert_same_frames(self, log, chunk_size=1024 * 1024):
+        parser = cantools.logreader.Parser(io.StringIO(log))
+        expected = list(parser.iterlines(keep_unknowns=True))
+        fast_parser = cantools.logreader.FastParser(io.BytesIO(log.encode()),
+                                                    chunk_size=chunk_size)
+        actual = list(fast_parser.iterlines(keep_unknowns=True))
+        self.assertEqual(len(actual), len(expected))
+
+        for (line, frame), (expected_line, expected_frame) in zip(actual,
+                                                                  expected):
+            self.assertEqual(line.decode(), expected_line)
+
+            if expected_frame is None:
+                self.assertIsNone(frame)
+            else:
+                frame = frame.to_data_frame()
+                self.assertEqual(frame.channel, expected_frame.channel)
+                self.assertEqual(frame.frame_id, expected_frame.frame_id)
+                self.assertEqual(frame.data, expected_frame.data)
+                self.assertEqual(frame.timestamp, expected_frame.timestamp)
+                self.assertEqual(frame.timestamp_format,
+                                 expected_frame.timestamp_format)
+
+        return actual
+
+    def test_candump(self):
+        log = """\
+  vcan0  0C8   [8]  F0 00 00 00 00 00 00 00
+  vcan0  064   [10]  F0 01 FF FF FF FF FF FF FF FF
+  vcan0  ERROR
+
+  vcan0  1F4   [4]  01 02 03 04   '....'
+  vcan0  1F3   [3]  remote request
+"""
+
+        for chunk_size in [1, 7, 64, 1024]:
+            lines = self.assert_same_frames(log, chunk_size)
+
+        frame = lines[0][1]
+        self.assertEqual(frame.channel, 'vcan0')
+        self.assertEqual(frame.frame_id, 0xc8)
+        self.assertEqual(frame.data, b'\xf0\x00\x00\x00\x00\x00\x00\x00')
+        self.assertIsNone(frame.timestamp)
+        self.assertEqual(frame.timestamp_format,
+                         cantools.logreader.TimestampFormat.MISSING)
+        self.assertEqual(lines[5][1].data, b'')
+
+    def test_candump_timestamped(self):
+        self.assert_same_frames("""\
+ (000.000000)  vcan0  0C8   [8]  F0 00 00 00 00 00 00 00
+ (002.047817)  vcan0  064   [8]  F0 01 FF FF FF FF FF FF
+ (1594172461.968006)  vcan0  1F4   [4]  01 02 03 04
+""")
+        self.assert_same_frames("""\
+ (2020-12-19 12:04:45.485261)  vcan0  0C8   [8]  F0 00 00 00 00 00 00 00
+ (2020-12-19 12:04:48.597222)  vcan0  064   [8]  F0 01 FF FF FF FF FF FF
+""")
+
+    def test_candump_log(self):
+        lines = self.assert_same_frames("""\
+(1594172461.968006) vcan0 0C8#F000000000000000\r
+(1594172462.126542) vcan0 064#F001FFFFFFFFFFFFFFFF\r
+(1594172462.127684) vcan0 ERROR\r
+(1613656104.493702) can2 102##11122AA\r
+""")
+        frame = lines[0][1]
+        self.assertEqual(frame.timestamp, 1594172461.968006)
+        self.assertEqual(frame.timestamp_format,
+                         cantools.logreader.TimestampFormat.ABSOLUTE)
+        self.assertEqual(lines[3][1].data, b'\x11\x22\xaa')
+
+    def test_pcan_trace(self):
+        self.assert_same_frames("""\
+;$FILEVERSION=1.3
+;---+--   ----+----  --+  ----+---  +  -+ -- -- -- -- -- -- --
+     1)      6357.213 1  Rx        0401 -  8    00 00 00 00 00 00 00 00
+     2)      6357.463 1  Rx        0401 -  8    00 00 00 00 00 00 00 00
+     3)      6357.713 2  Rx        0401 -  2    01 02
+""")
+        self.assert_same_frames("""\
+;$FILEVERSION=2.1
+1 1059.900 DT 1 0300 Rx - 7 00 00 00 00 04 00 00
+6 1334.222 ER 1 - Rx - 5 04 00 02 00 00
+7 1334.224 EV 1 User-defined event for bus 1
+12 1335.156 DT 1 18EFC034 Tx - 8 01 02 03 04 05 06 07 08
+13 1336.543 RR 1 0100 Rx - 3
+""")
+
+    def test_frame_id_filter(self):
+        logs = [
+            """\
+(1594172461.968006) vcan0 0C8#F000000000000000
+(1594172462.126542) vcan0 064#F001FFFFFFFFFFFF
+(1594172462.127684) vcan0 ERROR
+(1594172462.356874) vcan0 1F4#01020304
+""",
+            """\
+  vcan0  0C8   [8]  F0 00 00 00 00 00 00 00
+  vcan0  064   [8]  F0 01 FF FF FF FF FF FF
+  vcan0  ERROR
+  vcan0  1F4   [4]  01 02 03 04   '..).'
+""",
+            """\
+;$FILEVERSION=1.3
+     1)      6357.213 1  Rx        00C8 -  8    00 00 00 00 00 00 00 00
+     2)      6357.463 1  Rx        0064 -  8    00 00 00 00 00 00 00 00
+     3)      6357.713 2  Rx        01F4 -  2    01 02
+"""
+        ]
+
+        for log in logs:
+            parser = cantools.logreader.Parser(io.StringIO(log),
+                                               frame_id_filter={0xc8, 0x1f4})
+            lines = list(parser.iterlines(keep_unknowns=True))
+            self.assertEqual(
+                [frame.frame_id for _, frame in lines if frame is not None],
+                [0xc8, 0x1f4])
+            # Lines which are not frames are kept.
+            self.assertEqual(len(lines), 3)
+
+            fast_parser = cantools.logreader.FastParser(
+                io.BytesIO(log.encode()),
+                frame_id_filter=frozenset([0xc8, 0x1f4]))
+            fast_lines = list(fast_parser.iterlines(keep_unknowns=True))
+            self.assertEqual([line.decode() for line, _ in fast_lines],
+                             [line for line, _ in lines])
+
+            fast_parser = cantools.logreader.FastParser(
+                io.BytesIO(log.encode()),
+                frame_id_filter=frozenset([0x64]))
+            self.assertEqual([frame.frame_id for frame in fast_parser], [0x64])
+            self.assertIsNone(fast_parser.parse(lines[0][0].encode()))
+
+        parser = cantools.logreader.Parser(frame_id_filter={0xc8})
+        self.assertFalse(parser.is_filtered_out('  vcan0  0C8   [1]  F0'))
+        self.assertTrue(parser.is_filtered_out('  vcan0  064   [1]  F0'))
+        self.assertFalse(parser.is_filtered_out('  vcan0  ERROR'))
+
+    def test_text_stream(self):
+        parser = cantools.logreader.FastParser(io.StringIO("""\
+  vcan0  0C8   [8]  F0 00 00 00 00 00 00 00
+  vcan0  1F4   [4]  01 02 03 04
+"""))
+        self.assertEqual([frame.frame_id for frame in parser], [0xc8, 0x1f4])
+
+
+class TestLogIndex(unittest.TestCase):
+    LOG = ''.join(f'({1594172461 + i}.000000) vcan0 {0x100 + i % 3:03X}#0102\n'
+                  for i in range(30))
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, 'candump.log')
+
+        with open(self.filename, 'w') as fout:
+            fout.write('not a frame\n')
+            fout.write(self.LOG)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_build(self):
+        index = cantools.logindex.LogIndex.build(self.filename,
+                                                 block_size=100)
+
+        # Blocks start at the beginning of lines.
+        with open(self.filename, 'rb') as fin:
+            data = fin.read()
+
+        self.assertEqual(index.offsets[0], 0)
+        self.assertEqual(index.offsets[-1], len(data))
+
+        for offset in index.offsets[1:-1]:
+            self.assertEqual(data[offset - 1:offset], b'\n')
+
+        self.assertEqual(index.start, 1594172461.0)
+        self.assertEqual(index.stop, 1594172490.0)
+        self.assertEqual(sorted(index.frame_ids), [0x100, 0x101, 0x102])
+
+        # Ranges of the blocks containing frames in the time window,
+        # or with given frame ids.
+        begin, end = data.index(b'(1594172471'), data.index(b'(1594172474')
+        ranges = index.ranges(1594172471, 1594172473)
+        self.assertEqual(len(ranges), 1)
+        self.assertLessEqual(ranges[0][0], begin)
+        self.assertGreaterEqual(ranges[0][1], end)
+        self.assertLess(ranges[0][1] - ranges[0][0], len(data) // 2)
+        self.assertEqual(index.ranges(), [(0, len(data))])
+        self.assertEqual(index.ranges(frame_ids=[0x200]), [])
+        self.assertEqual(index.ranges(1594172500), [])
+
+    def test_save_load(self):
+        self.assertIsNone(cantools.logindex.LogIndex.load(self.filename))
+
+        index = cantools.logindex.LogIndex.build(self.filename, block_size=64)
+        index.save(self.filename)
+        loaded = cantools.logindex.LogIndex.load(self.filename)
+        self.assertEqual(loaded.offsets, index.offsets)
+        self.assertEqual(loaded.min_timestamps, index.min_timestamps)
+        self.assertEqual(loaded.frame_ids, index.frame_ids)
+
+        with self.assertRaises(cantools.errors.Error):
+            cantools.logindex.LogIndex.load_bytes(b'foo')
+
+        # The index is out of date once the log file is modified.
+        with open(self.filename, 'a') as fout:
+            fout.write('(1594172491.000000) vcan0 100#01\n')
+
+        self.assertIsNone(cantools.logindex.LogIndex.load(self.filename))
+
+    def test_parser_time_window(self):
+        index = cantools.logindex.LogIndex.build(self.filename, block_size=64)
+
+        with open(self.filename) as fin:
+            expected = list(cantools.logreader.Parser(fin,
+                                                      start=1594172471,
+                                                      stop=1594172473))
+
+        self.assertEqual([frame.frame_id for frame in expected],
+                         [0x101, 0x102, 0x100])
+
+        for stream in [open(self.filename), open(self.filename, 'rb')]:
+            with stream:
+                parser = cantools.logreader.Parser(stream,
+                                                   index=index,
+                                                   start=1594172471,
+                                                   stop=1594172473)
+                lines = list(parser.iterlines(keep_unknowns=True))
+
+            frames = [frame for _, frame in lines if frame is not None]
+            self.assertEqual([(frame.frame_id, frame.timestamp)
+                              for frame in frames],
+                             [(frame.frame_id, frame.timestamp)
+                              for frame in expected])
+            # Only a few lines around the time window are read.
+            self.assertLess(len(lines), 10)
+
+    def test_parser_frame_id_filter(self):
+        index = cantools.logindex.LogIndex.build(self.filename, block_size=64)
+        index.frame_ids[0x103] = 1 << (index.number_of_blocks - 1)
+
+        with open(self.filename, 'rb') as fin:
+            parser = cantools.logreader.Parser(fin,
+                                               index=index,
+                                               frame_id_filter={0x103})
+            lines = list(parser.iterlines(keep_unknowns=True))
+
+        # Only the last block is read, so the first line, which is not
+        # a frame, is not returned. The frames have other frame ids.
+        self.assertEqual(lines, [])
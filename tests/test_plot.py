@@ -4,10 +4,12 @@ import os
 import sys
 import datetime
 import re
+import tempfile
 import unittest
 from unittest import mock
 from io import StringIO
 import cantools
+import cantools.subparsers.plot
 import matplotlib.pyplot
 import logging
 
@@ -1131,6 +1133,46 @@ Failed to parse line: 'invalid syntax'
                             self.assertListEqual(subplots[i].mock_calls, expected_subplot_calls[i], msg="calls don't match for subplot %s" % i)
 
 
+    def test_frame_id_filter(self):
+        data = self.data_error_handling
+        expected_subplot_calls = [
+            mock.call.plot(data.xs33, data.whlspeed_fl, '', label='BREMSE_33.whlspeed_FL'),
+            mock.call.plot(data.xs33, data.whlspeed_fr, '', label='BREMSE_33.whlspeed_FR'),
+            mock.call.plot(data.xs33, data.whlspeed_rl, '', label='BREMSE_33.whlspeed_RL'),
+            mock.call.plot(data.xs33, data.whlspeed_rr, '', label='BREMSE_33.whlspeed_RR'),
+            mock.call.set_xlabel(self.XLABEL_tA % "29.12.2020"),
+        ]
+
+        # The frame ids are derived from the signals if errors of
+        # other messages are not reported, or given explicitly.
+        for options, expected_output in [
+                (['-q'], ''),
+                (['--messages', 'BREMSE_33'],
+                 "Failed to parse line: 'invalid syntax'\n" * 2),
+                (['--frame-ids', '0x343'],
+                 "Failed to parse line: 'invalid syntax'\n" * 2)
+        ]:
+            argv = ['cantools', 'plot', *options, self.DBC_FILE, '*33.*']
+            subplots = [SubplotMock(), SubplotMock()]
+            plt = PyplotMock()
+            plt.subplot.side_effect = subplots
+            stdout = StringIO()
+
+            with mock.patch('cantools.subparsers.plot._mo_unpack',
+                            wraps=cantools.subparsers.plot._mo_unpack) as mo_unpack:
+                with mock.patch('sys.stdin', StringIO(data.input_data)):
+                    with mock.patch('sys.stdout', stdout):
+                        with mock.patch('sys.argv', argv):
+                            with plt:
+                                cantools._main()
+
+            self.assertEqual(stdout.getvalue(), expected_output)
+            self.assertListEqual(subplots[0].mock_calls, expected_subplot_calls)
+
+            # Only the lines of the plotted message are parsed.
+            self.assertEqual(mo_unpack.call_count, 5)
+
+
     # --show-*
 
     def test_show_invalid_data(self):
@@ -1609,6 +1651,60 @@ Failed to parse line: 'invalid syntax'
                         self.assertEqual(stdout.getvalue(), expected_output)
 
 
+    def test_start_stop_relative_log_file_index(self):
+        input_data = """\
+ (000.000000)  vcan0  00000343   [8]  27 05 2E 05 44 05 44 05
+ (28800.001831)  vcan0  00000343   [8]  8C 05 94 05 9B 05 77 05
+ (57600.003677)  vcan0  00000343   [8]  B5 05 A7 05 A7 05 BC 05
+ (86400.005531)  vcan0  00000343   [8]  BE 05 A9 05 BE 05 A2 05
+ (115200.007377)  vcan0  00000343   [8]  8E 05 AB 05 95 05 9C 05
+ (144000.009221)  vcan0  00000343   [8]  9B 05 B0 05 85 05 94 05
+ (172800.011064)  vcan0  00000343   [8]  CB 05 B5 05 D2 05 D2 05
+ (201600.012905)  vcan0  00000343   [8]  E2 05 F0 05 F0 05 DB 05
+ (230400.014772)  vcan0  00000343   [8]  FB 05 DE 05 E5 05 F4 05
+ (259200.016617)  vcan0  00000343   [8]  FB 05 FB 05 FB 05 FB 05
+"""
+
+        xs = self.parse_time(input_data, self.parse_seconds)
+        ys_whlspeed_fl = [20.609375, 22.1875, 22.828125, 22.96875, 22.21875, 22.421875, 23.171875, 23.53125, 23.921875, 23.921875]
+        ys_whlspeed_fl = ys_whlspeed_fl[3:6]
+        xs = xs[3:6]
+
+        expected_calls = [
+            mock.call.subplot(1,1,1, sharex=None),
+            mock.call.subplot().plot(xs, ys_whlspeed_fl, '', label='BREMSE_33.whlspeed_FL'),
+            mock.call.subplot().set(ylabel='*FL'),
+            mock.call.subplot().set_xlabel(self.XLABEL_tz),
+            mock.call.show(),
+        ]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            logfile = os.path.join(tmpdir, 'candump.log')
+
+            with open(logfile, 'w') as fout:
+                fout.write(input_data)
+
+            # One block per line.
+            index = cantools.logindex.LogIndex.build(logfile, block_size=1)
+            index.save(logfile)
+            argv = ['cantools', 'plot', '--log-file', logfile, '--start', '86400', '--stop', '2 days', '--break-time', '-1', self.DBC_FILE, '*FL']
+            stdout = StringIO()
+
+            with mock.patch('cantools.subparsers.plot.iter_range_lines',
+                            wraps=cantools.logindex.iter_range_lines) as iter_range_lines:
+                with mock.patch('sys.stdout', stdout):
+                    with mock.patch('sys.argv', argv):
+                        with PyplotMock(ignore_axes=True) as plt:
+                            cantools._main()
+                            self.assertListEqual(plt.mock_calls, expected_calls)
+                            self.assertEqual(stdout.getvalue(), "")
+
+            # Only the lines from 86400 to 172800 seconds are read
+            # after the first line.
+            ranges = iter_range_lines.call_args[0][1]
+            self.assertEqual(ranges, [(index.offsets[3], index.offsets[6])])
+
+
     def test_stop_is_based_on_start_and_xlabel_shows_start(self):
         argv = ['cantools', 'plot', '--start', '6.2.', '--stop', '13:00:', '--break-time', '-1', self.DBC_FILE, '*FL']
         input_data = """\